@@ -1,5 +1,4 @@
 import asyncio
-import calendar
 import logging
 import uuid
 from collections import defaultdict
@@ -18,9 +17,16 @@ from redbot.core.bot import Red
 from redbot.core.i18n import Translator, cog_i18n
 from discord import app_commands
 
+from .embed_refresher import EmbedRefresher
+from .event_store import EventStore
+from .event_times import SCHEMA_VERSION, event_end, event_start, event_zone, from_epoch, migrate_event, migrate_reminder, to_epoch
+from .recurrence import Recurrence
+from .scheduler import TimerScheduler
+
 _ = Translator("RobustEvents", __file__)
 
 MIN_NOTIFICATION_INTERVAL = timedelta(minutes=5)  # Minimum interval between notifications
+EMBED_REFRESH_MINUTES = 5  # How often event info embeds are checked for changes
 
 class RepeatType(Enum):
     NONE = 'none'
@@ -72,8 +78,8 @@ class BasicEventModal(ui.Modal, title=_("Create New Event - Basic Info")):
 
         self.cog.temp_event_data[interaction.user.id] = {
             'name': self.name.value,
-            'time1': event_time1.isoformat(),
-            'time2': event_time2.isoformat() if event_time2 else None,
+            'time1': event_time1,
+            'time2': event_time2,
             'description': self.description.value,
         }
 
@@ -130,13 +136,13 @@ class AdvancedEventModal(ui.Modal, title=_("Create New Event - Advanced Options"
             event_id = await self.cog.create_event(
                 self.guild,
                 basic_data['name'],
-                datetime.fromisoformat(basic_data['time1']),
+                basic_data['time1'],
                 basic_data['description'],
                 notifications,
                 repeat,
                 role_name,
                 channel,
-                datetime.fromisoformat(basic_data['time2']) if basic_data['time2'] else None
+                basic_data['time2']
             )
 
             await interaction.response.send_message(embed=self.cog.success_embed(_("Event created successfully! Event ID: {event_id}").format(event_id=event_id)), ephemeral=True)
@@ -225,7 +231,7 @@ class EventInfoView(ui.View):
             return
 
         guild_tz = await self.cog.get_guild_timezone(interaction.guild)
-        event_time = datetime.fromisoformat(event['time1']).astimezone(guild_tz)
+        event_time = event_start(event, guild_tz)
         view = ReminderSelectView(self.cog, interaction.user.id, self.event_id, event_time)
         await interaction.response.send_message(_("Select when you'd like to be reminded via direct message:"), view=view, ephemeral=True)
 
@@ -254,7 +260,7 @@ class EventReminderView(ui.View):
             return
 
         guild_tz = await self.cog.get_guild_timezone(interaction.guild)
-        event_time = datetime.fromisoformat(event['time1']).astimezone(guild_tz)
+        event_time = event_start(event, guild_tz)
         now = datetime.now(guild_tz)
 
         if event_time <= now:
@@ -294,47 +300,47 @@ class RobustEventsCog(commands.Cog):
         self.config = Config.get_conf(self, identifier=1234567890)
         default_guild = {
             "events": {},
-            "timezone": "UTC"
+            "timezone": "UTC",
+            "schema_version": 1
         }
         default_member = {
             "personal_reminders": {}
         }
         self.config.register_guild(**default_guild)
         self.config.register_member(**default_member)
-        self.event_tasks: Dict[str, asyncio.Task] = {}
-        self.personal_reminder_tasks: Dict[str, asyncio.Task] = {}
         self.notification_queue: Dict[str, List[asyncio.Event]] = defaultdict(list)
         self.last_notification_time: Dict[str, datetime] = {}  # Track last notification time
         self.logger = logging.getLogger('red.RobustEvents')
+        # One timer heap for every event start, notification and personal reminder
+        self.scheduler = TimerScheduler(self.fire_timer, self.logger)
         
         self.guild_timezone_cache = {}
-        self.guild_events = defaultdict(dict)
+        # Write-through cache; guild_events is its per-guild dict of events
+        self.event_store = EventStore(self.config)
+        self.guild_events = self.event_store.events
+        self.recurrences: Dict[Tuple[int, str], Tuple[tuple, Recurrence]] = {}
         self.temp_event_data = defaultdict(dict)
         self.temp_edit_data = defaultdict(dict)
         self.event_info_messages = defaultdict(dict)
+        self.embed_refresher = EmbedRefresher(EMBED_REFRESH_MINUTES * 60)
 
         self.bot.loop.create_task(self.initialize_cog())
 
         self.cleanup_expired_events.start()
-        self.sync_event_cache.start()
         self.update_event_embeds.start()
         self.cleanup_event_info_messages.start()
         self.sent_notifications: Set[str] = set()
+        self.announced_starts: Set[str] = set()
         self.failed_notifications = []
         self.retry_failed_notifications.start()
         self.cleanup_notifications.start()
 
-        # Replace existing notification tracking with simpler system
-        self.active_events: Dict[str, asyncio.Task] = {}
-
     @tasks.loop(hours=1)
     async def cleanup_notifications(self):
-        now = datetime.now(pytz.UTC)
+        now = datetime.now(pytz.UTC).timestamp()
         for guild in self.bot.guilds:
-            guild_tz = await self.get_guild_timezone(guild)
             for event_id, event in self.guild_events.get(guild.id, {}).items():
-                event_time = datetime.fromisoformat(event['time1']).astimezone(guild_tz)
-                if event_time < now:
+                if event['start'] < now:
                     notification_keys = [f"{guild.id}:{event_id}:{n}" for n in event['notifications']]
                     self.sent_notifications -= set(notification_keys)
             self.logger.debug("Cleaned up old notifications")
@@ -367,10 +373,7 @@ class RobustEventsCog(commands.Cog):
     def cog_unload(self):
         self.cleanup_expired_events.cancel()
         self.update_event_embeds.cancel()
-        for task in self.event_tasks.values():
-            task.cancel()
-        for task in self.personal_reminder_tasks.values():
-            task.cancel()
+        self.scheduler.close()
         self.cleanup_event_info_messages.cancel()
         self.temp_event_data.clear()
         self.temp_edit_data.clear()
@@ -395,24 +398,11 @@ class RobustEventsCog(commands.Cog):
     @tasks.loop(hours=24)
     async def cleanup_expired_events(self):
         """Simplified cleanup of expired events and notifications"""
-        now = datetime.now(pytz.UTC)
+        now = datetime.now(pytz.UTC).timestamp()
         for guild in self.bot.guilds:
-            async with self.config.guild(guild).events() as events:
-                for event_id in list(events.keys()):
-                    event = events[event_id]
-                    event_time = datetime.fromisoformat(event['time1'])
-                    
-                    if event['repeat'] == RepeatType.NONE.value and event_time < now:
-                        del events[event_id]
-                        if event_id in self.active_events:
-                            self.active_events[event_id].cancel()
-                            del self.active_events[event_id]
-                        
-                        # Clean up related notifications
-                        self.sent_notifications = {
-                            key for key in self.sent_notifications 
-                            if not key.startswith(f"{guild.id}:{event_id}:")
-                        }
+            for event_id, event in list(self.guild_events[guild.id].items()):
+                if event['repeat'] == RepeatType.NONE.value and event['start'] < now:
+                    await self.delete_event(guild, event_id)
 
     @tasks.loop(minutes=15)
     async def retry_failed_notifications(self):
@@ -431,10 +421,28 @@ class RobustEventsCog(commands.Cog):
             await self.load_guild_events(guild)
         await self.load_personal_reminders()
 
+    async def migrate_guild_data(self, guild: discord.Guild):
+        """One-time conversion of a guild's stored ISO times to epoch seconds."""
+        if await self.config.guild(guild).schema_version() >= SCHEMA_VERSION:
+            return
+        zone = await self.config.guild(guild).timezone()
+        async with self.config.guild(guild).events() as events:
+            for event in events.values():
+                migrate_event(event, zone)
+        members = await self.config.all_members(guild)
+        for member_id, member_data in members.items():
+            reminders = member_data.get('personal_reminders', {})
+            if reminders:
+                await self.config.member_from_ids(guild.id, member_id).personal_reminders.set(
+                    {event_id: migrate_reminder(reminder_time) for event_id, reminder_time in reminders.items()}
+                )
+        await self.config.guild(guild).schema_version.set(SCHEMA_VERSION)
+        self.logger.info(f"Migrated events for guild {guild.id} to schema version {SCHEMA_VERSION}")
+
     async def load_guild_events(self, guild: discord.Guild):
-        events = await self.config.guild(guild).events()
-        self.guild_events[guild.id] = events
-        for event_id, event in events.items():
+        await self.migrate_guild_data(guild)
+        events = await self.event_store.load(guild)
+        for event_id in events:
             await self.schedule_event(guild, event_id)
 
     async def load_personal_reminders(self):
@@ -442,29 +450,78 @@ class RobustEventsCog(commands.Cog):
             members = await self.config.all_members(guild)
             for member_id, member_data in members.items():
                 for event_id, reminder_time in member_data.get('personal_reminders', {}).items():
-                    await self.schedule_personal_reminder(guild.id, member_id, event_id, datetime.fromisoformat(reminder_time))
+                    await self.schedule_personal_reminder(guild.id, member_id, event_id, from_epoch(reminder_time))
 
     async def schedule_event(self, guild: discord.Guild, event_id: str):
-        """Simplified event scheduling"""
-        if event_id in self.active_events:
-            self.active_events[event_id].cancel()
-        
-        self.active_events[event_id] = asyncio.create_task(self.event_loop(guild, event_id))
-        self.logger.debug(f"Scheduled event task for event {event_id} in guild {guild.id}")
+        """Queue the event's next notification or start on the central scheduler."""
+        key = f"{guild.id}:{event_id}"
+        event = self.guild_events[guild.id].get(event_id)
+        if not event:
+            self.scheduler.cancel(key)
+            return
+
+        now = datetime.now(pytz.UTC).timestamp()
+        event_time = event['start']
+
+        if event_time <= now and event['repeat'] == RepeatType.NONE.value:
+            # Already started; don't announce it again on every reload
+            self.scheduler.cancel(key)
+            return
+
+        # Whichever comes first of the event start and its pending notifications
+        next_time, action_type, notification_minutes = event_time, "event", None
+        for minutes in event['notifications']:
+            notif_time = event_time - minutes * 60
+            notification_key = f"{guild.id}:{event_id}:{minutes}"
+            if now < notif_time < next_time and notification_key not in self.sent_notifications:
+                next_time, action_type, notification_minutes = notif_time, "notification", minutes
+
+        payload = (guild.id, event_id, notification_minutes, event_time)
+        self.scheduler.schedule(key, next_time, action_type, payload)
+        self.logger.debug(f"Scheduled {action_type} for event {event_id} in guild {guild.id} at {next_time}")
 
     async def schedule_personal_reminder(self, guild_id: int, user_id: int, event_id: str, reminder_time: datetime):
         task_key = f"{guild_id}:{user_id}:{event_id}"
-        if task_key in self.personal_reminder_tasks:
-            self.logger.debug(f"Cancelling existing personal reminder task for event {event_id} for user {user_id} in guild {guild_id}")
-            self.personal_reminder_tasks[task_key].cancel()
-        self.personal_reminder_tasks[task_key] = self.bot.loop.create_task(self.personal_reminder_loop(guild_id, user_id, event_id, reminder_time))
-        self.logger.debug(f"Scheduled personal reminder task for event {event_id} for user {user_id} in guild {guild_id}")
-
-    async def personal_reminder_loop(self, guild_id: int, user_id: int, event_id: str, reminder_time: datetime):
-        now = datetime.now(pytz.UTC)
-        sleep_duration = (reminder_time - now).total_seconds()
-        if sleep_duration > 0:
-            await asyncio.sleep(sleep_duration)
+        if self.scheduler.pending(task_key):
+            self.logger.debug(f"Replacing existing personal reminder for event {event_id} for user {user_id} in guild {guild_id}")
+        self.scheduler.schedule(task_key, reminder_time.timestamp(), "reminder", (guild_id, user_id, event_id))
+        self.logger.debug(f"Scheduled personal reminder for event {event_id} for user {user_id} in guild {guild_id}")
+
+    async def fire_timer(self, kind: str, key: str, payload):
+        if kind == "reminder":
+            await self.send_personal_reminder(*payload)
+            return
+
+        guild_id, event_id, minutes, event_time = payload
+        guild = self.bot.get_guild(guild_id)
+        if not guild or event_id not in self.guild_events[guild_id]:
+            self.logger.info(f"Event {event_id} not found, dropping its timer")
+            return
+
+        try:
+            if kind == "event":
+                # A retry after a failure further on must not announce the start again
+                start_key = f"{guild_id}:{event_id}:{event_time}"
+                if start_key not in self.announced_starts:
+                    await self.send_event_start_message(guild, event_id, from_epoch(event_time))
+                    self.announced_starts.add(start_key)
+                await self.update_event_times(guild, event_id)
+                self.announced_starts.discard(start_key)
+                event = self.guild_events[guild_id].get(event_id)
+                if not event or event['start'] <= event_time:
+                    # One-off event that has now started; cleanup_expired_events removes it
+                    return
+            elif kind == "notification":
+                notification_key = f"{guild_id}:{event_id}:{minutes}"
+                if notification_key not in self.sent_notifications:
+                    await self.send_notification(guild, event_id, minutes, from_epoch(event_time))
+                    self.sent_notifications.add(notification_key)
+            await self.schedule_event(guild, event_id)
+        except Exception as e:
+            self.logger.error(f"Error handling {kind} timer for event {event_id}: {e}", exc_info=True)
+            self.scheduler.schedule(key, datetime.now(pytz.UTC).timestamp() + 60, kind, payload)  # Retry in a minute
+
+    async def send_personal_reminder(self, guild_id: int, user_id: int, event_id: str):
         event = self.guild_events[guild_id].get(event_id)
         if not event:
             return
@@ -477,7 +534,7 @@ class RobustEventsCog(commands.Cog):
             self.logger.warning(f"Guild {guild_id} not found for personal reminder of event {event_id}")
             return
         guild_tz = await self.get_guild_timezone(guild)
-        event_time = datetime.fromisoformat(event['time1']).astimezone(guild_tz)
+        event_time = event_start(event, guild_tz)
         try:
             await user.send(
                 _("🔔 Reminder: The event '{event_name}' is starting at {event_time}.").format(
@@ -490,135 +547,57 @@ class RobustEventsCog(commands.Cog):
         except discord.HTTPException as e:
             self.logger.error(f"Failed to send reminder DM to user {user_id} for event {event_id}: {e}")
 
-    async def event_loop(self, guild: discord.Guild, event_id: str):
-        """Simplified event loop that handles both notifications and event execution"""
-        while True:
-            try:
-                event = self.guild_events[guild.id].get(event_id)
-                if not event:
-                    self.logger.info(f"Event {event_id} not found, stopping loop")
-                    return
-
-                guild_tz = await self.get_guild_timezone(guild)
-                now = datetime.now(pytz.UTC)
-                event_time = datetime.fromisoformat(event['time1'])
-                
-                # Calculate next notification or event time
-                next_times = []
-                
-                # Add event start time
-                next_times.append((event_time, "event"))
-                
-                # Add notification times
-                for minutes in event['notifications']:
-                    notif_time = event_time - timedelta(minutes=minutes)
-                    notification_key = f"{guild.id}:{event_id}:{minutes}"
-                    if notif_time > now and notification_key not in self.sent_notifications:
-                        next_times.append((notif_time, f"notification_{minutes}"))
-
-                if not next_times:
-                    await self.update_event_times(guild, event_id)
-                    continue
-
-                # Get the next occurring time
-                next_time, action_type = min(next_times, key=lambda x: x[0])
-                
-                # Calculate sleep duration
-                sleep_duration = (next_time - now).total_seconds()
-                if sleep_duration > 0:
-                    await asyncio.sleep(sleep_duration)
-
-                # Handle the action
-                if action_type == "event":
-                    await self.send_event_start_message(guild, event_id, next_time)
-                    await self.update_event_times(guild, event_id)
-                elif action_type.startswith("notification_"):
-                    minutes = int(action_type.split("_")[1])
-                    notification_key = f"{guild.id}:{event_id}:{minutes}"
-                    if notification_key not in self.sent_notifications:
-                        await self.send_notification(guild, event_id, minutes, event_time)
-                        self.sent_notifications.add(notification_key)
-
-            except asyncio.CancelledError:
-                self.logger.info(f"Event loop for {event_id} cancelled")
-                return
-            except Exception as e:
-                self.logger.error(f"Error in event loop for {event_id}: {e}", exc_info=True)
-                await asyncio.sleep(60)  # Wait before retrying
+    async def get_recurrence(self, guild: discord.Guild, event_id: str, event: dict) -> Optional[Recurrence]:
+        """The event's compiled repeat rule; only recompiled when its times, repeat or timezone change."""
+        if event.get('repeat', RepeatType.NONE.value) == RepeatType.NONE.value:
+            self.recurrences.pop((guild.id, event_id), None)
+            return None
+        # start/end advance with every occurrence; the series keeps the original times as its anchor
+        start = event.get('series_start') or event['start']
+        end = event.get('series_end') or event.get('end')
+        signature = (start, end, event['repeat'], event.get('timezone'))
+        cached = self.recurrences.get((guild.id, event_id))
+        if cached and cached[0] == signature:
+            return cached[1]
+        recurrence = Recurrence(event['repeat'], from_epoch(start), from_epoch(end), event_zone(event))
+        self.recurrences[(guild.id, event_id)] = (signature, recurrence)
+        return recurrence
+
+    async def event_occurrences(self, guild: discord.Guild, event_id: str, start: datetime, end: datetime) -> List[Tuple[datetime, Optional[datetime]]]:
+        """Every (start, end) occurrence of the event starting in [start, end), in UTC."""
+        event = self.guild_events[guild.id].get(event_id)
+        if not event:
+            return []
+        recurrence = await self.get_recurrence(guild, event_id, event)
+        if recurrence:
+            return recurrence.between(start, end)
+        event_time = event_start(event)
+        return [(event_time, event_end(event))] if start <= event_time < end else []
 
     async def update_event_times(self, guild: discord.Guild, event_id: str):
-        guild_tz = await self.get_guild_timezone(guild)
         event = self.guild_events[guild.id].get(event_id)
         if not event:
             return
 
-        time1 = datetime.fromisoformat(event['time1']).astimezone(guild_tz)
-        time2 = datetime.fromisoformat(event['time2']).astimezone(guild_tz) if event.get('time2') else None
-        now = datetime.now(guild_tz)
-
-        if event['repeat'] == RepeatType.DAILY.value:
-            next_time1 = now.replace(hour=time1.hour, minute=time1.minute, second=0, microsecond=0)
-            if next_time1 <= now:
-                next_time1 += timedelta(days=1)
-            
-            if time2:
-                next_time2 = now.replace(hour=time2.hour, minute=time2.minute, second=0, microsecond=0)
-                if next_time2 <= now:
-                    next_time2 += timedelta(days=1)
-            else:
-                next_time2 = None
-        elif event['repeat'] == RepeatType.WEEKLY.value:
-            days_ahead = time1.weekday() - now.weekday()
-            if days_ahead <= 0:
-                days_ahead += 7
-            next_time1 = now + timedelta(days=days_ahead)
-            next_time1 = next_time1.replace(hour=time1.hour, minute=time1.minute, second=0, microsecond=0)
-            
-            if time2:
-                next_time2 = next_time1.replace(hour=time2.hour, minute=time2.minute)
-            else:
-                next_time2 = None
-        elif event['repeat'] == RepeatType.MONTHLY.value:
-            next_month = now.replace(day=1) + timedelta(days=32)
-            next_time1 = next_month.replace(day=min(time1.day, calendar.monthrange(next_month.year, next_month.month)[1]),
-                                            hour=time1.hour, minute=time1.minute, second=0, microsecond=0)
-            if time2:
-                next_time2 = next_time1.replace(hour=time2.hour, minute=time2.minute)
-            else:
-                next_time2 = None
-        elif event['repeat'] == RepeatType.YEARLY.value:
-            next_year = now.replace(year=now.year + 1, month=time1.month, day=time1.day,
-                                    hour=time1.hour, minute=time1.minute, second=0, microsecond=0)
-            if time1.month == 2 and time1.day == 29 and not calendar.isleap(next_year.year):
-                next_year = next_year.replace(day=28)
-            next_time1 = next_year
-            
-            if time2:
-                next_time2 = next_time1.replace(hour=time2.hour, minute=time2.minute)
-            else:
-                next_time2 = None
-        else:
+        recurrence = await self.get_recurrence(guild, event_id, event)
+        if recurrence is None:
+            return
+        occurrence = recurrence.after(datetime.now(pytz.UTC))
+        if occurrence is None:
             return
 
-        event['time1'] = next_time1.isoformat()
-        if next_time2:
-            event['time2'] = next_time2.isoformat()
+        if not event.get('series_start'):
+            event['series_start'] = event['start']
+            event['series_end'] = event.get('end')
+        next_start, next_end = occurrence
+        event['start'] = to_epoch(next_start)
+        if next_end:
+            event['end'] = to_epoch(next_end)
 
-        async with self.config.guild(guild).events() as events:
-            events[event_id] = event
-        self.guild_events[guild.id][event_id] = event
+        await self.event_store.put(guild, event_id, event)
 
         # After updating the event times, update the event info embed
-        if event_id in self.event_info_messages:
-            channel_id, message_id = self.event_info_messages[event_id]
-            channel = guild.get_channel(channel_id)
-            if channel:
-                try:
-                    message = await channel.fetch_message(message_id)
-                    new_embed = await self.create_event_info_embed(guild, event_id, event)
-                    await message.edit(embed=new_embed)
-                except (discord.NotFound, discord.Forbidden):
-                    del self.event_info_messages[event_id]
+        await self.update_single_event_embed(guild, event_id)
 
     async def queue_notification(self, guild: discord.Guild, event_id: str, notification_time: int, event_time: datetime):
         guild_tz = await self.get_guild_timezone(guild)
@@ -824,6 +803,7 @@ class RobustEventsCog(commands.Cog):
                 if ctx.guild.id not in self.event_info_messages:
                     self.event_info_messages[ctx.guild.id] = {}
                 self.event_info_messages[ctx.guild.id][event_id] = (ctx.channel.id, message.id)
+                self.embed_refresher.forget((ctx.guild.id, event_id))
             else:
                 await ctx.send(embed=self.error_embed(_("Failed to create event. Please try again.")))
 
@@ -896,7 +876,10 @@ class RobustEventsCog(commands.Cog):
             try:
                 new_time = datetime.strptime(f"{date} {start_time}", "%Y-%m-%d %H:%M")
                 new_time = guild_tz.localize(new_time)
-                update_data['time1'] = new_time.isoformat()
+                update_data['start'] = to_epoch(new_time)
+                update_data['timezone'] = guild_tz.zone
+                update_data['series_start'] = None  # Restart the repeat series from the new time
+                update_data['series_end'] = None
             except ValueError:
                 await ctx.send(embed=self.error_embed(_("Invalid date/time format. Use YYYY-MM-DD HH:MM")))
                 return
@@ -949,20 +932,21 @@ class RobustEventsCog(commands.Cog):
     async def event_list(self, ctx):
         """List all scheduled events."""
         guild_tz = await self.get_guild_timezone(ctx.guild)
-        events = await self.config.guild(ctx.guild).events()
+        events = self.guild_events.get(ctx.guild.id, {})
         if not events:
             await ctx.send(embed=self.error_embed(_("No events scheduled.")))
             return
         
         embed = discord.Embed(title=_("📅 Scheduled Events"), color=discord.Color.blue())
         for event_id, data in events.items():
-            event_time = datetime.fromisoformat(data['time1']).astimezone(guild_tz)
+            event_time = event_start(data, guild_tz)
             time_until = humanize.naturaltime(event_time, when=datetime.now(guild_tz))
-            embed.add_field(
-                name=data['name'],
-                value=f"🕒 {event_time.strftime('%Y-%m-%d %H:%M')} {guild_tz}\n⏳ {time_until}\n📍 <#{data['channel']}>",
-                inline=False
-            )
+            value = f"🕒 {event_time.strftime('%Y-%m-%d %H:%M')} {guild_tz}\n⏳ {time_until}\n📍 <#{data['channel']}>"
+            recurrence = await self.get_recurrence(ctx.guild, event_id, data)
+            if recurrence:
+                following = ", ".join(f"<t:{int(start.timestamp())}:d>" for start, end in recurrence.upcoming(event_time, 3))
+                value += f"\n🔁 {data['repeat'].capitalize()}: {following}"
+            embed.add_field(name=data['name'], value=value, inline=False)
         await ctx.send(embed=embed)
 
     @event.command(name="info")
@@ -988,6 +972,7 @@ class RobustEventsCog(commands.Cog):
         if ctx.guild.id not in self.event_info_messages:
             self.event_info_messages[ctx.guild.id] = {}
         self.event_info_messages[ctx.guild.id][event_id] = (ctx.channel.id, message.id)
+        self.embed_refresher.record((ctx.guild.id, event_id), embed)
         await self.config.guild(ctx.guild).event_info_messages.set(self.event_info_messages[ctx.guild.id])
 
     @event.command(name="cancel")
@@ -1003,7 +988,7 @@ class RobustEventsCog(commands.Cog):
 
         event = self.guild_events[ctx.guild.id][event_id]
         guild_tz = await self.get_guild_timezone(ctx.guild)
-        event_time = datetime.fromisoformat(event['time1']).astimezone(guild_tz)
+        event_time = event_start(event, guild_tz)
         now = datetime.now(guild_tz)
 
         if event_time <= now:
@@ -1028,7 +1013,7 @@ class RobustEventsCog(commands.Cog):
 
         event = self.guild_events[ctx.guild.id][event_id]
         guild_tz = await self.get_guild_timezone(ctx.guild)
-        event_time = datetime.fromisoformat(event['time1']).astimezone(guild_tz)
+        event_time = event_start(event, guild_tz)
         now = datetime.now(guild_tz)
 
         if event_time <= now:
@@ -1038,6 +1023,35 @@ class RobustEventsCog(commands.Cog):
         await self.set_personal_reminder(ctx.guild, ctx.author.id, event_id, event_time - timedelta(minutes=minutes))
         await ctx.send(embed=self.success_embed(_("I'll remind you about '{event_id}' {minutes} minutes before it starts via direct message.").format(event_id=event_id, minutes=minutes)))
 
+    @event.command(name="scheduler")
+    @commands.is_owner()
+    async def event_scheduler(self, ctx):
+        """Show the state of the event timer queue."""
+        stats = self.scheduler.stats()
+        embed = discord.Embed(title=_("⏱️ Event Scheduler"), color=discord.Color.blue())
+        kinds = ", ".join(f"{kind}: {count}" for kind, count in sorted(stats['kinds'].items())) or _("none")
+        embed.add_field(name=_("Queued Timers"), value=f"{stats['queued']} ({kinds})", inline=False)
+        next_fire = stats['next_fire_time']
+        embed.add_field(name=_("Next Fire Time"), value=f"<t:{int(next_fire)}:F> (<t:{int(next_fire)}:R>)" if next_fire else _("Nothing scheduled"), inline=False)
+        embed.add_field(
+            name=_("Firing Lag"),
+            value=_("Last: {last:.3f}s | Max: {max:.3f}s | Fired: {fired}").format(last=stats['last_lag'], max=stats['max_lag'], fired=stats['fired']),
+            inline=False
+        )
+        refresher = self.embed_refresher.stats()
+        embed.add_field(
+            name=_("Info Embeds"),
+            value=_("Tracked: {tracked} | Edited: {edits} | Unchanged: {skipped} | Gone: {missing}").format(**refresher),
+            inline=False
+        )
+        store = self.event_store.stats()
+        embed.add_field(
+            name=_("Event Cache"),
+            value=_("{events} events in {guilds} guilds | Version: {version} | Config reads: {reads}, writes: {writes}").format(**store),
+            inline=False
+        )
+        await ctx.send(embed=embed)
+
     @commands.hybrid_command(name="timezone")
     @app_commands.describe(timezone="Timezone to set (e.g., 'US/Pacific', 'Europe/London')")
     @commands.has_permissions(manage_guild=True)
@@ -1052,32 +1066,52 @@ class RobustEventsCog(commands.Cog):
             await self.handle_command_error(ctx, e)
 
     async def update_guild_timezone(self, guild: discord.Guild, new_timezone: str):
-        old_tz = await self.get_guild_timezone(guild)
         new_tz = pytz.timezone(new_timezone)
-        
-        async with self.config.guild(guild).events() as events:
-            for event in events.values():
-                event['time1'] = datetime.fromisoformat(event['time1']).astimezone(old_tz).astimezone(new_tz).isoformat()
-                if event.get('time2'):
-                    event['time2'] = datetime.fromisoformat(event['time2']).astimezone(old_tz).astimezone(new_tz).isoformat()
-        
+        # Stored times are UTC epochs, so only how they are displayed changes
         await self.config.guild(guild).timezone.set(new_timezone)
         self.guild_timezone_cache[guild.id] = new_tz
-        await self.update_event_cache(guild)
         self.logger.info(f"Updated timezone for guild {guild.id} to {new_timezone}")
 
     async def update_event_cache(self, guild: discord.Guild, event_id: str = None):
         if event_id:
-            event = await self.config.guild(guild).events.get_raw(event_id)
-            if event:
-                self.guild_events[guild.id][event_id] = event
-            else:
-                self.guild_events[guild.id].pop(event_id, None)
+            await self.event_store.refresh(guild, event_id)
         else:
-            events = await self.config.guild(guild).events()
-            self.guild_events[guild.id] = events
+            await self.event_store.load(guild)
         self.logger.debug(f"Event cache updated for guild {guild.id}")
 
+    async def update_event(self, guild: discord.Guild, event_id: str, update_data: dict) -> bool:
+        """Apply changes to one event, persisting only that event, and reschedule it."""
+        try:
+            if await self.event_store.update(guild, event_id, update_data) is None:
+                return False
+            await self.schedule_event(guild, event_id)
+            await self.update_single_event_embed(guild, event_id)
+            return True
+        except Exception as e:
+            self.logger.error(f"Error updating event {event_id} in guild {guild.id}: {e}", exc_info=True)
+            return False
+
+    async def delete_event(self, guild: discord.Guild, event_id: str) -> bool:
+        try:
+            if not await self.event_store.delete(guild, event_id):
+                return False
+        except Exception as e:
+            self.logger.error(f"Error deleting event {event_id} in guild {guild.id}: {e}", exc_info=True)
+            return False
+        self.scheduler.cancel(f"{guild.id}:{event_id}")
+        self.recurrences.pop((guild.id, event_id), None)
+        self.embed_refresher.forget((guild.id, event_id))
+        # Clean up related notifications
+        self.sent_notifications = {
+            key for key in self.sent_notifications
+            if not key.startswith(f"{guild.id}:{event_id}:")
+        }
+        self.announced_starts = {
+            key for key in self.announced_starts
+            if not key.startswith(f"{guild.id}:{event_id}:")
+        }
+        return True
+
     async def log_and_notify_error(self, guild: discord.Guild, message: str, error: Exception):
         self.logger.error(f"{message}: {error}", exc_info=True)
         owner = guild.owner
@@ -1116,47 +1150,81 @@ class RobustEventsCog(commands.Cog):
                 self.logger.error(f"Failed to send notification message: {e}")
                 await channel.send(_("An error occurred while sending the notification message. Please try again later."))
 
-    @tasks.loop(minutes=15)
-    async def sync_event_cache(self):
-        changes_made = False
-        for guild in self.bot.guilds:
-            events = await self.config.guild(guild).events()
-            if self.guild_events.get(guild.id) != events:
-                self.guild_events[guild.id] = events
-                changes_made = True
-        if changes_made:
-            self.logger.info("Event cache synced with changes")
-
-    @tasks.loop(minutes=5)
+    async def create_event_info_embed(self, guild: discord.Guild, event_id: str, event: dict) -> discord.Embed:
+        """The embed shown on an event's info message; the refresher edits it only when this output changes."""
+        guild_tz = await self.get_guild_timezone(guild)
+        start = event_start(event, guild_tz)
+        end = event_end(event, guild_tz)
+        embed = discord.Embed(title=f"📅 {event['name']}", description=event.get('description') or None, color=discord.Color.blue())
+
+        when = f"<t:{int(start.timestamp())}:F>"
+        if end:
+            when += f" – <t:{int(end.timestamp())}:t>"
+        embed.add_field(name=_("When"), value=when, inline=False)
+        embed.add_field(name=_("Starts"), value=humanize.naturaltime(start, when=datetime.now(guild_tz)), inline=True)
+        embed.add_field(name=_("Channel"), value=f"<#{event['channel']}>", inline=True)
+        role = guild.get_role(event['role_id']) if event.get('role_id') else None
+        embed.add_field(name=_("Attendees"), value=str(len(role.members)) if role else _("Everyone"), inline=True)
+
+        recurrence = await self.get_recurrence(guild, event_id, event)
+        if recurrence:
+            following = ", ".join(f"<t:{int(occurrence.timestamp())}:d>" for occurrence, _end in recurrence.upcoming(start, 3))
+            embed.add_field(name=_("Repeats"), value=f"{event['repeat'].capitalize()}: {following}", inline=False)
+        if event.get('notifications'):
+            reminders = ", ".join(str(minutes) for minutes in sorted(event['notifications']))
+            embed.add_field(name=_("Reminders"), value=_("{minutes} minutes before").format(minutes=reminders), inline=False)
+
+        embed.set_footer(text=_("Event ID: {event_id}").format(event_id=event_id))
+        embed.timestamp = datetime.now(pytz.UTC)
+        return embed
+
+    @tasks.loop(minutes=EMBED_REFRESH_MINUTES)
     async def update_event_embeds(self):
+        # Render everything first; only the info messages whose embed changed get edited
+        changed = []
         for guild in self.bot.guilds:
-            guild_tz = await self.get_guild_timezone(guild)
-            now = datetime.now(guild_tz)
-            for event_id, event in self.guild_events[guild.id].items():
-                if event_id in self.event_info_messages:
-                    channel_id, message_id = self.event_info_messages[event_id]
-                    channel = guild.get_channel(channel_id)
-                    if channel:
-                        try:
-                            message = await channel.fetch_message(message_id)
-                            new_embed = await self.create_event_info_embed(guild, event_id, event)
-                            await message.edit(embed=new_embed)
-                        except (discord.NotFound, discord.Forbidden):
-                            del self.event_info_messages[event_id]
+            for event_id, (channel_id, message_id) in list(self.event_info_messages.get(guild.id, {}).items()):
+                event = self.guild_events[guild.id].get(event_id)
+                if not event or not guild.get_channel(channel_id):
+                    continue
+                try:
+                    embed = await self.create_event_info_embed(guild, event_id, event)
+                except Exception as e:
+                    # An exception escaping the loop would stop it for good
+                    self.logger.error(f"Failed to render info embed for event {event_id} in guild {guild.id}: {e}", exc_info=True)
+                    continue
+                if self.embed_refresher.changed((guild.id, event_id), embed):
+                    changed.append((guild, event_id))
+
+        spacing = self.embed_refresher.spacing(len(changed))
+        for index, (guild, event_id) in enumerate(changed):
+            if index:
+                await asyncio.sleep(spacing)
+            # Rendered again, as the wait may have changed it
+            await self.update_single_event_embed(guild, event_id)
 
     async def update_single_event_embed(self, guild: discord.Guild, event_id: str):
-        if event_id in self.event_info_messages:
-            channel_id, message_id = self.event_info_messages[event_id]
-            channel = guild.get_channel(channel_id)
-            if channel:
-                try:
-                    message = await channel.fetch_message(message_id)
-                    event = self.guild_events[guild.id].get(event_id)
-                    if event:
-                        new_embed = await self.create_event_info_embed(guild, event_id, event)
-                        await message.edit(embed=new_embed)
-                except (discord.NotFound, discord.Forbidden):
-                    del self.event_info_messages[event_id]
+        """Edit the event's info message, if it has one and its embed changed."""
+        info_message = self.event_info_messages.get(guild.id, {}).get(event_id)
+        event = self.guild_events[guild.id].get(event_id)
+        if not info_message or not event:
+            return
+        channel_id, message_id = info_message
+        channel = guild.get_channel(channel_id)
+        if not channel:
+            return
+        new_embed = await self.create_event_info_embed(guild, event_id, event)
+        try:
+            if not await self.embed_refresher.edit((guild.id, event_id), channel, message_id, new_embed):
+                await self.forget_event_info_message(guild, event_id)
+        except discord.HTTPException as e:
+            self.logger.error(f"Failed to update info embed for event {event_id} in guild {guild.id}: {e}")
+
+    async def forget_event_info_message(self, guild: discord.Guild, event_id: str):
+        self.embed_refresher.forget((guild.id, event_id))
+        guild_messages = self.event_info_messages.get(guild.id, {})
+        if guild_messages.pop(event_id, None) is not None:
+            await self.config.guild(guild).event_info_messages.set(guild_messages)
 
     async def handle_command_error(self, ctx: commands.Context, error: Exception):
         self.logger.error(f"Error in command {ctx.command}: {error}", exc_info=True)
@@ -1170,7 +1238,7 @@ class RobustEventsCog(commands.Cog):
 
     async def sync_config(self, guild: discord.Guild):
         config = await self.get_guild_config(guild)
-        self.guild_events[guild.id] = config.get("events", {})
+        await self.event_store.load(guild)
         self.guild_timezone_cache[guild.id] = pytz.timezone(config.get("timezone", "UTC"))
 
     @commands.hybrid_command(name="eventhelp", aliases=["event"])
@@ -1234,8 +1302,9 @@ class RobustEventsCog(commands.Cog):
 
     async def purge_all_data(self):
         await self.config.clear_all()
-        self.event_tasks.clear()
-        self.personal_reminder_tasks.clear()
+        self.scheduler.clear()
+        self.recurrences.clear()
+        self.event_store.clear()
         self.notification_queue.clear()
         self.temp_event_data.clear()
         self.last_notification_time.clear()
@@ -1248,7 +1317,7 @@ class RobustEventsCog(commands.Cog):
 
     async def initialize_event_info_messages(self):
         await self.bot.wait_until_ready()
-        self.event_info_messages = {}
+        self.event_info_messages = defaultdict(dict)
         for guild in self.bot.guilds:
             guild_messages = await self.config.guild(guild).event_info_messages()
             self.event_info_messages[guild.id] = guild_messages or {}
@@ -1367,8 +1436,8 @@ class BasicEventEditModal(ui.Modal, title=_("Edit Event - Basic Info")):
         self.timezone = timezone
 
         self.name = ui.TextInput(label=_("Event Name"), default=event_name, max_length=100)
-        self.datetime1 = ui.TextInput(label=_("First Time (HH:MM)"), default=datetime.fromisoformat(event_data['time1']).astimezone(self.timezone).strftime("%H:%M"))
-        self.datetime2 = ui.TextInput(label=_("Second Time (Optional, HH:MM)"), default=datetime.fromisoformat(event_data['time2']).astimezone(self.timezone).strftime("%H:%M") if event_data.get('time2') else "", required=False)
+        self.datetime1 = ui.TextInput(label=_("First Time (HH:MM)"), default=event_start(event_data, self.timezone).strftime("%H:%M"))
+        self.datetime2 = ui.TextInput(label=_("Second Time (Optional, HH:MM)"), default=event_end(event_data, self.timezone).strftime("%H:%M") if event_data.get('end') else "", required=False)
         self.description = ui.TextInput(label=_("Description"), style=discord.TextStyle.paragraph, max_length=1000, default=event_data['description'])
 
         self.add_item(self.name)
@@ -1405,8 +1474,9 @@ class BasicEventEditModal(ui.Modal, title=_("Edit Event - Basic Info")):
 
         self.cog.temp_edit_data[interaction.user.id] = {
             'name': self.name.value,
-            'time1': event_time1.isoformat(),
-            'time2': event_time2.isoformat() if event_time2 else None,
+            'start': to_epoch(event_time1),
+            'end': to_epoch(event_time2) if event_time2 else None,
+            'timezone': self.timezone.zone,
             'description': self.description.value,
         }
 
@@ -1463,8 +1533,11 @@ class AdvancedEventEditModal(ui.Modal, title=_("Edit Event - Advanced Options"))
 
         new_data = {
             'name': basic_data['name'],
-            'time1': basic_data['time1'],
-            'time2': basic_data['time2'],
+            'start': basic_data['start'],
+            'end': basic_data['end'],
+            'timezone': basic_data['timezone'],
+            'series_start': None,
+            'series_end': None,
             'description': basic_data['description'],
             'notifications': notifications,
             'repeat': repeat,
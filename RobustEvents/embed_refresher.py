@@ -0,0 +1,72 @@
+"""
+Event info embed refreshing for RobustEvents.
+
+An info message is only edited when what it shows has changed. Each rendered
+embed is fingerprinted and compared with the fingerprint of the last edit,
+so a refresh pass in which no relative time rolled over and no attendee
+count changed makes no API calls. Edits go through ``PartialMessage``, so
+nothing is fetched first, and a pass spaces its edits out over the refresh
+interval instead of sending them in one burst.
+"""
+
+import hashlib
+import json
+from typing import Dict, Hashable
+
+import discord
+
+
+def embed_fingerprint(embed: discord.Embed) -> str:
+    data = embed.to_dict()
+    data.pop('timestamp', None)  # When it was rendered, not what it shows
+    return hashlib.blake2b(json.dumps(data, sort_keys=True, default=str).encode(), digest_size=16).hexdigest()
+
+
+class EmbedRefresher:
+    """Remembers the fingerprint of the last embed sent to each info message."""
+
+    def __init__(self, interval: float, max_spacing: float = 10.0):
+        self.interval = interval
+        self.max_spacing = max_spacing
+        self.fingerprints: Dict[Hashable, str] = {}
+        self.edits = 0
+        self.skipped = 0
+        self.missing = 0
+
+    def changed(self, key: Hashable, embed: discord.Embed) -> bool:
+        return self.fingerprints.get(key) != embed_fingerprint(embed)
+
+    def spacing(self, count: int) -> float:
+        """Seconds between edits so ``count`` edits finish well within one interval."""
+        return min(self.max_spacing, self.interval * 0.8 / count) if count else 0.0
+
+    async def edit(self, key: Hashable, channel: discord.abc.Messageable, message_id: int, embed: discord.Embed) -> bool:
+        """Edit the message if its embed changed. Returns False if the message is gone or not editable."""
+        fingerprint = embed_fingerprint(embed)
+        if self.fingerprints.get(key) == fingerprint:
+            self.skipped += 1
+            return True
+        try:
+            await channel.get_partial_message(message_id).edit(embed=embed)
+        except (discord.NotFound, discord.Forbidden):
+            self.fingerprints.pop(key, None)
+            self.missing += 1
+            return False
+        self.fingerprints[key] = fingerprint
+        self.edits += 1
+        return True
+
+    def record(self, key: Hashable, embed: discord.Embed):
+        """Note an embed that was just sent, so the next pass doesn't edit it to the same thing."""
+        self.fingerprints[key] = embed_fingerprint(embed)
+
+    def forget(self, key: Hashable):
+        self.fingerprints.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "tracked": len(self.fingerprints),
+            "edits": self.edits,
+            "skipped": self.skipped,
+            "missing": self.missing,
+        }
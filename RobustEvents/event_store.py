@@ -0,0 +1,97 @@
+"""
+Write-through event cache for RobustEvents.
+
+Every guild's events are read from Config once, when the cog loads, and
+kept in memory. A change to one event writes only that event, with
+``set_raw``/``clear_raw`` under its ID, rather than rewriting the guild's
+whole ``events`` dict. Every change bumps a version counter, so anything
+derived from an event (embeds, compiled repeat rules) can tell whether it is
+stale without comparing event contents.
+"""
+
+from collections import defaultdict
+from typing import Dict, Optional, Tuple
+
+from redbot.core import Config
+
+
+class EventStore:
+    """``events[guild_id][event_id]`` mirrors Config; only change events through this class."""
+
+    def __init__(self, config: Config):
+        self.config = config
+        self.events: Dict[int, Dict[str, dict]] = defaultdict(dict)
+        self.versions: Dict[Tuple[int, str], int] = {}
+        self.version = 0
+        self.reads = 0
+        self.writes = 0
+
+    def _bump(self, guild_id: int, event_id: str):
+        self.version += 1
+        self.versions[(guild_id, event_id)] = self.version
+
+    async def load(self, guild) -> Dict[str, dict]:
+        """Read all of a guild's events; done once per guild, not periodically."""
+        events = await self.config.guild(guild).events()
+        self.reads += 1
+        self.events[guild.id] = events
+        for event_id in events:
+            self._bump(guild.id, event_id)
+        return events
+
+    def get(self, guild_id: int, event_id: str) -> Optional[dict]:
+        return self.events[guild_id].get(event_id)
+
+    def version_of(self, guild_id: int, event_id: str) -> int:
+        return self.versions.get((guild_id, event_id), 0)
+
+    async def put(self, guild, event_id: str, event: dict):
+        await self.config.guild(guild).events.set_raw(event_id, value=event)
+        self.writes += 1
+        self.events[guild.id][event_id] = event
+        self._bump(guild.id, event_id)
+
+    async def update(self, guild, event_id: str, changes: dict) -> Optional[dict]:
+        event = self.get(guild.id, event_id)
+        if event is None:
+            return None
+        event = {**event, **changes}
+        await self.put(guild, event_id, event)
+        return event
+
+    async def delete(self, guild, event_id: str) -> bool:
+        if event_id not in self.events[guild.id]:
+            return False
+        await self.config.guild(guild).events.clear_raw(event_id)
+        self.writes += 1
+        del self.events[guild.id][event_id]
+        self.versions.pop((guild.id, event_id), None)
+        self.version += 1
+        return True
+
+    async def refresh(self, guild, event_id: str) -> Optional[dict]:
+        """Re-read one event from Config, for data changed outside this cog."""
+        event = await self.config.guild(guild).events.get_raw(event_id, default=None)
+        self.reads += 1
+        if event is None:
+            if self.events[guild.id].pop(event_id, None) is not None:
+                self.versions.pop((guild.id, event_id), None)
+                self.version += 1
+            return None
+        self.events[guild.id][event_id] = event
+        self._bump(guild.id, event_id)
+        return event
+
+    def clear(self):
+        self.events.clear()
+        self.versions.clear()
+        self.version += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "guilds": len(self.events),
+            "events": sum(len(events) for events in self.events.values()),
+            "version": self.version,
+            "reads": self.reads,
+            "writes": self.writes,
+        }
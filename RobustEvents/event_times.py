@@ -0,0 +1,59 @@
+"""
+Stored event times for RobustEvents.
+
+Since schema version 2, an event's times are UTC epoch seconds (``start``,
+``end`` and the repeat anchor ``series_start``/``series_end``) plus the IANA
+name of the zone it was created in (``timezone``). Instants compare as plain
+numbers, no parsing needed, and changing the guild timezone only changes how
+times are displayed. Version 1 stored ``time1``/``time2`` as ISO strings.
+"""
+
+from datetime import datetime
+from typing import Optional
+
+import pytz
+
+SCHEMA_VERSION = 2
+
+
+def to_epoch(moment: datetime) -> int:
+    return int(moment.timestamp())
+
+
+def from_epoch(timestamp: Optional[float], tz: pytz.BaseTzInfo = pytz.UTC) -> Optional[datetime]:
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, tz)
+
+
+def event_start(event: dict, tz: pytz.BaseTzInfo = pytz.UTC) -> datetime:
+    return datetime.fromtimestamp(event['start'], tz)
+
+
+def event_end(event: dict, tz: pytz.BaseTzInfo = pytz.UTC) -> Optional[datetime]:
+    return from_epoch(event.get('end'), tz)
+
+
+def event_zone(event: dict) -> pytz.BaseTzInfo:
+    return pytz.timezone(event.get('timezone') or 'UTC')
+
+
+def _iso_to_epoch(value: Optional[str]) -> Optional[int]:
+    return to_epoch(datetime.fromisoformat(value)) if value else None
+
+
+def migrate_event(event: dict, zone: str) -> dict:
+    """Convert a version 1 event in place; events already on version 2 are left alone."""
+    if 'time1' not in event:
+        return event
+    event['start'] = _iso_to_epoch(event.pop('time1'))
+    event['end'] = _iso_to_epoch(event.pop('time2', None))
+    event['series_start'] = _iso_to_epoch(event.pop('series_start', None))
+    event['series_end'] = _iso_to_epoch(event.pop('series_end', None))
+    event.setdefault('timezone', zone)
+    return event
+
+
+def migrate_reminder(value) -> int:
+    """Personal reminder times were ISO strings in version 1."""
+    return _iso_to_epoch(value) if isinstance(value, str) else int(value)
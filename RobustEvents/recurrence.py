@@ -0,0 +1,103 @@
+"""
+Repeat rules for RobustEvents.
+
+An event's repeat option is compiled once into a ``dateutil.rrule`` over the
+event's local wall-clock time, and each occurrence is localized in the
+event's timezone, so a 19:00 weekly event stays at 19:00 across DST changes.
+Monthly and yearly events on a day some months lack (the 31st, February 29th)
+fall on the last day of those months instead of drifting. The next few
+occurrences are cached, so the scheduler and listings can ask for the next
+occurrence, or every occurrence between two times, without re-deriving them.
+"""
+
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+import pytz
+from dateutil import rrule
+
+CACHED_OCCURRENCES = 16
+
+FREQUENCIES = {
+    'daily': rrule.DAILY,
+    'weekly': rrule.WEEKLY,
+    'monthly': rrule.MONTHLY,
+    'yearly': rrule.YEARLY,
+}
+
+Occurrence = Tuple[datetime, Optional[datetime]]
+
+
+def compile_rule(repeat: str, start: datetime) -> rrule.rrule:
+    """An rrule over naive local datetimes, starting at ``start`` (naive, local)."""
+    frequency = FREQUENCIES[repeat]
+    options = {}
+    if repeat in ('monthly', 'yearly'):
+        if start.day > 28:
+            # The requested day, or the last day of a month that doesn't have it
+            options.update(bymonthday=list(range(28, start.day + 1)), bysetpos=-1)
+        else:
+            options.update(bymonthday=start.day)
+        if repeat == 'yearly':
+            options.update(bymonth=start.month)
+    return rrule.rrule(frequency, dtstart=start, cache=True, **options)
+
+
+class Recurrence:
+    """The occurrences of one repeating event, as (start, end) pairs of UTC datetimes."""
+
+    def __init__(self, repeat: str, start: datetime, end: Optional[datetime], tz: pytz.BaseTzInfo):
+        self.tz = tz
+        local_start = start.astimezone(tz).replace(tzinfo=None)
+        # The end keeps its wall-clock distance from the start, e.g. 19:00-21:00 on every occurrence
+        self.duration = end.astimezone(tz).replace(tzinfo=None) - local_start if end else None
+        self.rule = compile_rule(repeat, local_start)
+        self.cache: List[datetime] = []
+        self.cached: List[Occurrence] = []
+        self.cached_from: Optional[datetime] = None
+
+    def _localize(self, naive: datetime) -> datetime:
+        # normalize() moves times that fall in a DST gap forward to a real time
+        return self.tz.normalize(self.tz.localize(naive)).astimezone(pytz.UTC)
+
+    def _occurrence(self, start: datetime) -> Occurrence:
+        if self.duration is None:
+            return start, None
+        local = start.astimezone(self.tz).replace(tzinfo=None)
+        return start, self._localize(local + self.duration)
+
+    def _fill(self, when: datetime):
+        local = when.astimezone(self.tz).replace(tzinfo=None) - timedelta(days=1)
+        self.cached = [
+            self._occurrence(self._localize(naive))
+            for naive in self.rule.xafter(local, count=CACHED_OCCURRENCES)
+        ]
+        self.cache = [start for start, _ in self.cached]
+        self.cached_from = when
+
+    def after(self, when: datetime) -> Optional[Occurrence]:
+        """The first occurrence starting strictly after ``when``."""
+        if not self.cache or when < self.cached_from or when >= self.cache[-1]:
+            self._fill(when)
+        index = bisect_right(self.cache, when)
+        if index >= len(self.cache):
+            return None
+        return self.cached[index]
+
+    def upcoming(self, when: datetime, count: int) -> List[Occurrence]:
+        occurrences = []
+        while len(occurrences) < count:
+            occurrence = self.after(when)
+            if occurrence is None:
+                break
+            occurrences.append(occurrence)
+            when = occurrence[0]
+        return occurrences
+
+    def between(self, start: datetime, end: datetime) -> List[Occurrence]:
+        """Every occurrence starting in [start, end)."""
+        local_start = start.astimezone(self.tz).replace(tzinfo=None) - timedelta(days=1)
+        local_end = end.astimezone(self.tz).replace(tzinfo=None) + timedelta(days=1)
+        starts = (self._localize(naive) for naive in self.rule.between(local_start, local_end, inc=True))
+        return [self._occurrence(occurrence) for occurrence in starts if start <= occurrence < end]
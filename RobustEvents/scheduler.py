@@ -0,0 +1,167 @@
+"""
+Central timer scheduler for RobustEvents.
+
+Every pending event start, event notification and personal reminder is one
+entry in a min-heap ordered by fire time, and a single sleeper task waits for
+the earliest one. Scheduling or cancelling an entry that changes the head of
+the heap wakes the sleeper so it can sleep again for the new head. Replaced
+and cancelled entries are left in the heap and skipped when they surface.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+MAX_SLEEP = 300  # Re-check the clock at least this often, in case of wall clock jumps
+
+TimerCallback = Callable[[str, str, Any], Awaitable[None]]
+
+
+class TimerEntry:
+    __slots__ = ("fire_time", "sequence", "kind", "key", "payload", "cancelled")
+
+    def __init__(self, fire_time: float, sequence: int, kind: str, key: str, payload: Any):
+        self.fire_time = fire_time
+        self.sequence = sequence
+        self.kind = kind
+        self.key = key
+        self.payload = payload
+        self.cancelled = False
+
+    def __lt__(self, other: "TimerEntry") -> bool:
+        return (self.fire_time, self.sequence) < (other.fire_time, other.sequence)
+
+
+class TimerScheduler:
+    """Fires ``callback(kind, key, payload)`` at each entry's fire time (UTC epoch seconds).
+
+    A key has at most one pending entry; scheduling it again replaces the old one.
+    """
+
+    def __init__(self, callback: TimerCallback, logger: Optional[logging.Logger] = None):
+        self.callback = callback
+        self.logger = logger or logging.getLogger('red.RobustEvents')
+        self.heap: List[TimerEntry] = []
+        self.entries: Dict[str, TimerEntry] = {}
+        self.counter = itertools.count()
+        self.wakeup = asyncio.Event()
+        self.sleeper: Optional[asyncio.Task] = None
+        self.running: Set[asyncio.Task] = set()
+        self.fired = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+
+    def schedule(self, key: str, fire_time: float, kind: str, payload: Any = None):
+        previous = self.entries.pop(key, None)
+        if previous is not None:
+            previous.cancelled = True
+        entry = TimerEntry(fire_time, next(self.counter), kind, key, payload)
+        self.entries[key] = entry
+        heapq.heappush(self.heap, entry)
+        if len(self.heap) > 2 * len(self.entries) + 64:
+            # Mostly replaced entries; rebuild rather than let them pile up
+            self.heap = [live for live in self.heap if not live.cancelled]
+            heapq.heapify(self.heap)
+        if self.heap[0] is entry:
+            self.wakeup.set()
+        self._ensure_sleeper()
+
+    def cancel(self, key: str) -> bool:
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return False
+        entry.cancelled = True
+        if self.heap and self.heap[0] is entry:
+            self.wakeup.set()
+        return True
+
+    def cancel_prefix(self, prefix: str) -> int:
+        """Cancel every entry whose key starts with ``prefix``, e.g. all of a guild's timers."""
+        keys = [key for key in self.entries if key.startswith(prefix)]
+        for key in keys:
+            self.cancel(key)
+        return len(keys)
+
+    def pending(self, key: str) -> Optional[TimerEntry]:
+        return self.entries.get(key)
+
+    def next_fire_time(self) -> Optional[float]:
+        self._discard_cancelled()
+        return self.heap[0].fire_time if self.heap else None
+
+    def _discard_cancelled(self):
+        while self.heap and self.heap[0].cancelled:
+            heapq.heappop(self.heap)
+
+    def _ensure_sleeper(self):
+        if self.sleeper is None or self.sleeper.done():
+            self.sleeper = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            self._discard_cancelled()
+            if not self.heap:
+                self.wakeup.clear()
+                await self.wakeup.wait()
+                continue
+
+            delay = self.heap[0].fire_time - time.time()
+            if delay > 0:
+                self.wakeup.clear()
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), timeout=min(delay, MAX_SLEEP))
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            entry = heapq.heappop(self.heap)
+            if entry.cancelled:
+                continue
+            del self.entries[entry.key]
+            self.fired += 1
+            self.last_lag = -delay
+            self.max_lag = max(self.max_lag, self.last_lag)
+            task = asyncio.create_task(self._fire(entry))
+            self.running.add(task)
+            task.add_done_callback(self.running.discard)
+
+    async def _fire(self, entry: TimerEntry):
+        try:
+            await self.callback(entry.kind, entry.key, entry.payload)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Error firing {entry.kind} timer {entry.key}: {e}", exc_info=True)
+
+    def stats(self) -> Dict[str, Any]:
+        next_fire = self.next_fire_time()
+        kinds: Dict[str, int] = {}
+        for entry in self.entries.values():
+            kinds[entry.kind] = kinds.get(entry.kind, 0) + 1
+        return {
+            "queued": len(self.entries),
+            "heap_size": len(self.heap),
+            "kinds": kinds,
+            "next_fire_time": next_fire,
+            "fired": self.fired,
+            "last_lag": self.last_lag,
+            "max_lag": self.max_lag,
+            "running": len(self.running),
+        }
+
+    def clear(self):
+        for entry in self.entries.values():
+            entry.cancelled = True
+        self.entries.clear()
+        self.heap.clear()
+        self.wakeup.set()
+
+    def close(self):
+        self.clear()
+        if self.sleeper is not None:
+            self.sleeper.cancel()
+        for task in list(self.running):
+            task.cancel()
@@ -1,46 +1,69 @@
 from redbot.core import commands, Config
+from redbot.core.data_manager import cog_data_path
 import discord
 from datetime import datetime, timedelta, timezone
 import asyncio
 import logging
-from functools import lru_cache
 import time
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 import os
 from collections import defaultdict
-import matplotlib.pyplot as plt
 import io
-from wordcloud import WordCloud
-import numpy as np
-from PIL import Image
 import aiohttp
-import matplotlib.animation as animation
-import plotly.graph_objects as go
-import seaborn as sns
-import kaleido
+import numpy as np
+import pytz
+from .activity_store import ActivityStore
+from .activity_histogram import HistogramIndex
+from .word_frequencies import WordFrequencyIndex
+from .inactivity import InactivityScheduler
+from .presence import DEFAULT_MAX_WINDOW, DEFAULT_QUIET_PERIOD, PresenceCoalescer, describe_activity
+from .rate_limits import DestinationRateLimiter
+from .comparison import (
+    SENTIMENT_BINS,
+    activity_summary,
+    distribution_bar,
+    most_similar_pair,
+    schedule_similarity,
+    sentiment_matrices,
+    sentiment_summary,
+)
+from .archive import EXPORT_FORMATS, ActivityArchive, export_activities
+from .activity_writer import MAX_EMBEDS_PER_MESSAGE, ActivityWriter, batch_embeds
+from .sentiment import SentimentEngine
+from .avatar_masks import AVATAR_MASK_SIZE, AvatarMaskCache
+from .rendering import (
+    ChartRenderer,
+    prepare_avatar_mask,
+    render_animated_heatmap,
+    render_circular_heatmap,
+    render_comparison_heatmap,
+    render_sentiment_graph,
+    render_sentiment_timeline,
+    render_wordcloud,
+)
 
 ACTIVITY_SUMMARY_LENGTH = 50
+DISCORD_EPOCH = datetime(2015, 1, 1, tzinfo=timezone.utc)
+MISSED_SCAN_CONCURRENCY = 4  # Channels read at the same time by the missed-activity scan
+REWRITE_PAGE_SIZE = 100  # Stored activities read per page while rebuilding a thread
+MAIN_MESSAGE_UPDATE_INTERVAL = 30  # Seconds between main message edits per guild
+SEARCH_RESULT_LIMIT = 10
+SENTIMENT_BACKFILL_LIMIT = 5000  # Unscored messages scored per sentiment timeline request
+AGGREGATE_PERSIST_INTERVAL = 300  # Seconds between histogram and word frequency saves
+MIN_RETENTION_DAYS = 30
+COMPARE_SENTIMENT_DAYS = 30
+
+def summarize_activity(activity_type, details, has_image=False):
+    if activity_type == "Message Sent":
+        content = details.split("**Content:** ")[-1]
+        summary = f"Message: {content[:ACTIVITY_SUMMARY_LENGTH]}..."
+        if has_image:
+            summary += " [Image]"
+        return summary
+    return f"{activity_type}: {details[:ACTIVITY_SUMMARY_LENGTH]}..."
 
 class UserTrackerError(Exception):
     pass
 
-class RateLimiter:
-    def __init__(self, calls, period):
-        self.calls = calls
-        self.period = period
-        self.timestamps = []
-
-    async def __aenter__(self):
-        now = datetime.now()
-        self.timestamps = [ts for ts in self.timestamps if now - ts <= self.period]
-        if len(self.timestamps) >= self.calls:
-            sleep_time = (self.timestamps[0] + self.period - now).total_seconds()
-            await asyncio.sleep(max(0, sleep_time))
-        self.timestamps.append(now)
-
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        pass
-
 class UserTracker(commands.Cog):
     """Track and analyze user activities in real-time."""
     def __init__(self, bot):
@@ -53,20 +76,86 @@ class UserTracker(commands.Cog):
             "main_message_id": None,
             "authorized_users": [],
             "user_themes": {},
-            "last_logged_activities": {}
+            "last_logged_activities": {},
+            "timezone": "UTC",
+            "wordcloud_half_life": None,
+            "rewrite_jobs": {},
+            "retention_days": None
         }
         self.config.register_guild(**default_guild)
+        self.config.register_global(presence_quiet_period=DEFAULT_QUIET_PERIOD, presence_max_window=DEFAULT_MAX_WINDOW)
         self.lock = asyncio.Lock()
         self.task = bot.loop.create_task(self.initialize())
         self.logger = logging.getLogger('UserTracker')
-        self.rate_limiter = RateLimiter(calls=5, period=timedelta(seconds=5))
-        self.last_activity = defaultdict(dict)
+        self.rate_limiter = DestinationRateLimiter()
+        self.writer = ActivityWriter(self.rate_limiter, flush_delay=2.0, on_flush=self.on_activities_written)
+        self.activity_summaries = defaultdict(dict)
+        self.main_message_tasks = {}
+        self.main_message_dirty = set()
+        self.main_message_last_edit = {}
         self.inactivity_threshold = timedelta(days=7)
-        self.check_inactivity_task = bot.loop.create_task(self.check_inactivity())
         self.fill_missed_activities_task = bot.loop.create_task(self.check_and_fill_missed_activities())
-        self.activity_cache = {}
-        self.cache_expiry = timedelta(minutes=5)
-        self.clean_cache_task = bot.loop.create_task(self.clean_activity_cache())
+        self.store = ActivityStore(cog_data_path(self) / "activity.db")
+        self.tracked_index = {}
+        self.thread_index = {}
+        self.theme_index = {}
+        self.missed_scan_locks = defaultdict(asyncio.Lock)
+        self.rewrite_tasks = {}
+        self.guild_timezones = {}
+        self.histograms = HistogramIndex(self.store, lambda guild_id: self.guild_timezones.get(guild_id, "UTC"))
+        self.guild_half_lives = {}
+        self.word_frequencies = WordFrequencyIndex(self.store, lambda guild_id: self.guild_half_lives.get(guild_id))
+        self.persist_aggregates_task = bot.loop.create_task(self.persist_aggregates())
+        self.archive = ActivityArchive(cog_data_path(self) / "archive")
+        self.retention_task = bot.loop.create_task(self.enforce_retention())
+        self.sentiment = SentimentEngine()
+        self.renderer = ChartRenderer(max_workers=2)
+        self.session = None
+        self.avatar_masks = AvatarMaskCache(cog_data_path(self) / "avatar_masks")
+        self.inactivity = InactivityScheduler(self.store, self.inactivity_threshold.total_seconds(), self.send_inactivity_notification)
+        self.presence = PresenceCoalescer(self.log_presence_changes)
+        self.check_inactivity_task = bot.loop.create_task(self.check_inactivity())
+
+    async def cog_load(self):
+        await self.load_guild_cache()
+
+    async def load_guild_cache(self):
+        self.presence.quiet_period = await self.config.presence_quiet_period()
+        self.presence.max_window = await self.config.presence_max_window()
+        all_guilds = await self.config.all_guilds()
+        self.tracked_index = {
+            guild_id: frozenset(data.get("tracked_users", []))
+            for guild_id, data in all_guilds.items()
+        }
+        self.thread_index = {
+            guild_id: dict(data.get("user_threads", {}))
+            for guild_id, data in all_guilds.items()
+        }
+        self.theme_index = {
+            guild_id: dict(data.get("user_themes", {}))
+            for guild_id, data in all_guilds.items()
+        }
+        self.guild_timezones = {
+            guild_id: data.get("timezone", "UTC")
+            for guild_id, data in all_guilds.items()
+        }
+        self.guild_half_lives = {
+            guild_id: data.get("wordcloud_half_life")
+            for guild_id, data in all_guilds.items()
+        }
+
+    def refresh_tracked_index(self, guild, tracked_users):
+        self.tracked_index[guild.id] = frozenset(tracked_users)
+
+    def refresh_thread_index(self, guild, user_threads):
+        self.thread_index[guild.id] = dict(user_threads)
+
+    def refresh_theme_index(self, guild, user_themes):
+        self.theme_index[guild.id] = dict(user_themes)
+
+    def is_tracked(self, guild, user_id):
+        """O(1) check used by the gateway listeners, without touching Config."""
+        return guild is not None and user_id in self.tracked_index.get(guild.id, ())
 
     async def initialize(self):
         await self.bot.wait_until_ready()
@@ -77,20 +166,47 @@ class UserTracker(commands.Cog):
                 if not channel:
                     await self.config.guild(guild).log_channel.set(None)
                     await self.config.guild(guild).user_threads.set({})
+                    self.refresh_thread_index(guild, {})
                     await self.config.guild(guild).main_message_id.set(None)
                     print(f"Log channel for guild {guild.name} was not found. Settings cleared.")
                 else:
                     await self.ensure_main_message(guild)
+                    await self.resume_thread_rewrites(guild)
 
-    def cog_unload(self):
+    async def cog_unload(self):
         if hasattr(self, 'task'):
             self.task.cancel()
         if hasattr(self, 'check_inactivity_task'):
             self.check_inactivity_task.cancel()
         if hasattr(self, 'fill_missed_activities_task'):
             self.fill_missed_activities_task.cancel()
-        if hasattr(self, 'clean_cache_task'):
-            self.clean_cache_task.cancel()
+        if hasattr(self, 'persist_aggregates_task'):
+            self.persist_aggregates_task.cancel()
+        if hasattr(self, 'retention_task'):
+            self.retention_task.cancel()
+        if hasattr(self, 'presence'):
+            await self.presence.close()
+        if hasattr(self, 'writer'):
+            await self.writer.close()
+        for task in getattr(self, 'main_message_tasks', {}).values():
+            task.cancel()
+        # Rewrites save their progress and resume on the next load
+        for task in getattr(self, 'rewrite_tasks', {}).values():
+            task.cancel()
+        if hasattr(self, 'rate_limiter'):
+            self.rate_limiter.close()
+        if hasattr(self, 'renderer'):
+            self.renderer.close()
+        if getattr(self, 'session', None) is not None:
+            await self.session.close()
+        if hasattr(self, 'histograms'):
+            await self.histograms.persist()
+        if hasattr(self, 'word_frequencies'):
+            await self.word_frequencies.persist()
+        if hasattr(self, 'inactivity'):
+            await self.inactivity.persist()
+        if hasattr(self, 'store'):
+            self.store.close()
 
     @commands.group(invoke_without_command=True)
     @commands.guild_only()
@@ -109,6 +225,7 @@ class UserTracker(commands.Cog):
             async with self.config.guild(ctx.guild).tracked_users() as tracked_users:
                 if user.id not in tracked_users:
                     tracked_users.append(user.id)
+                    self.refresh_tracked_index(ctx.guild, tracked_users)
                     await self.create_user_thread(ctx.guild, user)
                     await self.ensure_main_message(ctx.guild)
                     await ctx.send(f"✅ User {user.name} (ID: {user.id}) has been added to the tracking list for this server.")
@@ -125,7 +242,17 @@ class UserTracker(commands.Cog):
             async with self.config.guild(ctx.guild).tracked_users() as tracked_users:
                 if user.id in tracked_users:
                     tracked_users.remove(user.id)
+                    self.refresh_tracked_index(ctx.guild, tracked_users)
+                    rewrite_task = self.rewrite_tasks.pop((ctx.guild.id, user.id), None)
+                    if rewrite_task:
+                        rewrite_task.cancel()
+                    await self.config.guild(ctx.guild).rewrite_jobs.clear_raw(str(user.id))
                     await self.remove_user_thread(ctx.guild, user)
+                    await self.store.delete_user(ctx.guild.id, user.id)
+                    await asyncio.to_thread(self.archive.delete_user, ctx.guild.id, user.id)
+                    self.histograms.forget(ctx.guild.id, user.id)
+                    self.word_frequencies.forget(ctx.guild.id, user.id)
+                    self.inactivity.forget(ctx.guild.id, user.id)
                     await self.ensure_main_message(ctx.guild)
                     await ctx.send(f"✅ User {user.name} (ID: {user.id}) has been removed from the tracking list for this server.")
                 else:
@@ -175,6 +302,7 @@ class UserTracker(commands.Cog):
                 return
             await self.config.guild(ctx.guild).log_channel.set(channel.id)
             await self.config.guild(ctx.guild).user_threads.set({})
+            self.refresh_thread_index(ctx.guild, {})
             await self.config.guild(ctx.guild).main_message_id.set(None)
             await self.setup_log_channel(ctx.guild, channel)
             await ctx.send(f"✅ Log channel for this server set to {channel.mention}")
@@ -241,17 +369,38 @@ class UserTracker(commands.Cog):
             return
 
         try:
-            message = await channel.fetch_message(main_message_id)
             embed = await self.get_thread_list_embed(guild)
-            await message.edit(embed=embed)
+            # Editing through a partial message saves fetching it first
+            await channel.get_partial_message(main_message_id).edit(embed=embed)
+            self.main_message_last_edit[guild.id] = time.monotonic()
         except discord.NotFound:
             await self.create_main_message(guild, channel)
 
+    def request_main_message_update(self, guild):
+        """Schedule a main message refresh, coalescing requests to one edit per interval per guild."""
+        self.main_message_dirty.add(guild.id)
+        task = self.main_message_tasks.get(guild.id)
+        if task and not task.done():
+            return
+        self.main_message_tasks[guild.id] = asyncio.create_task(self._debounced_main_message_update(guild))
+
+    async def _debounced_main_message_update(self, guild):
+        # Requests made while an edit is in flight may not be in it, so go round again until none came in
+        while guild.id in self.main_message_dirty:
+            last_edit = self.main_message_last_edit.get(guild.id)
+            if last_edit is not None:
+                await asyncio.sleep(max(0, last_edit + MAIN_MESSAGE_UPDATE_INTERVAL - time.monotonic()))
+            self.main_message_dirty.discard(guild.id)
+            try:
+                await self.update_main_message(guild)
+            except Exception as e:
+                self.logger.error(f"Error updating main message in guild {guild.id}: {e}", exc_info=True)
+
     async def get_thread_list_embed(self, guild):
         embed = discord.Embed(title="🕵️ User Log Threads 🕵️", color=discord.Color.dark_purple())
         embed.description = "Behold, the chronicles of our subjects! Click the links below to dive into the rabbit hole of user logs:"
 
-        user_threads = await self.config.guild(guild).user_threads()
+        user_threads = self.thread_index.get(guild.id, {})
         tasks = []
         for user_id, thread_id in user_threads.items():
             tasks.append(self.get_user_field(guild, user_id, thread_id))
@@ -277,7 +426,7 @@ class UserTracker(commands.Cog):
         thread = guild.get_thread(thread_id)
         if user and thread:
             try:
-                last_activity = await self.get_last_message(thread)
+                last_activity = await self.get_activity_summary(guild, int(user_id))
             except Exception as e:
                 last_activity = f"Error retrieving activity: {str(e)}"
             
@@ -294,37 +443,16 @@ class UserTracker(commands.Cog):
             }
         return None
 
-    @lru_cache(maxsize=128)
-    def get_last_message_cached(self, thread_id):
-        async def _get_last_message():
-            thread = self.bot.get_channel(thread_id)
-            if not thread:
-                return "Thread not found"
-            
-            async for message in thread.history(limit=1):
-                if message.author == self.bot.user and message.embeds:
-                    embed = message.embeds[0]
-                    activity_type = embed.title
-                    details = embed.fields[0].value
-                    if activity_type == "Message Sent":
-                        content = details.split("**Content:** ")[-1]
-                        summary = f"Message: {content[:ACTIVITY_SUMMARY_LENGTH]}..."
-                        if embed.image:
-                            summary += " [Image]"
-                        return summary
-                    else:
-                        return f"{activity_type}: {details[:ACTIVITY_SUMMARY_LENGTH]}..."
-                elif message.author != self.bot.user:
-                    summary = f"User message: {message.content[:ACTIVITY_SUMMARY_LENGTH]}..."
-                    if message.attachments:
-                        summary += " [Image]"
-                    return summary
-            return "No activity logged yet"
-        
-        return asyncio.create_task(_get_last_message())
-
-    async def get_last_message(self, thread):
-        return await self.get_last_message_cached(thread.id)
+    async def get_activity_summary(self, guild, user_id):
+        summaries = self.activity_summaries[guild.id]
+        if user_id not in summaries:
+            # Seed from the local store once, later events keep it current
+            rows = await self.store.activities(guild.id, user_id, limit=1, newest_first=True)
+            if rows:
+                summaries[user_id] = summarize_activity(rows[0]['activity_type'], rows[0]['details'])
+            else:
+                summaries[user_id] = "No activity logged yet"
+        return summaries[user_id]
 
     async def create_user_thread(self, guild, user):
         log_channel_id = await self.config.guild(guild).log_channel()
@@ -344,23 +472,31 @@ class UserTracker(commands.Cog):
                     return thread
                 # If thread doesn't exist, remove it from user_threads
                 del user_threads[str(user.id)]
+                self.refresh_thread_index(guild, user_threads)
             
             # Check for existing threads with the same name
             for thread in log_channel.threads:
                 if thread.name == thread_name:
                     user_threads[str(user.id)] = thread.id
+                    self.refresh_thread_index(guild, user_threads)
                     return thread
             
             # Create a new thread only if one doesn't exist
             thread = await log_channel.create_thread(name=thread_name, auto_archive_duration=10080)
             user_threads[str(user.id)] = thread.id
+            self.refresh_thread_index(guild, user_threads)
+
+        # A brand-new thread has no history the store is missing
+        await self.store.mark_thread_imported(thread.id)
 
         await self.update_main_message(guild)
         return thread
 
     async def remove_user_thread(self, guild, user):
+        self.activity_summaries[guild.id].pop(user.id, None)
         async with self.config.guild(guild).user_threads() as user_threads:
             thread_id = user_threads.pop(str(user.id), None)
+            self.refresh_thread_index(guild, user_threads)
         if thread_id:
             thread = guild.get_thread(thread_id)
             if thread:
@@ -368,30 +504,30 @@ class UserTracker(commands.Cog):
         await self.update_main_message(guild)
 
     async def get_user_thread(self, guild, user):
-        user_threads = await self.config.guild(guild).user_threads()
-        thread_id = user_threads.get(str(user.id))
+        thread_id = self.thread_index.get(guild.id, {}).get(str(user.id))
         if thread_id:
             return guild.get_thread(thread_id)
         return None
 
-    async def create_embed(self, user, guild, activity_type, details):
+    async def create_embed(self, user, guild, activity_type, details, timestamp=None):
         emoji_map = {
             "Message Sent": "💬",
             "Voice Activity": "🎙️",
             "Status Change": "🔄",
             "Activity Change": "🎮",
+            "Presence Summary": "📡",
             "Message Edited": "✏️",
             "Message Deleted": "🗑️"
         }
         emoji = emoji_map.get(activity_type, "ℹ️")
         
-        user_themes = await self.config.guild(guild).user_themes()
+        user_themes = self.theme_index.get(guild.id, {})
         color = discord.Color(user_themes.get(str(user.id), discord.Color.random().value))
         
         embed = discord.Embed(
             title=f"{emoji} {activity_type}",
             color=color,
-            timestamp=datetime.utcnow()
+            timestamp=timestamp or datetime.utcnow()
         )
         embed.set_author(name=user.name, icon_url=user.display_avatar.url)
         embed.add_field(name="Details", value=details, inline=False)
@@ -399,82 +535,150 @@ class UserTracker(commands.Cog):
         
         return embed
 
-    async def log_activity(self, user, guild, activity_type, details, image_urls=None):
-        async with self.rate_limiter:
-            try:
-                tracked_users = await self.config.guild(guild).tracked_users()
-                if user.id in tracked_users:
-                    thread = await self.get_user_thread(guild, user)
-                    if thread:
-                        embed = await self.create_embed(user, guild, activity_type, details)
-                        
-                        if activity_type == "Message Sent":
-                            content = details.split("**Content:** ")[-1]
-                            analysis = await self.analyze_text(content)
-                            embed.add_field(name="Sentiment", value=f"{analysis['sentiment']:.2f}", inline=True)
-                            embed.add_field(name="Positive", value=f"{analysis['positive']:.2f}", inline=True)
-                            embed.add_field(name="Neutral", value=f"{analysis['neutral']:.2f}", inline=True)
-                            embed.add_field(name="Negative", value=f"{analysis['negative']:.2f}", inline=True)
-                            embed.add_field(name="Toxicity", value="Detected" if analysis['toxicity'] else "Not Detected", inline=True)
-                        
-                        if image_urls:
-                            if isinstance(image_urls, list) and len(image_urls) > 0:
-                                embed.set_image(url=image_urls[0])
-                            elif isinstance(image_urls, str):
-                                embed.set_image(url=image_urls)
-                        
-                        await thread.send(embed=embed)
-                        
-                        if isinstance(image_urls, list) and len(image_urls) > 1:
-                            for url in image_urls[1:]:
-                                additional_embed = discord.Embed()
-                                additional_embed.set_image(url=url)
-                                await thread.send(embed=additional_embed)
-
-                        self.get_last_message_cached.cache_clear()
-                        await self.update_main_message(guild)
-                        self.last_activity[user.id][guild.id] = datetime.utcnow()
-                        
-                        # Update the last logged activity timestamp
-                        async with self.config.guild(guild).last_logged_activities() as last_logged_activities:
-                            last_logged_activities[str(user.id)] = datetime.utcnow().isoformat()
-            except Exception as e:
-                if not isinstance(e, discord.errors.NotFound):  # Only log if it's not a NotFound error
-                    self.logger.error(f"Error logging activity for user {user.id} in guild {guild.id}: {str(e)}", exc_info=True)
+    async def log_activity(self, user, guild, activity_type, details, image_urls=None, message=None):
+        try:
+            if self.is_tracked(guild, user.id):
+                analysis = None
+                if activity_type == "Message Sent":
+                    content = details.split("**Content:** ")[-1]
+                    analysis = await self.analyze_text(content)
+
+                timestamp = await self.store_activity(user, guild, activity_type, details, message, analysis)
+                await self.histograms.record(guild.id, user.id, timestamp)
+                if activity_type == "Message Sent":
+                    await self.word_frequencies.record(guild.id, user.id, content)
+                self.inactivity.touch(guild.id, user.id, timestamp)
+                self.activity_summaries[guild.id][user.id] = summarize_activity(activity_type, details, bool(image_urls))
+
+                thread = await self.get_user_thread(guild, user)
+                if thread:
+                    embed = await self.create_embed(user, guild, activity_type, details)
+                    
+                    if analysis:
+                        embed.add_field(name="Sentiment", value=f"{analysis['sentiment']:.2f}", inline=True)
+                        embed.add_field(name="Positive", value=f"{analysis['positive']:.2f}", inline=True)
+                        embed.add_field(name="Neutral", value=f"{analysis['neutral']:.2f}", inline=True)
+                        embed.add_field(name="Negative", value=f"{analysis['negative']:.2f}", inline=True)
+                        embed.add_field(name="Toxicity", value="Detected" if analysis['toxicity'] else "Not Detected", inline=True)
+                    
+                    if image_urls:
+                        if isinstance(image_urls, list) and len(image_urls) > 0:
+                            embed.set_image(url=image_urls[0])
+                        elif isinstance(image_urls, str):
+                            embed.set_image(url=image_urls)
+                    
+                    embeds = [embed]
+                    if isinstance(image_urls, list) and len(image_urls) > 1:
+                        for url in image_urls[1:]:
+                            additional_embed = discord.Embed()
+                            additional_embed.set_image(url=url)
+                            embeds.append(additional_embed)
+
+                    # Sending, timestamp bookkeeping and the main message refresh happen in on_activities_written
+                    await self.writer.enqueue(thread, embeds, guild.id, user.id)
+        except Exception as e:
+            if not isinstance(e, discord.errors.NotFound):  # Only log if it's not a NotFound error
+                self.logger.error(f"Error logging activity for user {user.id} in guild {guild.id}: {str(e)}", exc_info=True)
+
+    async def on_activities_written(self, thread, written):
+        guild = thread.guild
+        now = datetime.utcnow().isoformat()
+        # Update the last logged activity timestamps once per written message
+        async with self.config.guild(guild).last_logged_activities() as last_logged_activities:
+            for user_id in {item.user_id for item in written}:
+                last_logged_activities[str(user_id)] = now
+        self.request_main_message_update(guild)
+
+    async def store_activity(self, user, guild, activity_type, details, message=None, analysis=None):
+        content = None
+        if activity_type in ("Message Sent", "Message Deleted"):
+            content = message.content if message else details.split("**Content:** ")[-1]
+        timestamp = time.time()
+        await self.store.record(
+            guild.id, user.id, activity_type, details,
+            timestamp=timestamp,
+            channel_id=message.channel.id if message else None,
+            message_id=message.id if message else None,
+            content=content,
+            sentiment=analysis['sentiment'] if analysis else None
+        )
+        return timestamp
+
+    async def import_user_history(self, guild, user):
+        thread = await self.get_user_thread(guild, user)
+        if thread:
+            await self.import_thread_history(guild, user, thread)
+        return thread
+
+    async def import_thread_history(self, guild, user, thread):
+        """Copy activities logged before the local store existed out of a user's thread (once per thread)."""
+        if await self.store.is_thread_imported(thread.id):
+            return
+        # Anything logged since the store existed is already in it
+        earliest, _ = await self.store.timestamp_bounds(guild.id, user.id)
+        before = datetime.fromtimestamp(earliest, timezone.utc) if earliest else None
+        activities = []
+        async for message in thread.history(limit=None, oldest_first=True, before=before):
+            if message.author != self.bot.user:
+                continue
+            for embed in message.embeds:
+                if not embed.title or not embed.fields or embed.fields[0].name != "Details":
+                    continue
+                activity_type = embed.title.split(" ", 1)[-1]
+                details = embed.fields[0].value
+                sentiment = None
+                for field in embed.fields:
+                    if field.name == "Sentiment":
+                        try:
+                            sentiment = float(field.value)
+                        except ValueError:
+                            pass
+                activities.append({
+                    "guild_id": guild.id,
+                    "user_id": user.id,
+                    "activity_type": activity_type,
+                    "timestamp": (embed.timestamp or message.created_at).timestamp(),
+                    "content": details.split("**Content:** ")[-1] if activity_type in ("Message Sent", "Message Deleted") else None,
+                    "details": details,
+                    "sentiment": sentiment
+                })
+        if await self.store.record_many(activities):
+            self.histograms.forget(guild.id, user.id)
+            self.word_frequencies.forget(guild.id, user.id)
+        await self.store.mark_thread_imported(thread.id)
+
+    async def build_stored_embed(self, user, guild, row):
+        timestamp = datetime.fromtimestamp(row['timestamp'], timezone.utc)
+        embed = await self.create_embed(user, guild, row['activity_type'], row['details'], timestamp=timestamp)
+        if row['sentiment'] is not None:
+            embed.add_field(name="Sentiment", value=f"{row['sentiment']:.2f}", inline=True)
+        return embed
 
     async def bot_in_guild(self, guild_id):
         return self.bot.get_guild(guild_id) is not None
 
     async def analyze_text(self, text):
         try:
-            analyzer = SentimentIntensityAnalyzer()
-            sentiment_scores = analyzer.polarity_scores(text)
-            return {
-                'sentiment': sentiment_scores['compound'],
-                'positive': sentiment_scores['pos'],
-                'neutral': sentiment_scores['neu'],
-                'negative': sentiment_scores['neg'],
-                'toxicity': sentiment_scores['compound'] < -0.5
-            }
+            return await self.sentiment.analyze(text)
         except Exception as e:
             self.logger.error(f"Error in analyze_text: {e}", exc_info=True)
             return {'sentiment': 0, 'positive': 0, 'neutral': 0, 'negative': 0, 'toxicity': False}
 
     @commands.Cog.listener()
     async def on_message(self, message):
-        if message.author.bot or not await self.bot_in_guild(message.guild.id):
+        if message.author.bot or not self.is_tracked(message.guild, message.author.id) or not await self.bot_in_guild(message.guild.id):
             return
         try:
-            tracked_users = await self.config.guild(message.guild).tracked_users()
-            if message.author.id in tracked_users:
-                details = f"**Server:** {message.guild.name}\n**Channel:** {message.channel.mention}\n**Content:** {message.content[:1900]}{'...' if len(message.content) > 1900 else ''}"
-                image_urls = [attachment.url for attachment in message.attachments if attachment.width]
-                await self.log_activity(message.author, message.guild, "Message Sent", details, image_urls)
+            details = f"**Server:** {message.guild.name}\n**Channel:** {message.channel.mention}\n**Content:** {message.content[:1900]}{'...' if len(message.content) > 1900 else ''}"
+            image_urls = [attachment.url for attachment in message.attachments if attachment.width]
+            await self.log_activity(message.author, message.guild, "Message Sent", details, image_urls, message=message)
         except Exception as e:
             self.logger.error(f"Error in on_message for user {message.author.id}: {e}", exc_info=True)
 
     @commands.Cog.listener()
     async def on_voice_state_update(self, member, before, after):
+        if not self.is_tracked(member.guild, member.id):
+            return
         if before.channel != after.channel:
             try:
                 if after.channel:
@@ -490,50 +694,62 @@ class UserTracker(commands.Cog):
                 self.logger.error(f"Error in on_voice_state_update for user {member.id}: {e}", exc_info=True)
 
     @commands.Cog.listener()
-    async def on_member_update(self, before, after):
+    async def on_presence_update(self, before, after):
+        if not self.is_tracked(after.guild, after.id):
+            return
         try:
-            if before.status != after.status:
-                details = f"**Server:** {after.guild.name}\n**New status:** {after.status}"
-                await self.log_activity(after, after.guild, "Status Change", details)
-
-            if before.activity != after.activity:
-                activity = after.activity
-                if activity:
-                    if isinstance(activity, discord.Game):
-                        details = f"Playing {activity.name}"
-                    elif isinstance(activity, discord.Streaming):
-                        details = f"Streaming {activity.name}"
-                    elif isinstance(activity, discord.Spotify):
-                        details = f"Listening to {activity.title} by {activity.artist}"
-                    else:
-                        details = str(activity)
-                    details = f"**Server:** {after.guild.name}\n**Activity:** {details[:ACTIVITY_SUMMARY_LENGTH]}{'...' if len(details) > ACTIVITY_SUMMARY_LENGTH else ''}"
-                    await self.log_activity(after, after.guild, "Activity Change", details)
+            self.presence.observe(
+                after.guild.id, after.id,
+                str(before.status), self.presence_activity(before.activity),
+                str(after.status), self.presence_activity(after.activity),
+            )
         except Exception as e:
-            self.logger.error(f"Error in on_member_update for user {after.id}: {e}", exc_info=True)
+            self.logger.error(f"Error in on_presence_update for user {after.id}: {e}", exc_info=True)
+
+    @staticmethod
+    def presence_activity(activity):
+        details = describe_activity(activity)
+        if details is None:
+            return None
+        return f"{details[:ACTIVITY_SUMMARY_LENGTH]}{'...' if len(details) > ACTIVITY_SUMMARY_LENGTH else ''}"
+
+    async def log_presence_changes(self, user_id, guild_ids, entries):
+        """Log one coalesced presence window to every guild it was seen through."""
+        logged_to = set()
+        for guild_id in guild_ids:
+            guild = self.bot.get_guild(guild_id)
+            if guild is None or not self.is_tracked(guild, user_id):
+                continue
+            member = guild.get_member(user_id)
+            if member is None:
+                continue
+            for activity_type, details in entries:
+                await self.log_activity(member, guild, activity_type, f"**Server:** {guild.name}\n{details}")
+            logged_to.add(guild_id)
+        return logged_to
 
     @commands.Cog.listener()
     async def on_message_edit(self, before, after):
-        if after.author.bot or not await self.bot_in_guild(after.guild.id):
+        if after.author.bot or not self.is_tracked(after.guild, after.author.id) or not await self.bot_in_guild(after.guild.id):
             return
         try:
             details = (f"**Server:** {after.guild.name}\n"
                        f"**Channel:** {after.channel.mention}\n"
                        f"**Before:** {before.content[:900]}{'...' if len(before.content) > 900 else ''}\n"
                        f"**After:** {after.content[:900]}{'...' if len(after.content) > 900 else ''}")
-            await self.log_activity(after.author, after.guild, "Message Edited", details)
+            await self.log_activity(after.author, after.guild, "Message Edited", details, message=after)
         except Exception as e:
             self.logger.error(f"Error in on_message_edit for user {after.author.id}: {e}", exc_info=True)
 
     @commands.Cog.listener()
     async def on_message_delete(self, message):
-        if message.author.bot or not await self.bot_in_guild(message.guild.id):
+        if message.author.bot or not self.is_tracked(message.guild, message.author.id) or not await self.bot_in_guild(message.guild.id):
             return
         try:
             details = (f"**Server:** {message.guild.name}\n"
                        f"**Channel:** {message.channel.mention}\n"
                        f"**Content:** {message.content[:1900]}{'...' if len(message.content) > 1900 else ''}")
-            await self.log_activity(message.author, message.guild, "Message Deleted", details)
+            await self.log_activity(message.author, message.guild, "Message Deleted", details, message=message)
         except Exception as e:
             self.logger.error(f"Error in on_message_delete for user {message.author.id}: {e}", exc_info=True)
 
@@ -544,11 +760,94 @@ class UserTracker(commands.Cog):
             if channel.id == log_channel_id:
                 await self.config.guild(channel.guild).log_channel.set(None)
                 await self.config.guild(channel.guild).user_threads.set({})
+                self.refresh_thread_index(channel.guild, {})
                 await self.config.guild(channel.guild).main_message_id.set(None)
                 print(f"Log channel {channel.name} was deleted in guild {channel.guild.name}. Log channel and thread settings have been cleared.")
         except Exception as e:
             self.logger.error(f"Error in on_guild_channel_delete for guild {channel.guild.id}: {e}", exc_info=True)
 
+    @track.command(name="stats")
+    async def track_stats(self, ctx):
+        """Show the activity log queue depth and flush latency."""
+        if not await self.is_authorized(ctx):
+            await ctx.send("You are not authorized to use UserTracker commands.")
+            return
+
+        stats = self.writer.stats()
+        embed = discord.Embed(title="📊 UserTracker Stats", color=discord.Color.blue())
+        embed.add_field(name="Queued Embeds", value=f"{stats['depth']} across {stats['threads']} threads", inline=False)
+        embed.add_field(name="Messages Sent", value=str(stats['messages_sent']), inline=True)
+        embed.add_field(name="Embeds Sent", value=str(stats['embeds_sent']), inline=True)
+        embed.add_field(name="Failed Embeds", value=str(stats['failed_embeds']), inline=True)
+        embed.add_field(name="Flush Latency", value=f"avg {stats['avg_latency']:.2f}s | last {stats['last_latency']:.2f}s | max {stats['max_latency']:.2f}s", inline=False)
+        limit_stats = self.rate_limiter.stats()
+        embed.add_field(name="Rate Limit Wait", value=f"avg {limit_stats['avg_wait']:.2f}s | max {limit_stats['max_wait']:.2f}s | {limit_stats['delayed']}/{limit_stats['acquired']} sends delayed | {limit_stats['waiting']} waiting across {limit_stats['destinations']} destinations", inline=False)
+        presence_stats = self.presence.stats()
+        embed.add_field(name="Presence Coalescing", value=f"{presence_stats['events']} updates → {presence_stats['logged']} entries | {presence_stats['suppressed']} suppressed ({presence_stats['duplicates']} duplicates) | {presence_stats['open_windows']} open windows", inline=False)
+        sentiment_stats = self.sentiment.stats()
+        render_stats = self.renderer.stats()
+        embed.add_field(name="Chart Cache", value=f"{render_stats['cached']} charts ({render_stats['cached_bytes'] / 1024:.0f} KiB) | {render_stats['hits']} hits | {render_stats['misses']} misses", inline=False)
+        mask_stats = await self.avatar_masks.stats()
+        embed.add_field(name="Avatar Masks", value=f"{mask_stats['cached']} masks ({mask_stats['cached_bytes'] / 1024:.0f} KiB) | {mask_stats['hits']} hits | {mask_stats['misses']} misses", inline=False)
+        embed.add_field(name="Sentiment Cache", value=f"{sentiment_stats['cached']} scores | {sentiment_stats['hits']} hits | {sentiment_stats['misses']} misses", inline=False)
+        await ctx.send(embed=embed)
+
+    @track.command(name="search")
+    async def track_search(self, ctx, user: discord.User, *, query: str):
+        """Search a tracked user's logged messages.
+
+        Use "quotes" for phrases and a trailing * for prefixes. Narrow results with
+        `after:YYYY-MM-DD`, `before:YYYY-MM-DD` and `in:#channel`.
+        """
+        if not await self.is_authorized(ctx):
+            await ctx.send("You are not authorized to use UserTracker commands.")
+            return
+
+        try:
+            text, since, until, channel_id = self.parse_search_filters(ctx.guild, query)
+        except ValueError:
+            await ctx.send("❌ Dates must be written as YYYY-MM-DD and channels as #channel or an ID.")
+            return
+        if not self.store.search_terms(text):
+            await ctx.send("❌ Please give at least one word to search for.")
+            return
+
+        await self.import_user_history(ctx.guild, user)
+        rows = await self.store.search(ctx.guild.id, user.id, text, since=since, until=until, channel_id=channel_id, limit=SEARCH_RESULT_LIMIT)
+        if not rows:
+            await ctx.send(f"No messages from {user.name} match `{text}`.")
+            return
+
+        embed = discord.Embed(title=f"🔍 {user.name}: {text}"[:256], color=discord.Color.blue())
+        for row in rows:
+            when = datetime.fromtimestamp(row['timestamp'], timezone.utc).strftime('%Y-%m-%d %H:%M UTC')
+            channel = ctx.guild.get_channel(row['channel_id']) if row['channel_id'] else None
+            value = row['snippet'][:900]
+            if row['channel_id'] and row['message_id']:
+                value += f"\n[Jump](https://discord.com/channels/{ctx.guild.id}/{row['channel_id']}/{row['message_id']})"
+            embed.add_field(name=f"{when}{f' in #{channel.name}' if channel else ''}", value=value, inline=False)
+        await ctx.send(embed=embed)
+
+    def parse_search_filters(self, guild, query):
+        """Split `after:`, `before:` and `in:` filters out of a search query."""
+        tz = pytz.timezone(self.guild_timezones.get(guild.id, "UTC"))
+        since = until = channel_id = None
+        terms = []
+        for term in query.split(" "):
+            key, _, value = term.partition(":")
+            key = key.lower()
+            if value and key in ("after", "since", "before", "until"):
+                day = tz.localize(datetime.strptime(value, "%Y-%m-%d")).timestamp()
+                if key in ("after", "since"):
+                    since = day
+                else:
+                    until = day
+            elif value and key in ("in", "channel"):
+                channel_id = int(value.strip("<#>"))
+            else:
+                terms.append(term)
+        return " ".join(terms).strip(), since, until, channel_id
+
     @track.command(name="analyze")
     async def track_analyze(self, ctx, user: discord.User):
         """Analyze the sentiment and toxicity of a user's messages."""
@@ -556,18 +855,9 @@ class UserTracker(commands.Cog):
             await ctx.send("You are not authorized to use UserTracker commands.")
             return
     
-        thread = await self.get_user_thread(ctx.guild, user)
-        if not thread:
-            await ctx.send(f"No log thread found for user {user.name}.")
-            return
-    
-        messages = []
-        async for message in thread.history(limit=100):
-            if message.author == self.bot.user and message.embeds:
-                embed = message.embeds[0]
-                if embed.title == "Message Sent":
-                    content = embed.fields[0].value.split("**Content:** ")[-1]
-                    messages.append(content)
+        await self.import_user_history(ctx.guild, user)
+        rows = await self.store.messages(ctx.guild.id, user.id, limit=100)
+        messages = [row['content'] for row in rows if row['content']]
     
         if not messages:
             await ctx.send(f"No recent messages found for user {user.name}.")
@@ -597,6 +887,28 @@ class UserTracker(commands.Cog):
 
         await ctx.send(embed=embed)
 
+    @track.command(name="presencewindow")
+    @commands.is_owner()
+    async def track_presencewindow(self, ctx, quiet_seconds: int = None, max_seconds: int = None):
+        """Set or view how presence changes are coalesced (Bot Owner only).
+
+        Changes are merged until the user has been quiet for `quiet_seconds`, or for at most `max_seconds`.
+        """
+        if quiet_seconds is None:
+            await ctx.send(f"Presence changes are merged until {self.presence.quiet_period}s of quiet, at most {self.presence.max_window}s per entry.")
+            return
+
+        max_seconds = max_seconds if max_seconds is not None else max(quiet_seconds, self.presence.max_window)
+        if quiet_seconds < 0 or max_seconds < quiet_seconds:
+            await ctx.send("❌ The quiet period cannot be negative or longer than the maximum window.")
+            return
+
+        await self.config.presence_quiet_period.set(quiet_seconds)
+        await self.config.presence_max_window.set(max_seconds)
+        self.presence.quiet_period = quiet_seconds
+        self.presence.max_window = max_seconds
+        await ctx.send(f"✅ Presence changes will be merged until {quiet_seconds}s of quiet, at most {max_seconds}s per entry.")
+
     @track.command(name="authorize")
     @commands.is_owner()
     async def track_authorize(self, ctx, user: discord.User):
@@ -627,24 +939,20 @@ class UserTracker(commands.Cog):
 
     async def check_inactivity(self):
         await self.bot.wait_until_ready()
-        while not self.bot.is_closed():
-            for guild in self.bot.guilds:
-                tracked_users = await self.config.guild(guild).tracked_users()
-                for user_id in tracked_users:
-                    user = self.bot.get_user(user_id)
-                    if user and guild.id in self.last_activity.get(user_id, {}):
-                        last_active = self.last_activity[user_id][guild.id]
-                        if datetime.utcnow() - last_active > self.inactivity_threshold:
-                            await self.send_inactivity_notification(guild, user)
-            await asyncio.sleep(86400)  # Check once a day
+        await self.inactivity.load(lambda guild_id, user_id: user_id in self.tracked_index.get(guild_id, ()))
+        await self.inactivity.run()
 
-    async def send_inactivity_notification(self, guild, user):
+    async def send_inactivity_notification(self, guild_id, user_id, last_seen):
+        guild = self.bot.get_guild(guild_id)
+        user = self.bot.get_user(user_id)
+        if not guild or not user or not self.is_tracked(guild, user_id):
+            return
         log_channel_id = await self.config.guild(guild).log_channel()
         if not log_channel_id:
             return
         channel = guild.get_channel(log_channel_id)
         if channel:
-            days_inactive = (datetime.utcnow() - self.last_activity[user.id][guild.id]).days
+            days_inactive = int((time.time() - last_seen) // 86400)
             message = f"👻 Ghostbuster Alert! 👻\n{user.name} hasn't been seen for {days_inactive} days. " \
                       f"Did they fall into a black hole, or just discover outdoor activities?"
             await channel.send(message)
@@ -653,17 +961,8 @@ class UserTracker(commands.Cog):
         await self.bot.wait_until_ready()
         while not self.bot.is_closed():
             for guild in self.bot.guilds:
-                tracked_users = await self.config.guild(guild).tracked_users()
-                last_logged_activities = await self.config.guild(guild).last_logged_activities()
-                for user_id in tracked_users:
-                    user = self.bot.get_user(user_id)
-                    if user:
-                        last_logged_str = last_logged_activities.get(str(user_id))
-                        if last_logged_str:
-                            last_logged = datetime.fromisoformat(last_logged_str)
-                        else:
-                            last_logged = datetime(1970, 1, 1)  # Use Unix epoch as default
-                        await self.fill_missed_activities(guild, user, last_logged)
+                if self.tracked_index.get(guild.id):
+                    await self.fill_missed_activities_for_guild(guild)
             await asyncio.sleep(3600)  # Run every hour
 
     @track.command(name="fillmissed")
@@ -673,114 +972,326 @@ class UserTracker(commands.Cog):
             await ctx.send("You are not authorized to use UserTracker commands.")
             return
 
-        tracked_users = await self.config.guild(ctx.guild).tracked_users()
-        if user.id not in tracked_users:
+        if not self.is_tracked(ctx.guild, user.id):
             await ctx.send(f"User {user.name} is not being tracked in this server.")
             return
 
-        last_logged_activities = await self.config.guild(ctx.guild).last_logged_activities()
-        last_logged_str = last_logged_activities.get(str(user.id))
-        if last_logged_str:
-            last_logged = datetime.fromisoformat(last_logged_str)
-        else:
-            last_logged = datetime(1970, 1, 1)  # Use Unix epoch as default
-
+        # Channels are read once for every tracked user, so this fills everyone in the server
         await ctx.send(f"Filling missed activities for {user.name}. This might take a while...")
-        total_messages = await self.fill_missed_activities(ctx.guild, user, last_logged)
+        results = await self.fill_missed_activities_for_guild(ctx.guild)
+        total_messages = results.get(user.id, 0)
 
         if total_messages > 0:
             await ctx.send(f"✅ Successfully filled {total_messages} missed activities for {user.name}.")
         else:
             await ctx.send(f"ℹ️ No missed activities found for {user.name}.")
 
-    async def fill_missed_activities(self, guild, user, last_logged):
-        try:
-            # Ensure last_logged is not before the Discord epoch and is UTC aware
-            discord_epoch = datetime(2015, 1, 1, tzinfo=timezone.utc)
-            last_logged = max(last_logged.replace(tzinfo=timezone.utc), discord_epoch)
+    @staticmethod
+    def parse_last_logged(last_logged_activities, user_id):
+        last_logged_str = last_logged_activities.get(str(user_id))
+        if last_logged_str:
+            last_logged = datetime.fromisoformat(last_logged_str)
+        else:
+            last_logged = datetime(1970, 1, 1)  # Use Unix epoch as default
+        # Ensure last_logged is not before the Discord epoch and is UTC aware
+        return max(last_logged.replace(tzinfo=timezone.utc), DISCORD_EPOCH)
 
-            thread = await self.get_user_thread(guild, user)
-            if not thread:
-                self.logger.error(f"No thread found for user {user.id} in guild {guild.id}")
-                return 0
+    async def fill_missed_activities_for_guild(self, guild):
+        """Scan the guild once for all tracked users and fill each user's log. Returns {user_id: activities filled}."""
+        async with self.missed_scan_locks[guild.id]:
+            results = {}
+            try:
+                found, checkpoints = await self.scan_missed_messages(guild)
+                last_logged_activities = await self.config.guild(guild).last_logged_activities()
+                unstored_channels = set()
+                for user_id in self.tracked_index.get(guild.id, ()):
+                    messages = found.get(user_id, [])
+                    try:
+                        user = await self.resolve_tracked_user(guild, user_id)
+                    except discord.NotFound:
+                        # The account is gone, so there is nothing left to log its messages under
+                        continue
+                    except discord.HTTPException as e:
+                        self.logger.warning(f"Could not fetch tracked user {user_id} in guild {guild.id}: {e}")
+                        user = None
+                    filled = None
+                    if user:
+                        last_logged = self.parse_last_logged(last_logged_activities, user_id)
+                        filled = await self.fill_missed_activities(guild, user, last_logged, messages)
+                    if filled is None:
+                        unstored_channels.update(message["channel_id"] for message in messages)
+                    else:
+                        results[user_id] = filled
+                # Only move a channel's checkpoint once every message it covers has been stored
+                await self.store.set_channel_checkpoints(guild.id, {
+                    channel_id: message_id for channel_id, message_id in checkpoints.items() if channel_id not in unstored_channels
+                })
+            except Exception as e:
+                self.logger.error(f"Error filling missed activities in guild {guild.id}: {str(e)}", exc_info=True)
+            return results
+
+    async def resolve_tracked_user(self, guild, user_id):
+        """The member, or the user if they have left the guild; fetched when not cached."""
+        member = guild.get_member(user_id)
+        if member:
+            return member
+        try:
+            return await guild.fetch_member(user_id)
+        except discord.NotFound:
+            return self.bot.get_user(user_id) or await self.bot.fetch_user(user_id)
 
-            # Collect existing messages
-            existing_messages = []
-            async for message in thread.history(limit=None):
-                if message.author == self.bot.user and message.embeds:
-                    # Ensure the message timestamp is timezone-aware
-                    message_time = message.created_at.replace(tzinfo=timezone.utc)
-                    existing_messages.append((message_time, message.embeds[0]))
+    async def scan_missed_messages(self, guild):
+        """Read each text channel once from its checkpoint, routing messages to every tracked user.
 
-            # Collect new messages
-            new_messages = []
+        Returns the new activities per user and the newest message ID seen per channel.
+        """
+        tracked = self.tracked_index.get(guild.id, frozenset())
+        found = defaultdict(list)
+        checkpoints = {}
+        if not tracked:
+            return found, checkpoints
+
+        saved_checkpoints = await self.store.channel_checkpoints(guild.id)
+        last_logged_activities = await self.config.guild(guild).last_logged_activities()
+        # Channels without a checkpoint start from the oldest point any tracked user may have missed
+        default_after = min(self.parse_last_logged(last_logged_activities, user_id) for user_id in tracked)
+        semaphore = asyncio.Semaphore(MISSED_SCAN_CONCURRENCY)
+
+        async def scan_channel(channel):
+            if not channel.permissions_for(guild.me).read_message_history:
+                return
+            checkpoint = saved_checkpoints.get(channel.id)
+            after = discord.Object(id=checkpoint) if checkpoint else default_after
+            newest = checkpoint
+            async with semaphore:
+                try:
+                    async for message in channel.history(after=after, limit=None, oldest_first=True):
+                        newest = message.id
+                        if message.author.id in tracked:
+                            found[message.author.id].append({
+                                "activity_type": "Message Sent",
+                                "timestamp": message.created_at.timestamp(),
+                                "channel_id": channel.id,
+                                "message_id": message.id,
+                                "content": message.content[:1900],
+                                "details": f"**Server:** {guild.name}\n**Channel:** {channel.mention}\n**Content:** {message.content[:1900]}"
+                            })
+                except discord.Forbidden:
+                    return
+                except discord.HTTPException as e:
+                    # Leave the checkpoint alone so the next pass reads this channel again
+                    self.logger.warning(f"Error scanning channel {channel.id} in guild {guild.id} for missed activity: {e}")
+                    return
+            if newest and newest != checkpoint:
+                checkpoints[channel.id] = newest
+
+        channels = guild.text_channels
+        results = await asyncio.gather(*(scan_channel(channel) for channel in channels), return_exceptions=True)
+        for channel, result in zip(channels, results):
+            if isinstance(result, Exception):
+                self.logger.error(f"Error scanning channel {channel.id} in guild {guild.id} for missed activity: {result}", exc_info=result)
+        return found, checkpoints
+
+    async def fill_missed_activities(self, guild, user, last_logged, new_activities):
+        """Store and log a user's missed activities. Returns how many were new, or None if they couldn't be stored."""
+        try:
+            thread = await self.get_user_thread(guild, user)
+            if thread:
+                # Anything only present in the thread has to be in the store before it is appended to
+                await self.import_thread_history(guild, user, thread)
 
-            # Check messages
-            for channel in guild.text_channels:
-                async for message in channel.history(after=last_logged, limit=None):
-                    if message.author.id == user.id:
-                        embed = await self.create_embed(user, guild, "Message Sent", f"**Server:** {guild.name}\n**Channel:** {channel.mention}\n**Content:** {message.content[:1900]}")
-                        new_messages.append((message.created_at.replace(tzinfo=timezone.utc), embed))
+            # Messages come from the guild-wide channel scan
+            new_activities = list(new_activities)
 
             # Check voice state, status, and activity
             member = guild.get_member(user.id)
             if member:
+                now = time.time()
+                snapshots = {}
                 if member.voice and member.voice.channel:
-                    embed = await self.create_embed(user, guild, "Voice Activity", f"**Server:** {guild.name}\n**Action:** Joined voice channel {member.voice.channel.name}")
-                    new_messages.append((datetime.now(timezone.utc), embed))
+                    snapshots["Voice Activity"] = f"**Server:** {guild.name}\n**Action:** Joined voice channel {member.voice.channel.name}"
 
-                embed = await self.create_embed(user, guild, "Status Change", f"**Server:** {guild.name}\n**New status:** {member.status}")
-                new_messages.append((datetime.now(timezone.utc), embed))
+                snapshots["Status Change"] = f"**Server:** {guild.name}\n**New status:** {member.status}"
 
-                if member and member.activity:
+                if member.activity:
                     activity_details = str(member.activity)
-                    embed = await self.create_embed(user, guild, "Activity Change", f"**Server:** {guild.name}\n**Activity:** {activity_details[:ACTIVITY_SUMMARY_LENGTH]}")
-                    new_messages.append((datetime.now(timezone.utc), embed))
-
-            # Combine and sort all messages
-            all_messages = existing_messages + new_messages
-            all_messages.sort(key=lambda x: x[0])
-
-            # Clear the thread
-            await thread.purge()
-
-            # Repost messages in chronological order with a progress bar
-            total_messages = len(all_messages)
-            progress_message = await thread.send("Filling missed activities... 0%")
-            for index, (timestamp, embed) in enumerate(all_messages, 1):
-                await thread.send(embed=embed)
-                if index % 10 == 0 or index == total_messages:
-                    progress = (index / total_messages) * 100
-                    try:
-                        if progress_message:
-                            await progress_message.edit(content=f"Filling missed activities... {progress:.1f}%")
-                    except discord.NotFound:
-                        # If the message was deleted, send a new one
-                        progress_message = await thread.send(f"Filling missed activities... {progress:.1f}%")
+                    snapshots["Activity Change"] = f"**Server:** {guild.name}\n**Activity:** {activity_details[:ACTIVITY_SUMMARY_LENGTH]}"
+
+                # Only log a state that differs from the last one logged, so an unchanged member adds nothing each pass
+                logged = await self.store.latest_details(guild.id, user.id, snapshots)
+                new_activities.extend(
+                    {"activity_type": activity_type, "timestamp": now, "details": details}
+                    for activity_type, details in snapshots.items() if logged.get(activity_type) != details
+                )
+
+            # Skip messages that were already logged live
+            known_ids = await self.store.existing_message_ids(
+                guild.id, user.id, [activity["message_id"] for activity in new_activities if activity.get("message_id")]
+            )
+            new_activities = [activity for activity in new_activities if activity.get("message_id") not in known_ids or not activity.get("message_id")]
+            new_activities.sort(key=lambda activity: activity["timestamp"])
+
+            for activity in new_activities:
+                activity.setdefault("guild_id", guild.id)
+                activity.setdefault("user_id", user.id)
+                activity.setdefault("sentiment", None)
+            missed_messages = [activity for activity in new_activities if activity["activity_type"] == "Message Sent"]
+            scores = await self.sentiment.analyze_many([activity["content"] for activity in missed_messages])
+            for activity, analysis in zip(missed_messages, scores):
+                activity["sentiment"] = analysis['sentiment']
+            message_count = await self.store.record_many(missed_messages)
+            new_count = message_count + await self.store.record_many(
+                activity for activity in new_activities if activity["activity_type"] != "Message Sent"
+            )
+            if missed_messages:
+                # The status/voice/activity snapshots are stamped now; only real messages show when they were last active
+                self.inactivity.touch(guild.id, user.id, missed_messages[-1]["timestamp"])
+            if message_count == len(missed_messages):
+                if new_activities:
+                    await self.histograms.record_many(guild.id, user.id, [activity["timestamp"] for activity in new_activities])
+                if message_count:
+                    await self.word_frequencies.record_many(guild.id, user.id, missed_messages)
+            else:
+                # Some were logged live since the scan and are already counted, so recount from the store
+                self.histograms.forget(guild.id, user.id)
+                self.word_frequencies.forget(guild.id, user.id)
+
+            if not thread:
+                self.logger.error(f"No thread found for user {user.id} in guild {guild.id}")
+                return new_count
+            if not new_activities:
+                return 0
+
+            # Append only the missed items, several embeds per message. The store keeps the
+            # chronological order; use `track rebuild` to rewrite the thread itself.
+            embeds = [await self.build_stored_embed(user, guild, activity) for activity in new_activities]
 
             # Add a summary embed
             summary_embed = discord.Embed(
                 title="Missed Activities Summary",
-                description=f"Filled {total_messages} activities for {user.name}",
+                description=f"Filled {new_count} activities for {user.name}",
                 color=discord.Color.green()
             )
             summary_embed.add_field(name="Time Range", value=f"From {last_logged.strftime('%Y-%m-%d %H:%M:%S')} to {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')}")
-            summary_embed.add_field(name="Total Messages", value=str(len(new_messages)))
+            summary_embed.add_field(name="Total Messages", value=str(len(missed_messages)))
             summary_embed.set_footer(text="UserTracker - Keeping an eye on the past, present, and future!")
-            await thread.send(embed=summary_embed)
+            embeds.append(summary_embed)
+            await self.writer.enqueue(thread, embeds, guild.id, user.id)
 
             # Update the last logged activity timestamp
             async with self.config.guild(guild).last_logged_activities() as last_logged_activities:
                 last_logged_activities[str(user.id)] = datetime.now(timezone.utc).isoformat()
 
-            # Update the main message
-            await self.update_main_message(guild)
+            # Update the main message, reseeding this user's summary from the store
+            self.activity_summaries[guild.id].pop(user.id, None)
+            self.request_main_message_update(guild)
 
-            return total_messages
+            return new_count
 
         except Exception as e:
             self.logger.error(f"Error in fill_missed_activities for user {user.id} in guild {guild.id}: {str(e)}", exc_info=True)
-            return 0
+            return None
+
+    @track.command(name="rebuild")
+    async def track_rebuild(self, ctx, user: discord.User):
+        """Rewrite a user's log thread from the local store in chronological order.
+
+        Runs in the background and resumes after a restart.
+        """
+        if not await self.is_authorized(ctx):
+            await ctx.send("You are not authorized to use UserTracker commands.")
+            return
+
+        if not self.is_tracked(ctx.guild, user.id):
+            await ctx.send(f"User {user.name} is not being tracked in this server.")
+            return
+
+        task = self.rewrite_tasks.get((ctx.guild.id, user.id))
+        if task and not task.done():
+            await ctx.send(f"ℹ️ The log thread for {user.name} is already being rebuilt.")
+            return
+
+        await self.config.guild(ctx.guild).rewrite_jobs.set_raw(str(user.id), value={"thread_id": None, "cursor": None})
+        self.start_thread_rewrite(ctx.guild, user)
+        await ctx.send(f"🔁 Rebuilding the log thread for {user.name} in the background. The old thread stays in place until the new one is complete.")
+
+    def start_thread_rewrite(self, guild, user):
+        self.rewrite_tasks[(guild.id, user.id)] = asyncio.create_task(self.rewrite_user_thread(guild, user))
+
+    async def resume_thread_rewrites(self, guild):
+        rewrite_jobs = await self.config.guild(guild).rewrite_jobs()
+        for user_id in rewrite_jobs:
+            user = self.bot.get_user(int(user_id))
+            if user and self.is_tracked(guild, user.id):
+                self.start_thread_rewrite(guild, user)
+            else:
+                await self.config.guild(guild).rewrite_jobs.clear_raw(user_id)
+
+    async def rewrite_user_thread(self, guild, user):
+        """Repost a user's stored history into a fresh thread, then swap it in for the old one.
+
+        Progress is saved after every message so an interrupted rewrite picks up where it stopped.
+        """
+        job_config = self.config.guild(guild).rewrite_jobs
+        try:
+            job = await job_config.get_raw(str(user.id), default=None)
+            if job is None:
+                return
+            log_channel = guild.get_channel(await self.config.guild(guild).log_channel())
+            if not log_channel:
+                return
+
+            old_thread = await self.get_user_thread(guild, user)
+            if old_thread:
+                await self.import_thread_history(guild, user, old_thread)
+
+            new_thread = guild.get_thread(job["thread_id"]) if job["thread_id"] else None
+            if new_thread is None:
+                new_thread = await log_channel.create_thread(name=f"Logs for {user.name} ({user.id})", auto_archive_duration=10080)
+                await self.store.mark_thread_imported(new_thread.id)
+                job = {"thread_id": new_thread.id, "cursor": None}
+                await job_config.set_raw(str(user.id), value=job)
+
+            cursor = tuple(job["cursor"]) if job["cursor"] else None
+            cursor = await self.repost_activities(guild, user, new_thread, cursor)
+
+            # The missed-activity fill would otherwise send older rows to the new thread while it is swapped in
+            async with self.missed_scan_locks[guild.id]:
+                swapped_at = time.time()
+                async with self.config.guild(guild).user_threads() as user_threads:
+                    user_threads[str(user.id)] = new_thread.id
+                    self.refresh_thread_index(guild, user_threads)
+                # From here on live activity goes to the new thread. Whatever was logged before the
+                # swap went to the old one, so drop its queue and repost those rows instead.
+                if old_thread and old_thread.id != new_thread.id:
+                    self.writer.discard(old_thread.id)
+                await self.repost_activities(guild, user, new_thread, cursor, until=swapped_at)
+            await job_config.clear_raw(str(user.id))
+            if old_thread and old_thread.id != new_thread.id:
+                await old_thread.delete()
+
+            self.activity_summaries[guild.id].pop(user.id, None)
+            self.request_main_message_update(guild)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Error rebuilding the log thread for user {user.id} in guild {guild.id}: {str(e)}", exc_info=True)
+
+    async def repost_activities(self, guild, user, thread, cursor, until=None):
+        """Post a user's stored activities after ``cursor`` to a thread, saving the rewrite cursor as it goes."""
+        job_config = self.config.guild(guild).rewrite_jobs
+        while True:
+            rows = await self.store.activities_after(guild.id, user.id, cursor, until=until, limit=REWRITE_PAGE_SIZE)
+            if not rows:
+                return cursor
+            for start in range(0, len(rows), MAX_EMBEDS_PER_MESSAGE):
+                chunk = rows[start:start + MAX_EMBEDS_PER_MESSAGE]
+                embeds = [await self.build_stored_embed(user, guild, row) for row in chunk]
+                for batch in batch_embeds(embeds):
+                    async with self.rate_limiter.limit(thread.id, guild.id):
+                        await thread.send(embeds=batch)
+                cursor = (chunk[-1]['timestamp'], chunk[-1]['id'])
+                await job_config.set_raw(str(user.id), "cursor", value=list(cursor))
 
     @track.command(name="heatmap")
     async def track_heatmap(self, ctx, user: discord.User):
@@ -789,67 +1300,220 @@ class UserTracker(commands.Cog):
             await ctx.send("You are not authorized to use UserTracker commands.")
             return
 
-        thread = await self.get_user_thread(ctx.guild, user)
-        if not thread:
-            await ctx.send(f"No log thread found for user {user.name}.")
+        await self.import_user_history(ctx.guild, user)
+        activity_data = await self.get_user_activity_data(ctx.guild, user)
+        if activity_data is None:
+            await ctx.send(f"No activity data found for {user.name} in the past week.")
             return
+        heatmap = await self.generate_circular_heatmap(activity_data)
 
-        activity_data = await self.get_user_activity_data(thread)
-        heatmap = self.generate_circular_heatmap(activity_data)
+        await ctx.send(f"Behold, the temporal tapestry of {user.name}'s existence!", file=heatmap)
 
-        with io.BytesIO() as image_binary:
-            heatmap.save(image_binary, 'PNG')
-            image_binary.seek(0)
-            await ctx.send(f"Behold, the temporal tapestry of {user.name}'s existence!",
-                           file=discord.File(fp=image_binary, filename='time_lord_heatmap.png'))
-
-    async def get_user_activity_data(self, thread):
-        now = datetime.utcnow()
-        if thread.id in self.activity_cache and now - self.activity_cache[thread.id]['timestamp'] < self.cache_expiry:
-            return self.activity_cache[thread.id]['data']
-
-        activity_data = [[0] * 24 for _ in range(7)]  # 7 days, 24 hours each
-        async for message in thread.history(limit=None, after=now - timedelta(days=7)):
-            if message.author == self.bot.user and message.embeds:
-                day = (now - message.created_at).days
-                hour = message.created_at.hour
-                if 0 <= day < 7:  # Ensure we're within the last 7 days
-                    activity_data[day][hour] += 1
-
-        if all(sum(day) == 0 for day in activity_data):
+    async def get_user_activity_data(self, guild, user):
+        activity_data = await self.histograms.get(guild.id, user.id)  # 7 days x 24 hours in the guild's timezone
+        if not activity_data.any():
             return None  # No activity data found
-
-        self.activity_cache[thread.id] = {
-            'timestamp': now,
-            'data': activity_data
-        }
         return activity_data
 
-    def generate_circular_heatmap(self, activity_data):
-        fig, ax = plt.subplots(figsize=(10, 10), subplot_kw=dict(projection='polar'))
-        theta = np.linspace(0, 2*np.pi, 24, endpoint=False)
-        radii = np.array(activity_data)
-        width = 2*np.pi / 24
+    async def comparison_data(self, guild, user_ids):
+        """Activity and sentiment arrays for several users, one row per user in ``user_ids`` order."""
+        stack = await self.histograms.stack(guild.id, user_ids)
+        rows = await self.store.sentiment_counts(guild.id, user_ids, time.time() - COMPARE_SENTIMENT_DAYS * 86400, SENTIMENT_BINS)
+        counts, sums = sentiment_matrices(rows, user_ids)
+        return stack, activity_summary(stack), sentiment_summary(counts, sums), counts, sums
 
-        bars = ax.bar(theta, radii, width=width, bottom=0.0)
-        
-        # Color the bars
-        norm = plt.Normalize(np.min(radii), np.max(radii))
-        for r, bar in zip(radii, bars):
-            bar.set_facecolor(plt.cm.viridis(norm(r)))
-        
-        ax.set_xticks(theta)
-        ax.set_xticklabels([f"{h:02d}:00" for h in range(24)])
-        ax.set_ylim(0, max(radii) * 1.1)
-        ax.set_title("The Circular Chronicles of Time", va='bottom')
+    def day_name(self, guild, days_ago):
+        return datetime.fromordinal(self.histograms.today(guild.id) - int(days_ago)).strftime("%A")
 
-        plt.tight_layout()
-        
-        img_buf = io.BytesIO()
-        plt.savefig(img_buf, format='png')
-        img_buf.seek(0)
-        
-        return Image.open(img_buf)
+    @track.command(name="compare")
+    async def track_compare(self, ctx, *users: discord.User):
+        """Compare the activity patterns and sentiment of several tracked users."""
+        if not await self.is_authorized(ctx):
+            await ctx.send("You are not authorized to use UserTracker commands.")
+            return
+
+        users = list(dict.fromkeys(users))
+        if not 2 <= len(users) <= 24:
+            await ctx.send("❌ Please name between 2 and 24 users to compare.")
+            return
+        untracked = [user.name for user in users if not self.is_tracked(ctx.guild, user.id)]
+        if untracked:
+            await ctx.send(f"❌ Not tracked in this server: {', '.join(untracked)}")
+            return
+
+        for user in users:
+            await self.import_user_history(ctx.guild, user)
+        stack, activity, sentiment, _, _ = await self.comparison_data(ctx.guild, [user.id for user in users])
+
+        embed = discord.Embed(
+            title="⚖️ User Comparison",
+            description=f"Activity over the last 7 days and sentiment over the last {COMPARE_SENTIMENT_DAYS} days "
+                        f"({self.guild_timezones.get(ctx.guild.id, 'UTC')})",
+            color=discord.Color.blue()
+        )
+        for index, user in enumerate(users):
+            if activity["totals"][index]:
+                schedule = (f"Peak hour: {activity['peak_hour'][index]:02d}:00 | "
+                            f"Busiest day: {self.day_name(ctx.guild, activity['peak_day'][index])}")
+            else:
+                schedule = "No activity this week"
+            mood = (f"Sentiment: {sentiment['mean'][index]:+.2f} avg, {sentiment['positive'][index]:.0%} ≥ 0, "
+                    f"{sentiment['negative'][index]:.0%} < 0 ({int(sentiment['messages'][index])} messages)"
+                    if sentiment["messages"][index] else "Sentiment: no scored messages")
+            embed.add_field(
+                name=user.name,
+                value=f"Activities: {int(activity['totals'][index])} ({activity['share'][index]:.0%} of the group)\n{schedule}\n{mood}",
+                inline=False
+            )
+        first, second, similarity = most_similar_pair(schedule_similarity(activity["hourly"]))
+        if similarity:
+            embed.add_field(name="Most Similar Schedules", value=f"{users[first].name} & {users[second].name} ({similarity:.0%})", inline=False)
+
+        image_bytes = await self.renderer.render(render_comparison_heatmap, [user.name for user in users], activity["hourly"].tolist())
+        embed.set_image(url="attachment://comparison.png")
+        await ctx.send(embed=embed, file=discord.File(io.BytesIO(image_bytes), filename="comparison.png"))
+
+    @track.command(name="guildsummary")
+    async def track_guildsummary(self, ctx):
+        """Summarize activity hours and sentiment across every tracked user in this server."""
+        if not await self.is_authorized(ctx):
+            await ctx.send("You are not authorized to use UserTracker commands.")
+            return
+
+        user_ids = sorted(self.tracked_index.get(ctx.guild.id, ()))
+        if not user_ids:
+            await ctx.send("No users are being tracked in this server.")
+            return
+
+        stack, activity, sentiment, counts, sums = await self.comparison_data(ctx.guild, user_ids)
+        guild_hourly = activity["hourly"].sum(axis=0)
+        if not guild_hourly.any():
+            await ctx.send("No tracked activity in this server in the past week.")
+            return
+
+        embed = discord.Embed(
+            title=f"🏰 {ctx.guild.name} Summary",
+            description=f"{len(user_ids)} tracked users | {int(guild_hourly.sum())} activities in the last 7 days",
+            color=discord.Color.blue()
+        )
+        top_hours = np.argsort(guild_hourly)[::-1][:3]
+        embed.add_field(name="Most Active Hours", value="\n".join(f"{hour:02d}:00 ({int(guild_hourly[hour])})" for hour in top_hours if guild_hourly[hour]), inline=True)
+        guild_daily = activity["daily"].sum(axis=0)
+        embed.add_field(name="Busiest Day", value=f"{self.day_name(ctx.guild, guild_daily.argmax())} ({int(guild_daily.max())})", inline=True)
+
+        top_users = [index for index in np.argsort(activity["totals"])[::-1][:5] if activity["totals"][index]]
+        lines = []
+        for index in top_users:
+            member = ctx.guild.get_member(user_ids[index])
+            name = member.display_name if member else str(user_ids[index])
+            lines.append(f"{name}: {int(activity['totals'][index])} ({activity['share'][index]:.0%})")
+        embed.add_field(name="Most Active Users", value="\n".join(lines), inline=False)
+
+        messages = counts.sum()
+        if messages:
+            distribution = "\n".join(distribution_bar(counts.sum(axis=0)))
+            embed.add_field(
+                name=f"Sentiment Distribution (last {COMPARE_SENTIMENT_DAYS} days, avg {sums.sum() / messages:+.2f})",
+                value=distribution,
+                inline=False
+            )
+
+        image_bytes = await self.renderer.render(render_circular_heatmap, stack.sum(axis=0).tolist())
+        embed.set_image(url="attachment://guild_heatmap.png")
+        await ctx.send(embed=embed, file=discord.File(io.BytesIO(image_bytes), filename="guild_heatmap.png"))
+
+    async def persist_aggregates(self):
+        await self.bot.wait_until_ready()
+        while not self.bot.is_closed():
+            await asyncio.sleep(AGGREGATE_PERSIST_INTERVAL)
+            try:
+                await self.histograms.persist()
+                await self.word_frequencies.persist()
+                await self.inactivity.persist()
+            except Exception as e:
+                self.logger.error(f"Error persisting activity aggregates: {e}", exc_info=True)
+
+    async def enforce_retention(self):
+        await self.bot.wait_until_ready()
+        while not self.bot.is_closed():
+            for guild in self.bot.guilds:
+                try:
+                    await self.compact_guild(guild)
+                except Exception as e:
+                    self.logger.error(f"Error compacting activity for guild {guild.id}: {e}", exc_info=True)
+            await asyncio.sleep(86400)  # Check once a day
+
+    async def compact_guild(self, guild):
+        """Archive activity older than the guild's retention period and drop untracked users' last-logged times."""
+        retention_days = await self.config.guild(guild).retention_days()
+        if not retention_days:
+            return 0
+        moved = await self.archive.compact(self.store, guild.id, time.time() - retention_days * 86400)
+
+        tracked = {str(user_id) for user_id in self.tracked_index.get(guild.id, ())}
+        async with self.config.guild(guild).last_logged_activities() as last_logged_activities:
+            for user_id in [user_id for user_id in last_logged_activities if user_id not in tracked]:
+                del last_logged_activities[user_id]
+        return moved
+
+    @track.command(name="retention")
+    async def track_retention(self, ctx, days: int = None):
+        """Set or view how many days of activity stay in the live store (0 keeps everything).
+
+        Older activity is moved to compressed monthly archives, which `track export` still includes.
+        """
+        if not await self.is_authorized(ctx):
+            await ctx.send("You are not authorized to use UserTracker commands.")
+            return
+
+        if days is None:
+            current = await self.config.guild(ctx.guild).retention_days()
+            archived = self.archive.size(ctx.guild.id)
+            await ctx.send(f"Current retention: {f'{current} days' if current else 'keep everything'} | "
+                           f"Archive: {archived['files']} files ({archived['bytes'] / 1024:.0f} KiB)")
+            return
+
+        if days and days < MIN_RETENTION_DAYS:
+            await ctx.send(f"❌ Retention must be at least {MIN_RETENTION_DAYS} days (or 0 to keep everything).")
+            return
+
+        await self.config.guild(ctx.guild).retention_days.set(days or None)
+        if not days:
+            await ctx.send("✅ All activity will be kept in the live store.")
+            return
+        async with ctx.typing():
+            moved = await self.compact_guild(ctx.guild)
+        await ctx.send(f"✅ Retention set to {days} days. Archived {moved} older activities.")
+
+    @track.command(name="export")
+    async def track_export(self, ctx, user: discord.User, export_format: str = "csv"):
+        """Export a user's full activity history, archives included, as gzip-compressed CSV or JSONL."""
+        if not await self.is_authorized(ctx):
+            await ctx.send("You are not authorized to use UserTracker commands.")
+            return
+
+        export_format = export_format.lower()
+        if export_format not in EXPORT_FORMATS:
+            await ctx.send(f"❌ Export format must be one of: {', '.join(EXPORT_FORMATS)}")
+            return
+
+        export_directory = cog_data_path(self) / "exports"
+        export_directory.mkdir(parents=True, exist_ok=True)
+        path = export_directory / f"{user.id}_{ctx.guild.id}_{int(time.time())}.{export_format}.gz"
+        try:
+            async with ctx.typing():
+                await self.import_user_history(ctx.guild, user)
+                count = await export_activities(self.store, self.archive, ctx.guild.id, user.id, path, export_format)
+            if path.stat().st_size > ctx.guild.filesize_limit:
+                await ctx.send(f"❌ The export of {count} activities is too large to upload here.")
+                return
+            await ctx.send(f"📦 {count} activities for {user.name}", file=discord.File(str(path), filename=path.name))
+        finally:
+            path.unlink(missing_ok=True)
+
+    async def generate_circular_heatmap(self, activity_data):
+        image_bytes = await self.renderer.render(render_circular_heatmap, activity_data)
+        return discord.File(io.BytesIO(image_bytes), filename='time_lord_heatmap.png')
 
     @track.command(name="wordcloud")
     async def track_wordcloud(self, ctx, user: discord.User):
@@ -860,54 +1524,43 @@ class UserTracker(commands.Cog):
             await ctx.send("You are not authorized to use UserTracker commands.")
             return
 
-        thread = await self.get_user_thread(ctx.guild, user)
-        if not thread:
-            await ctx.send(f"No log thread found for user {user.name}.")
-            return
-
-        text = await self.get_user_messages(thread)
-        if not text:
+        await self.import_user_history(ctx.guild, user)
+        frequencies = await self.word_frequencies.top(ctx.guild.id, user.id)
+        if not frequencies:
             await ctx.send(f"No messages found for user {user.name}.")
             return
 
-        wordcloud = await self.generate_wordcloud(user, text)
+        wordcloud = await self.generate_wordcloud(user, frequencies)
 
         await ctx.send(f"Behold, the lexical universe of {user.name}!",
                        file=wordcloud)
 
-    async def get_user_messages(self, thread):
-        messages = []
-        async for message in thread.history(limit=None):
-            if message.author == self.bot.user and message.embeds:
-                embed = message.embeds[0]
-                if embed.title == "Message Sent":
-                    content = embed.fields[0].value.split("**Content:** ")[-1]
-                    messages.append(content)
-        return " ".join(messages)
-
-    async def generate_wordcloud(self, user, text):
-        avatar_url = str(user.display_avatar.url)
-        async with aiohttp.ClientSession() as session:
-            async with session.get(avatar_url) as resp:
-                avatar_data = await resp.read()
-    
-        avatar = Image.open(io.BytesIO(avatar_data)).convert("RGBA")
-        mask = Image.new("RGB", avatar.size, (255,255,255))
-        mask.paste(avatar, (0,0), avatar)
-        mask = np.array(mask)
+    async def generate_wordcloud(self, user, frequencies):
+        mask_path = await self.get_avatar_mask(user)
+        image_bytes = await self.renderer.render(render_wordcloud, frequencies, mask_path)
+        return discord.File(io.BytesIO(image_bytes), filename='lexicon_o_matic.png')
 
-        wordcloud = WordCloud(width=800, height=800, background_color='white', mask=mask).generate(text)
-    
-        plt.figure(figsize=(10,10), facecolor=None)
-        plt.imshow(wordcloud)
-        plt.axis("off")
-        plt.tight_layout(pad=0)
-    
-        img_buf = io.BytesIO()
-        plt.savefig(img_buf, format='png')
-        img_buf.seek(0)
-    
-        return discord.File(fp=img_buf, filename='lexicon_o_matic.png')
+    def get_session(self):
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30))
+        return self.session
+
+    async def get_avatar_mask(self, user):
+        """Path to the user's prepared wordcloud mask, downloading and preparing it only on a cache miss."""
+        avatar = user.display_avatar.with_size(AVATAR_MASK_SIZE).with_static_format("png")
+        mask_path = await self.avatar_masks.get(avatar.key, AVATAR_MASK_SIZE)
+        if mask_path:
+            return str(mask_path)
+
+        try:
+            async with self.get_session().get(str(avatar.url)) as resp:
+                resp.raise_for_status()
+                avatar_data = await resp.read()
+            mask_path = await self.avatar_masks.prepare(avatar.key, AVATAR_MASK_SIZE)
+            return await self.renderer.run(prepare_avatar_mask, avatar_data, AVATAR_MASK_SIZE, str(mask_path))
+        except Exception as e:
+            self.logger.error(f"Error preparing the avatar mask for user {user.id}: {e}", exc_info=True)
+            return None
 
     @track.command(name="theme")
     async def track_theme(self, ctx, user: discord.User, color: discord.Color):
@@ -918,10 +1571,53 @@ class UserTracker(commands.Cog):
         
         async with self.config.guild(ctx.guild).user_themes() as user_themes:
             user_themes[str(user.id)] = color.value
+            self.refresh_theme_index(ctx.guild, user_themes)
         
         await ctx.send(f"Color theme for {user.name} set to {color}")
 
 
+    @track.command(name="timezone")
+    async def track_timezone(self, ctx, timezone_name: str = None):
+        """Set or view the timezone used to bin activity heatmaps."""
+        if not await self.is_authorized(ctx):
+            await ctx.send("You are not authorized to use UserTracker commands.")
+            return
+
+        if timezone_name is None:
+            await ctx.send(f"Current timezone for this server: {self.guild_timezones.get(ctx.guild.id, 'UTC')}")
+            return
+
+        if timezone_name not in pytz.all_timezones_set:
+            await ctx.send(f"❌ Unknown timezone `{timezone_name}`. Use an IANA name such as `Europe/London`.")
+            return
+
+        await self.config.guild(ctx.guild).timezone.set(timezone_name)
+        self.guild_timezones[ctx.guild.id] = timezone_name
+        # Histograms are binned by local hour, so rebuild them on next use
+        self.histograms.forget_guild(ctx.guild.id)
+        await ctx.send(f"✅ Timezone for this server set to {timezone_name}")
+
+    @track.command(name="wordclouddecay")
+    async def track_wordclouddecay(self, ctx, half_life_days: float = None):
+        """Set or view the wordcloud half-life in days (0 keeps every word at full weight)."""
+        if not await self.is_authorized(ctx):
+            await ctx.send("You are not authorized to use UserTracker commands.")
+            return
+
+        if half_life_days is None:
+            current = self.guild_half_lives.get(ctx.guild.id)
+            await ctx.send(f"Current wordcloud half-life: {f'{current:g} days' if current else 'disabled'}")
+            return
+
+        if half_life_days < 0:
+            await ctx.send("❌ The half-life cannot be negative.")
+            return
+
+        value = half_life_days or None
+        await self.config.guild(ctx.guild).wordcloud_half_life.set(value)
+        self.guild_half_lives[ctx.guild.id] = value
+        await ctx.send(f"✅ Wordcloud half-life set to {f'{value:g} days' if value else 'disabled'}")
+
     @track.command(name="sentimentgraph")
     async def track_sentimentgraph(self, ctx, user: discord.User):
         """
@@ -931,45 +1627,72 @@ class UserTracker(commands.Cog):
             await ctx.send("You are not authorized to use UserTracker commands.")
             return
     
-        thread = await self.get_user_thread(ctx.guild, user)
-        if not thread:
-            await ctx.send(f"No log thread found for user {user.name}.")
-            return
-    
-        sentiment_graph = await self.generate_sentiment_graph(thread)
+        await self.import_user_history(ctx.guild, user)
+        sentiment_graph = await self.generate_sentiment_graph(ctx.guild, user)
 
         await ctx.send(f"Behold, the emotional journey of {user.name}!",
                        file=sentiment_graph)
 
-    async def generate_sentiment_graph(self, thread):
-        messages = []
-        sentiments = []
-        async for message in thread.history(limit=100):
-            if message.author == self.bot.user and message.embeds:
-                embed = message.embeds[0]
-                if embed.title == "Message Sent":
-                    content = embed.fields[0].value.split("**Content:** ")[-1]
-                    analysis = await self.analyze_text(content)
-                    messages.append(content[:50] + "...")
-                    sentiments.append(analysis['sentiment'])
-    
-        fig = go.Figure(data=go.Scatter(
-            x=list(range(len(messages))),
-            y=sentiments,
-            mode='lines+markers',
-            text=messages,
-            hoverinfo='text+y'
-        ))
-    
-        fig.update_layout(
-            title="Sentiment Over Time",
-            xaxis_title="Message Number",
-            yaxis_title="Sentiment Score"
-        )
-    
-        img_bytes = fig.to_image(format="png")
+    async def generate_sentiment_graph(self, guild, user):
+        rows = await self.store.messages(guild.id, user.id, limit=100)
+        sentiments = [row['sentiment'] for row in rows]
+
+        # Score anything imported without a sentiment in one batch and keep the result
+        unscored = [index for index, sentiment in enumerate(sentiments) if sentiment is None]
+        if unscored:
+            scores = await self.sentiment.analyze_many([rows[index]['content'] or "" for index in unscored])
+            for index, analysis in zip(unscored, scores):
+                sentiments[index] = analysis['sentiment']
+            await self.store.set_sentiments([(rows[index]['id'], sentiments[index]) for index in unscored])
+
+        messages = [(row['content'] or "")[:50] + "..." for row in rows]
+
+        img_bytes = await self.renderer.render(render_sentiment_graph, messages, sentiments)
         return discord.File(io.BytesIO(img_bytes), filename='sentiment_graph.png')
 
+    @track.command(name="sentimenttimeline")
+    async def track_sentimenttimeline(self, ctx, user: discord.User, days: int = 30):
+        """
+        Plot a user's message sentiment over the last `days` days with a rolling average.
+        """
+        if not await self.is_authorized(ctx):
+            await ctx.send("You are not authorized to use UserTracker commands.")
+            return
+
+        if not 1 <= days <= 3650:
+            await ctx.send("❌ Please pick between 1 and 3650 days.")
+            return
+
+        await self.import_user_history(ctx.guild, user)
+        async with ctx.typing():
+            result = await self.generate_sentiment_timeline(ctx.guild, user, days)
+        if result is None:
+            await ctx.send(f"No scored messages from {user.name} in the last {days} days.")
+            return
+        timeline, message_count = result
+        await ctx.send(f"Behold, {days} days of {user.name}'s emotional journey ({message_count} messages)!",
+                       file=timeline)
+
+    async def generate_sentiment_timeline(self, guild, user, days):
+        until = time.time()
+        since = until - days * 86400
+
+        # Score a bounded number of imported messages per request so older ranges fill in over time
+        unscored = await self.store.unscored_messages(guild.id, user.id, since, SENTIMENT_BACKFILL_LIMIT)
+        if unscored:
+            scores = await self.sentiment.analyze_many([row['content'] or "" for row in unscored])
+            await self.store.set_sentiments([(row['id'], analysis['sentiment']) for row, analysis in zip(unscored, scores)])
+
+        timestamps, sentiments, message_count = await self.store.sentiment_series(guild.id, user.id, since, until)
+        if not timestamps:
+            return None
+
+        # Roughly 60 windows across the range, between an hour and a week wide
+        window = min(max(days * 86400 / 60, 3600), 7 * 86400)
+        window_label = f"{window / 86400:.1f}d" if window >= 86400 else f"{window / 3600:.0f}h"
+        image_bytes = await self.renderer.render(render_sentiment_timeline, timestamps, sentiments, window, window_label)
+        return discord.File(io.BytesIO(image_bytes), filename='sentiment_timeline.png'), message_count
+
     @track.command(name="animatedheatmap")
     async def track_animatedheatmap(self, ctx, user: discord.User):
         """
@@ -979,45 +1702,18 @@ class UserTracker(commands.Cog):
             await ctx.send("You are not authorized to use UserTracker commands.")
             return
 
-        thread = await self.get_user_thread(ctx.guild, user)
-        if not thread:
-            await ctx.send(f"No log thread found for user {user.name}.")
-            return
-
-        animated_heatmap = await self.generate_animated_heatmap(thread)
+        await self.import_user_history(ctx.guild, user)
+        animated_heatmap = await self.generate_animated_heatmap(ctx.guild, user)
         if animated_heatmap:
             await ctx.send(f"Behold, the temporal tapestry of {user.name}'s existence!",
                            file=animated_heatmap)
         else:
             await ctx.send(f"No activity data found for {user.name} in the past week.")
 
-    async def generate_animated_heatmap(self, thread):
-        activity_data = await self.get_user_activity_data(thread)
-        if not activity_data:
+    async def generate_animated_heatmap(self, guild, user):
+        activity_data = await self.get_user_activity_data(guild, user)
+        if activity_data is None:
             return None  # No activity data to generate heatmap
 
-        fig, ax = plt.subplots(figsize=(12, 6))
-    
-        def update(frame):
-            ax.clear()
-            data = activity_data[frame]
-            sns.heatmap(np.array(data).reshape(1, -1), ax=ax, cmap='viridis', cbar=True, vmin=0, vmax=max(max(d) for d in activity_data))
-            ax.set_xticks(np.arange(0.5, 24.5))
-            ax.set_xticklabels([f"{h:02d}:00" for h in range(24)], rotation=45, ha='right')
-            ax.set_yticks([])
-            ax.set_title(f"Activity Heatmap - Day {frame + 1}", fontsize=16)
-            ax.set_xlabel("Hour of the Day", fontsize=12)
-            plt.tight_layout()
-    
-        anim = animation.FuncAnimation(fig, update, frames=7, interval=1000)
-    
-        with io.BytesIO() as image_binary:
-            anim.save(image_binary, writer='pillow', format='gif', fps=1)
-            image_binary.seek(0)
-            return discord.File(fp=image_binary, filename='activity_heatmap.gif')
-        
-    async def clean_activity_cache(self):
-        while self is self.bot.get_cog("UserTracker"):
-            now = datetime.utcnow()
-            self.activity_cache = {k: v for k, v in self.activity_cache.items() if now - v['timestamp'] < self.cache_expiry}
-            await asyncio.sleep(300)  # Run every 5 minutes
+        image_bytes = await self.renderer.render(render_animated_heatmap, activity_data)
+        return discord.File(io.BytesIO(image_bytes), filename='activity_heatmap.gif')
@@ -1,4 +1,21 @@
+import logging
+import sys
+import time
+
+_import_started = time.perf_counter()
+
 from .UserTracker import UserTracker
 
+_import_time = time.perf_counter() - _import_started
+
+# Only needed by chart and sentiment commands; none of these should be loaded just by loading the cog
+HEAVY_MODULES = ("matplotlib", "plotly", "kaleido", "wordcloud", "PIL", "vaderSentiment")
+
 async def setup(bot):
+    started = time.perf_counter()
     await bot.add_cog(UserTracker(bot))
+    loaded = [name for name in HEAVY_MODULES if name in sys.modules]
+    logging.getLogger('UserTracker').info(
+        f"UserTracker loaded in {(_import_time + time.perf_counter() - started) * 1000:.0f} ms "
+        f"(imports {_import_time * 1000:.0f} ms); heavy modules loaded: {', '.join(loaded) or 'none'}"
+    )
@@ -0,0 +1,175 @@
+"""
+Incremental activity histograms for UserTracker.
+
+Each tracked user has a 7x24 array of activity counts (days ago x hour of
+day, binned in the guild's timezone). It is updated in O(1) as activities are
+logged, rolls forward when the local date changes and is persisted to the
+activity store periodically, so heatmaps never rescan history.
+"""
+
+import time
+from datetime import datetime
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pytz
+
+DAYS = 7
+HOURS = 24
+
+
+class ActivityHistogram:
+    """Rolling DAYS x HOURS counts where row 0 is the local date ``day_ordinal``."""
+
+    __slots__ = ("counts", "day_ordinal")
+
+    def __init__(self, counts: Optional[np.ndarray] = None, day_ordinal: Optional[int] = None):
+        self.counts = counts if counts is not None else np.zeros((DAYS, HOURS), dtype=np.uint32)
+        self.day_ordinal = day_ordinal
+
+    def roll_to(self, day_ordinal: int):
+        """Advance row 0 to ``day_ordinal``, ageing the older rows and zeroing new ones."""
+        if self.day_ordinal is None:
+            self.day_ordinal = day_ordinal
+            return
+        shift = day_ordinal - self.day_ordinal
+        if shift <= 0:
+            return
+        if shift >= DAYS:
+            self.counts[:] = 0
+        else:
+            self.counts[shift:] = self.counts[:-shift].copy()
+            self.counts[:shift] = 0
+        self.day_ordinal = day_ordinal
+
+    def add(self, local_time: datetime, amount: int = 1) -> bool:
+        """Count an activity at a local time. Returns False if it is outside the window."""
+        ordinal = local_time.toordinal()
+        self.roll_to(ordinal)
+        day = self.day_ordinal - ordinal
+        if not 0 <= day < DAYS:
+            return False
+        self.counts[day, local_time.hour] += amount
+        return True
+
+    def snapshot(self, day_ordinal: int) -> np.ndarray:
+        """Counts as seen from ``day_ordinal``, without modifying this histogram."""
+        copy = ActivityHistogram(self.counts.copy(), self.day_ordinal)
+        copy.roll_to(day_ordinal)
+        return copy.counts
+
+    def to_blob(self) -> bytes:
+        return self.counts.astype("<u4").tobytes()
+
+    @classmethod
+    def from_blob(cls, blob: bytes, day_ordinal: int) -> "ActivityHistogram":
+        counts = np.frombuffer(blob, dtype="<u4").reshape(DAYS, HOURS).astype(np.uint32)
+        return cls(counts, day_ordinal)
+
+
+class HistogramIndex:
+    """All loaded histograms, keyed by (guild ID, user ID), plus dirty tracking for persistence."""
+
+    def __init__(self, store, timezone_for: Callable[[int], str]):
+        self.store = store
+        self.timezone_for = timezone_for
+        self.histograms: Dict[Tuple[int, int], ActivityHistogram] = {}
+        self.dirty = set()
+        self.stale = set()
+
+    def local_time(self, guild_id: int, timestamp: float) -> datetime:
+        return datetime.fromtimestamp(timestamp, pytz.timezone(self.timezone_for(guild_id)))
+
+    def today(self, guild_id: int) -> int:
+        return self.local_time(guild_id, time.time()).toordinal()
+
+    async def record(self, guild_id: int, user_id: int, timestamp: float):
+        """O(1) update for an activity that has just been written to the store."""
+        histogram = self.histograms.get((guild_id, user_id))
+        if histogram is None:
+            # Loading reads the store, which already includes this activity
+            await self.get(guild_id, user_id)
+            return
+        if histogram.add(self.local_time(guild_id, timestamp)):
+            self.dirty.add((guild_id, user_id))
+
+    async def record_many(self, guild_id: int, user_id: int, timestamps):
+        """Count older activities that have just been written to the store, e.g. ones found by a missed-activity scan."""
+        key = (guild_id, user_id)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram, since = await self._load(guild_id, user_id)
+            if since is None:
+                return  # Rebuilt from the store, which already includes them
+            # Catching up from the saved counts only read activities logged after they were saved
+            timestamps = [timestamp for timestamp in timestamps if timestamp < since]
+        added = [histogram.add(self.local_time(guild_id, timestamp)) for timestamp in timestamps]
+        if any(added):
+            self.dirty.add(key)
+
+    async def get(self, guild_id: int, user_id: int) -> np.ndarray:
+        """Return the current DAYS x HOURS counts for a user, loading or rebuilding them if needed."""
+        histogram = self.histograms.get((guild_id, user_id))
+        if histogram is None:
+            histogram, _ = await self._load(guild_id, user_id)
+        return histogram.snapshot(self.today(guild_id))
+
+    async def _load(self, guild_id: int, user_id: int) -> Tuple[ActivityHistogram, Optional[float]]:
+        """Read a user's histogram, returning it with the save time it was caught up from (None if rebuilt)."""
+        key = (guild_id, user_id)
+        tz_name = self.timezone_for(guild_id)
+        saved = await self.store.load_histogram(guild_id, user_id)
+        if saved and saved["timezone"] == tz_name and key not in self.stale:
+            histogram = ActivityHistogram.from_blob(saved["counts"], saved["day_ordinal"])
+            # Pick up anything logged after the last save
+            since = saved["saved_at"]
+            read_from = since
+        else:
+            histogram = ActivityHistogram(day_ordinal=self.today(guild_id))
+            since = None
+            read_from = time.time() - (DAYS + 1) * 86400
+        for timestamp in await self.store.timestamps(guild_id, user_id, since=read_from):
+            histogram.add(self.local_time(guild_id, timestamp))
+        self.histograms[key] = histogram
+        self.stale.discard(key)
+        self.dirty.add(key)
+        return histogram, since
+
+    async def stack(self, guild_id: int, user_ids) -> np.ndarray:
+        """Current counts for several users as one (users, DAYS, HOURS) array."""
+        if not user_ids:
+            return np.zeros((0, DAYS, HOURS), dtype=np.uint32)
+        return np.stack([await self.get(guild_id, user_id) for user_id in user_ids])
+
+    def forget_guild(self, guild_id: int):
+        """Drop a guild's histograms, e.g. after its timezone changed."""
+        for key in [key for key in self.histograms if key[0] == guild_id]:
+            del self.histograms[key]
+            self.dirty.discard(key)
+
+    def forget(self, guild_id: int, user_id: int):
+        """Rebuild a user's histogram from the store on next use, e.g. after backfilling old activity."""
+        self.histograms.pop((guild_id, user_id), None)
+        self.dirty.discard((guild_id, user_id))
+        self.stale.add((guild_id, user_id))
+
+    async def persist(self):
+        """Write every changed histogram back to the store."""
+        if not self.dirty:
+            return
+        now = time.time()
+        rows = []
+        for key in self.dirty:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                continue
+            rows.append({
+                "guild_id": key[0],
+                "user_id": key[1],
+                "day_ordinal": histogram.day_ordinal,
+                "timezone": self.timezone_for(key[0]),
+                "counts": histogram.to_blob(),
+                "saved_at": now,
+            })
+        self.dirty.clear()
+        await self.store.save_histograms(rows)
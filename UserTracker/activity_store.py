@@ -0,0 +1,488 @@
+"""
+Local activity store for UserTracker.
+
+Every logged activity is written to an SQLite database in the cog data path so
+that analytics can be answered from an indexed table instead of paging back
+through Discord thread history.
+"""
+
+import asyncio
+import re
+from array import array
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS activities (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    activity_type TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    channel_id INTEGER,
+    message_id INTEGER,
+    content TEXT,
+    details TEXT NOT NULL,
+    sentiment REAL
+);
+CREATE INDEX IF NOT EXISTS idx_activities_lookup
+    ON activities (guild_id, user_id, activity_type, timestamp);
+CREATE INDEX IF NOT EXISTS idx_activities_user_time
+    ON activities (guild_id, user_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_activities_guild_time
+    ON activities (guild_id, timestamp);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_activities_message
+    ON activities (guild_id, user_id, message_id)
+    WHERE activity_type = 'Message Sent';
+CREATE TABLE IF NOT EXISTS histograms (
+    guild_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    day_ordinal INTEGER NOT NULL,
+    timezone TEXT NOT NULL,
+    counts BLOB NOT NULL,
+    saved_at REAL NOT NULL,
+    PRIMARY KEY (guild_id, user_id)
+);
+CREATE TABLE IF NOT EXISTS word_frequencies (
+    guild_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    decayed_at REAL NOT NULL,
+    saved_at REAL NOT NULL,
+    PRIMARY KEY (guild_id, user_id)
+);
+CREATE TABLE IF NOT EXISTS channel_checkpoints (
+    guild_id INTEGER NOT NULL,
+    channel_id INTEGER NOT NULL,
+    message_id INTEGER NOT NULL,
+    PRIMARY KEY (guild_id, channel_id)
+);
+CREATE TABLE IF NOT EXISTS imported_threads (
+    thread_id INTEGER PRIMARY KEY,
+    imported_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS inactivity (
+    guild_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    last_seen REAL NOT NULL,
+    alerted INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (guild_id, user_id)
+);
+"""
+
+# Full-text index over sent message content, kept in sync with the activities table by triggers
+SEARCH_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS message_search USING fts5(
+    content, content='activities', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS message_search_insert AFTER INSERT ON activities
+WHEN new.activity_type = 'Message Sent' AND new.content IS NOT NULL BEGIN
+    INSERT INTO message_search (rowid, content) VALUES (new.id, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS message_search_delete AFTER DELETE ON activities
+WHEN old.activity_type = 'Message Sent' AND old.content IS NOT NULL BEGIN
+    INSERT INTO message_search (message_search, rowid, content) VALUES ('delete', old.id, old.content);
+END;
+"""
+
+SEARCH_TERM_PATTERN = re.compile(r'"([^"]+)"|(\S+)')
+
+ACTIVITY_COLUMNS = (
+    "guild_id", "user_id", "activity_type", "timestamp",
+    "channel_id", "message_id", "content", "details", "sentiment",
+)
+
+
+class ActivityStore:
+    """Thread-safe wrapper around the UserTracker SQLite database.
+
+    All public coroutines run their query in a worker thread so the event loop
+    never blocks on disk I/O.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self.full_text_search = self._create_search_index()
+        self._conn.commit()
+
+    def _create_search_index(self) -> bool:
+        exists = self._conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'message_search'").fetchone()
+        try:
+            self._conn.executescript(SEARCH_SCHEMA)
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5, search falls back to LIKE scans
+            return False
+        if not exists:
+            self._conn.execute(
+                "INSERT INTO message_search (rowid, content) SELECT id, content FROM activities "
+                "WHERE activity_type = 'Message Sent' AND content IS NOT NULL"
+            )
+        return True
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _execute(self, sql: str, params=()) -> sqlite3.Cursor:
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+            self._conn.commit()
+            return cursor
+
+    def _executemany(self, sql: str, rows: Iterable) -> int:
+        with self._lock:
+            cursor = self._conn.executemany(sql, rows)
+            self._conn.commit()
+            return cursor.rowcount
+
+    def _query(self, sql: str, params=()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    @staticmethod
+    def _row_values(activity: Dict) -> tuple:
+        values = dict(activity)
+        values.setdefault("timestamp", time.time())
+        return tuple(values.get(column) for column in ACTIVITY_COLUMNS)
+
+    async def record(self, guild_id: int, user_id: int, activity_type: str, details: str,
+                     timestamp: Optional[float] = None, channel_id: Optional[int] = None,
+                     message_id: Optional[int] = None, content: Optional[str] = None,
+                     sentiment: Optional[float] = None) -> None:
+        """Store a single activity. Already-stored sent messages are ignored."""
+        await self.record_many([{
+            "guild_id": guild_id,
+            "user_id": user_id,
+            "activity_type": activity_type,
+            "timestamp": timestamp if timestamp is not None else time.time(),
+            "channel_id": channel_id,
+            "message_id": message_id,
+            "content": content,
+            "details": details,
+            "sentiment": sentiment,
+        }])
+
+    async def record_many(self, activities: Iterable[Dict]) -> int:
+        """Store several activities in one transaction and return how many were new."""
+        rows = [self._row_values(activity) for activity in activities]
+        if not rows:
+            return 0
+        placeholders = ", ".join("?" for _ in ACTIVITY_COLUMNS)
+        sql = f"INSERT OR IGNORE INTO activities ({', '.join(ACTIVITY_COLUMNS)}) VALUES ({placeholders})"
+        return await asyncio.to_thread(self._executemany, sql, rows)
+
+    async def activities(self, guild_id: int, user_id: int, since: Optional[float] = None,
+                         until: Optional[float] = None, activity_type: Optional[str] = None,
+                         limit: Optional[int] = None, newest_first: bool = False) -> List[sqlite3.Row]:
+        """Return a user's activities in chronological order (or newest first)."""
+        sql = "SELECT * FROM activities WHERE guild_id = ? AND user_id = ?"
+        params = [guild_id, user_id]
+        if activity_type is not None:
+            sql += " AND activity_type = ?"
+            params.append(activity_type)
+        if since is not None:
+            sql += " AND timestamp >= ?"
+            params.append(since)
+        if until is not None:
+            sql += " AND timestamp < ?"
+            params.append(until)
+        sql += " ORDER BY timestamp DESC, id DESC" if newest_first else " ORDER BY timestamp, id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return await asyncio.to_thread(self._query, sql, tuple(params))
+
+    async def messages(self, guild_id: int, user_id: int, since: Optional[float] = None,
+                       limit: Optional[int] = None) -> List[sqlite3.Row]:
+        """Return logged "Message Sent" activities, oldest first."""
+        if limit is None:
+            return await self.activities(guild_id, user_id, since=since, activity_type="Message Sent")
+        rows = await self.activities(guild_id, user_id, since=since, activity_type="Message Sent",
+                                     limit=limit, newest_first=True)
+        return list(reversed(rows))
+
+    @staticmethod
+    def search_terms(query: str) -> List[tuple]:
+        """Split a query into (text, is_prefix) terms. Quoted text is a phrase, a trailing * a prefix."""
+        terms = []
+        for phrase, word in SEARCH_TERM_PATTERN.findall(query):
+            text = (phrase or word).strip()
+            prefix = not phrase and text.endswith("*")
+            text = text.rstrip("*").replace('"', "")
+            if text:
+                terms.append((text, prefix))
+        return terms
+
+    async def search(self, guild_id: int, user_id: int, query: str, since: Optional[float] = None,
+                     until: Optional[float] = None, channel_id: Optional[int] = None,
+                     limit: int = 10) -> List[sqlite3.Row]:
+        """Return a user's sent messages matching every term of ``query``, best matches first."""
+        terms = self.search_terms(query)
+        if not terms:
+            return []
+        filters = " AND a.guild_id = ? AND a.user_id = ?"
+        params = [guild_id, user_id]
+        if since is not None:
+            filters += " AND a.timestamp >= ?"
+            params.append(since)
+        if until is not None:
+            filters += " AND a.timestamp < ?"
+            params.append(until)
+        if channel_id is not None:
+            filters += " AND a.channel_id = ?"
+            params.append(channel_id)
+
+        if self.full_text_search:
+            # Every term is quoted, so user input can never be parsed as FTS5 operators
+            match = " ".join(f'"{text}"' + ("*" if prefix else "") for text, prefix in terms)
+            sql = (
+                "SELECT a.*, snippet(message_search, 0, '**', '**', '…', 24) AS snippet "
+                "FROM message_search JOIN activities a ON a.id = message_search.rowid "
+                f"WHERE message_search MATCH ?{filters} ORDER BY bm25(message_search) LIMIT ?"
+            )
+            return await asyncio.to_thread(self._query, sql, (match, *params, limit))
+
+        likes = " AND ".join("a.content LIKE ? ESCAPE '\\'" for _ in terms)
+        patterns = [
+            "%" + text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            for text, _ in terms
+        ]
+        sql = (
+            "SELECT a.*, substr(a.content, 1, 200) AS snippet FROM activities a "
+            f"WHERE a.activity_type = 'Message Sent' AND {likes}{filters} ORDER BY a.timestamp DESC LIMIT ?"
+        )
+        return await asyncio.to_thread(self._query, sql, (*patterns, *params, limit))
+
+    async def timestamps(self, guild_id: int, user_id: int, since: float) -> List[float]:
+        rows = await asyncio.to_thread(
+            self._query,
+            "SELECT timestamp FROM activities WHERE guild_id = ? AND user_id = ? AND timestamp >= ?",
+            (guild_id, user_id, since),
+        )
+        return [row["timestamp"] for row in rows]
+
+    async def latest_details(self, guild_id: int, user_id: int, activity_types: Iterable[str]) -> Dict[str, str]:
+        """Return the details of a user's most recent activity of each type, keyed by type."""
+        activity_types = list(activity_types)
+        if not activity_types:
+            return {}
+        # SQLite takes the bare columns from the row holding MAX(timestamp)
+        rows = await asyncio.to_thread(
+            self._query,
+            f"SELECT activity_type, details, MAX(timestamp) FROM activities WHERE guild_id = ? AND user_id = ? "
+            f"AND activity_type IN ({', '.join('?' for _ in activity_types)}) GROUP BY activity_type",
+            (guild_id, user_id, *activity_types),
+        )
+        return {row["activity_type"]: row["details"] for row in rows}
+
+    async def load_histogram(self, guild_id: int, user_id: int) -> Optional[sqlite3.Row]:
+        rows = await asyncio.to_thread(
+            self._query, "SELECT * FROM histograms WHERE guild_id = ? AND user_id = ?", (guild_id, user_id)
+        )
+        return rows[0] if rows else None
+
+    async def save_histograms(self, histograms: Iterable[Dict]) -> None:
+        rows = [
+            (h["guild_id"], h["user_id"], h["day_ordinal"], h["timezone"], h["counts"], h["saved_at"])
+            for h in histograms
+        ]
+        if rows:
+            await asyncio.to_thread(
+                self._executemany,
+                "INSERT OR REPLACE INTO histograms (guild_id, user_id, day_ordinal, timezone, counts, saved_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    async def load_word_frequencies(self, guild_id: int, user_id: int) -> Optional[sqlite3.Row]:
+        rows = await asyncio.to_thread(
+            self._query, "SELECT * FROM word_frequencies WHERE guild_id = ? AND user_id = ?", (guild_id, user_id)
+        )
+        return rows[0] if rows else None
+
+    async def save_word_frequencies(self, tables: Iterable[Dict]) -> None:
+        rows = [(t["guild_id"], t["user_id"], t["data"], t["decayed_at"], t["saved_at"]) for t in tables]
+        if rows:
+            await asyncio.to_thread(
+                self._executemany,
+                "INSERT OR REPLACE INTO word_frequencies (guild_id, user_id, data, decayed_at, saved_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    async def set_sentiments(self, scores: Iterable[tuple]) -> None:
+        """Store sentiment scores for existing rows, given (row id, sentiment) pairs."""
+        rows = [(sentiment, row_id) for row_id, sentiment in scores]
+        if rows:
+            await asyncio.to_thread(self._executemany, "UPDATE activities SET sentiment = ? WHERE id = ?", rows)
+
+    async def unscored_messages(self, guild_id: int, user_id: int, since: float, limit: int) -> List[sqlite3.Row]:
+        return await asyncio.to_thread(
+            self._query,
+            "SELECT id, content FROM activities WHERE guild_id = ? AND user_id = ? AND activity_type = 'Message Sent' "
+            "AND timestamp >= ? AND sentiment IS NULL LIMIT ?",
+            (guild_id, user_id, since, limit),
+        )
+
+    def _sentiment_series(self, guild_id: int, user_id: int, since: float, until: float, max_points: int):
+        where = ("FROM activities WHERE guild_id = ? AND user_id = ? AND activity_type = 'Message Sent' "
+                 "AND timestamp >= ? AND timestamp < ? AND sentiment IS NOT NULL")
+        params = (guild_id, user_id, since, until)
+        timestamps, sentiments = array("d"), array("d")
+        with self._lock:
+            count, first, last = self._conn.execute(f"SELECT COUNT(*), MIN(timestamp), MAX(timestamp) {where}", params).fetchone()
+            if count <= max_points:
+                cursor = self._conn.execute(f"SELECT timestamp, sentiment {where} ORDER BY timestamp", params)
+            else:
+                # Too many points to read one by one; average them into max_points time buckets in SQL
+                bucket = max((last - first) / max_points, 1e-3)
+                cursor = self._conn.execute(
+                    f"SELECT AVG(timestamp), AVG(sentiment) {where} "
+                    "GROUP BY CAST((timestamp - ?) / ? AS INTEGER) ORDER BY 1",
+                    (*params, first, bucket),
+                )
+            cursor.row_factory = None
+            for timestamp, sentiment in cursor:
+                timestamps.append(timestamp)
+                sentiments.append(sentiment)
+        return timestamps, sentiments, count
+
+    async def sentiment_series(self, guild_id: int, user_id: int, since: float, until: float,
+                               max_points: int = 200_000) -> Tuple[array, array, int]:
+        """Scored message (timestamps, sentiments) in a range, pre-aggregated if there are more than
+        ``max_points``, plus the number of messages they cover."""
+        return await asyncio.to_thread(self._sentiment_series, guild_id, user_id, since, until, max_points)
+
+    async def sentiment_counts(self, guild_id: int, user_ids: List[int], since: float, bins: int) -> List[tuple]:
+        """(user ID, bin, count, score sum) for scored messages since a time, with scores from -1 to 1 split into ``bins``."""
+        if not user_ids:
+            return []
+
+        def query():
+            with self._lock:
+                cursor = self._conn.execute(
+                    "SELECT user_id, MIN(CAST((sentiment + 1) * ? / 2 AS INTEGER), ? - 1) AS bin, COUNT(*), SUM(sentiment) "
+                    f"FROM activities WHERE guild_id = ? AND user_id IN ({', '.join('?' for _ in user_ids)}) "
+                    "AND activity_type = 'Message Sent' AND timestamp >= ? AND sentiment IS NOT NULL "
+                    "GROUP BY user_id, bin",
+                    (bins, bins, guild_id, *user_ids, since),
+                )
+                cursor.row_factory = None
+                return cursor.fetchall()
+
+        return await asyncio.to_thread(query)
+
+    async def existing_message_ids(self, guild_id: int, user_id: int, message_ids: List[int]) -> set:
+        """Return which of the given sent-message IDs are already stored for a user."""
+        found = set()
+        for start in range(0, len(message_ids), 500):
+            chunk = message_ids[start:start + 500]
+            rows = await asyncio.to_thread(
+                self._query,
+                f"SELECT message_id FROM activities WHERE guild_id = ? AND user_id = ? AND activity_type = 'Message Sent' "
+                f"AND message_id IN ({', '.join('?' for _ in chunk)})",
+                (guild_id, user_id, *chunk),
+            )
+            found.update(row["message_id"] for row in rows)
+        return found
+
+    async def timestamp_bounds(self, guild_id: int, user_id: int) -> tuple:
+        """Return the (earliest, latest) stored timestamps for a user, or (None, None)."""
+        rows = await asyncio.to_thread(
+            self._query,
+            "SELECT MIN(timestamp) AS earliest, MAX(timestamp) AS latest "
+            "FROM activities WHERE guild_id = ? AND user_id = ?",
+            (guild_id, user_id),
+        )
+        return (rows[0]["earliest"], rows[0]["latest"]) if rows else (None, None)
+
+    async def channel_checkpoints(self, guild_id: int) -> Dict[int, int]:
+        """Return the last scanned message ID per channel for the missed-activity scan."""
+        rows = await asyncio.to_thread(
+            self._query, "SELECT channel_id, message_id FROM channel_checkpoints WHERE guild_id = ?", (guild_id,)
+        )
+        return {row["channel_id"]: row["message_id"] for row in rows}
+
+    async def set_channel_checkpoints(self, guild_id: int, checkpoints: Dict[int, int]) -> None:
+        rows = [(guild_id, channel_id, message_id) for channel_id, message_id in checkpoints.items()]
+        if rows:
+            await asyncio.to_thread(
+                self._executemany,
+                "INSERT OR REPLACE INTO channel_checkpoints (guild_id, channel_id, message_id) VALUES (?, ?, ?)",
+                rows,
+            )
+
+    async def is_thread_imported(self, thread_id: int) -> bool:
+        rows = await asyncio.to_thread(
+            self._query, "SELECT 1 FROM imported_threads WHERE thread_id = ?", (thread_id,)
+        )
+        return bool(rows)
+
+    async def mark_thread_imported(self, thread_id: int) -> None:
+        await asyncio.to_thread(
+            self._execute,
+            "INSERT OR REPLACE INTO imported_threads (thread_id, imported_at) VALUES (?, ?)",
+            (thread_id, time.time()),
+        )
+
+    async def inactivity(self) -> List[sqlite3.Row]:
+        return await asyncio.to_thread(self._query, "SELECT * FROM inactivity", ())
+
+    async def last_seen(self) -> List[sqlite3.Row]:
+        """Latest activity timestamp for every stored user."""
+        return await asyncio.to_thread(
+            self._query,
+            "SELECT guild_id, user_id, MAX(timestamp) AS last_seen FROM activities GROUP BY guild_id, user_id",
+            (),
+        )
+
+    async def save_inactivity(self, rows: Iterable[Dict]) -> None:
+        values = [(row["guild_id"], row["user_id"], row["last_seen"], int(row["alerted"])) for row in rows]
+        if values:
+            await asyncio.to_thread(
+                self._executemany,
+                "INSERT OR REPLACE INTO inactivity (guild_id, user_id, last_seen, alerted) VALUES (?, ?, ?, ?)",
+                values,
+            )
+
+    async def activities_after(self, guild_id: int, user_id: Optional[int], cursor: Optional[tuple],
+                               until: Optional[float] = None, limit: int = 1000) -> List[sqlite3.Row]:
+        """One page of activities after a (timestamp, id) cursor, for streaming through large histories."""
+        sql = "SELECT * FROM activities WHERE guild_id = ?"
+        params = [guild_id]
+        if user_id is not None:
+            sql += " AND user_id = ?"
+            params.append(user_id)
+        if cursor is not None:
+            sql += " AND (timestamp > ? OR (timestamp = ? AND id > ?))"
+            params.extend((cursor[0], cursor[0], cursor[1]))
+        if until is not None:
+            sql += " AND timestamp < ?"
+            params.append(until)
+        sql += " ORDER BY timestamp, id LIMIT ?"
+        params.append(limit)
+        return await asyncio.to_thread(self._query, sql, tuple(params))
+
+    async def delete_activities(self, activity_ids: List[int]) -> None:
+        for start in range(0, len(activity_ids), 500):
+            chunk = activity_ids[start:start + 500]
+            await asyncio.to_thread(
+                self._execute, f"DELETE FROM activities WHERE id IN ({', '.join('?' for _ in chunk)})", tuple(chunk)
+            )
+
+    async def delete_user(self, guild_id: int, user_id: int) -> None:
+        for table in ("activities", "histograms", "word_frequencies", "inactivity"):
+            await asyncio.to_thread(
+                self._execute,
+                f"DELETE FROM {table} WHERE guild_id = ? AND user_id = ?",
+                (guild_id, user_id),
+            )
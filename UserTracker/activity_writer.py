@@ -0,0 +1,190 @@
+"""
+Batched thread writer for UserTracker.
+
+Activities bound for the same log thread are queued and sent together as one
+message with up to ten embeds, instead of one message per event.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import discord
+
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_CHARS_PER_MESSAGE = 6000
+
+log = logging.getLogger("UserTracker.writer")
+
+
+def batch_embeds(embeds: List[discord.Embed], max_embeds: int = MAX_EMBEDS_PER_MESSAGE) -> List[List[discord.Embed]]:
+    """Split embeds into message-sized groups that respect Discord's count and length limits."""
+    batches = []
+    batch = []
+    chars = 0
+    for embed in embeds:
+        size = len(embed)
+        if batch and (len(batch) >= max_embeds or chars + size > MAX_EMBED_CHARS_PER_MESSAGE):
+            batches.append(batch)
+            batch = []
+            chars = 0
+        batch.append(embed)
+        chars += size
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+class QueuedEmbed:
+    """An embed waiting to be written, with the activity it belongs to."""
+
+    __slots__ = ("embed", "guild_id", "user_id", "queued_at")
+
+    def __init__(self, embed: discord.Embed, guild_id: int, user_id: int):
+        self.embed = embed
+        self.guild_id = guild_id
+        self.user_id = user_id
+        self.queued_at = time.monotonic()
+
+
+class ThreadQueue:
+    """Pending embeds for a single thread plus the task draining them."""
+
+    def __init__(self, thread):
+        self.thread = thread
+        self.pending = deque()
+        self.wakeup = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+
+class ActivityWriter:
+    """Coalesces embeds per thread and flushes them on a size or time threshold.
+
+    ``on_flush`` is awaited after every successful send with the thread and the
+    written items, so bookkeeping such as timestamp updates happens once per
+    message rather than once per event.
+    """
+
+    def __init__(self, rate_limiter, flush_delay: float = 2.0, max_embeds: int = MAX_EMBEDS_PER_MESSAGE,
+                 on_flush: Optional[Callable[..., Awaitable[None]]] = None):
+        self.rate_limiter = rate_limiter
+        self.flush_delay = flush_delay
+        self.max_embeds = min(max_embeds, MAX_EMBEDS_PER_MESSAGE)
+        self.on_flush = on_flush
+        self.queues: Dict[int, ThreadQueue] = {}
+        self.closing = False
+        self.messages_sent = 0
+        self.embeds_sent = 0
+        self.failed_embeds = 0
+        self.total_latency = 0.0
+        self.last_latency = 0.0
+        self.max_latency = 0.0
+
+    @property
+    def depth(self) -> int:
+        return sum(len(queue.pending) for queue in self.queues.values())
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "depth": self.depth,
+            "threads": sum(1 for queue in self.queues.values() if queue.pending),
+            "messages_sent": self.messages_sent,
+            "embeds_sent": self.embeds_sent,
+            "failed_embeds": self.failed_embeds,
+            "avg_latency": self.total_latency / self.messages_sent if self.messages_sent else 0.0,
+            "last_latency": self.last_latency,
+            "max_latency": self.max_latency,
+        }
+
+    async def enqueue(self, thread, embeds: List[discord.Embed], guild_id: int, user_id: int):
+        queue = self.queues.get(thread.id)
+        if queue is None:
+            queue = self.queues[thread.id] = ThreadQueue(thread)
+        queue.thread = thread
+        for embed in embeds:
+            queue.pending.append(QueuedEmbed(embed, guild_id, user_id))
+
+        if len(queue.pending) >= self.max_embeds:
+            queue.wakeup.set()
+        if queue.task is None or queue.task.done():
+            queue.task = asyncio.create_task(self._drain(queue))
+
+    async def _drain(self, queue: ThreadQueue):
+        while queue.pending:
+            if len(queue.pending) < self.max_embeds and not self.closing:
+                queue.wakeup.clear()
+                remaining = self.flush_delay - (time.monotonic() - queue.pending[0].queued_at)
+                if remaining > 0:
+                    try:
+                        await asyncio.wait_for(queue.wakeup.wait(), timeout=remaining)
+                    except asyncio.TimeoutError:
+                        pass
+            await self._flush(queue)
+
+    def _take_batch(self, queue: ThreadQueue) -> List[QueuedEmbed]:
+        batch = []
+        chars = 0
+        while queue.pending and len(batch) < self.max_embeds:
+            size = len(queue.pending[0].embed)
+            if batch and chars + size > MAX_EMBED_CHARS_PER_MESSAGE:
+                break
+            batch.append(queue.pending.popleft())
+            chars += size
+        return batch
+
+    async def _flush(self, queue: ThreadQueue):
+        batch = self._take_batch(queue)
+        if not batch:
+            return
+        try:
+            async with self.rate_limiter.limit(queue.thread.id, batch[0].guild_id):
+                await queue.thread.send(embeds=[item.embed for item in batch])
+        except discord.NotFound:
+            # The thread is gone, nothing else queued for it can be written either
+            self.failed_embeds += len(batch) + len(queue.pending)
+            queue.pending.clear()
+            return
+        except Exception as e:
+            self.failed_embeds += len(batch)
+            log.error(f"Error writing {len(batch)} embeds to thread {queue.thread.id}: {e}", exc_info=True)
+            return
+
+        latency = time.monotonic() - batch[0].queued_at
+        self.messages_sent += 1
+        self.embeds_sent += len(batch)
+        self.total_latency += latency
+        self.last_latency = latency
+        self.max_latency = max(self.max_latency, latency)
+
+        if self.on_flush:
+            try:
+                await self.on_flush(queue.thread, batch)
+            except Exception as e:
+                log.error(f"Error in flush callback for thread {queue.thread.id}: {e}", exc_info=True)
+
+    def discard(self, thread_id: int) -> int:
+        """Drop everything queued for a thread, e.g. one about to be replaced. Returns how many embeds were dropped."""
+        queue = self.queues.pop(thread_id, None)
+        if queue is None:
+            return 0
+        if queue.task and not queue.task.done():
+            queue.task.cancel()
+        dropped = len(queue.pending)
+        queue.pending.clear()
+        return dropped
+
+    async def close(self):
+        """Write out everything still queued without waiting for the flush delay."""
+        self.closing = True
+        tasks = []
+        for queue in self.queues.values():
+            queue.wakeup.set()
+            if queue.task and not queue.task.done():
+                tasks.append(queue.task)
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for queue in self.queues.values():
+            while queue.pending:
+                await self._flush(queue)
+        self.queues.clear()
@@ -0,0 +1,144 @@
+"""
+Activity archives and exports for UserTracker.
+
+Activity older than a guild's retention period is moved out of the SQLite
+store into gzip-compressed JSON Lines files, one per guild and UTC month, so
+hot queries only ever touch recent rows. Exports stream the archives and the
+store page by page into a compressed CSV or JSONL file, never holding a
+user's whole history in memory.
+"""
+
+import asyncio
+import csv
+import gzip
+import json
+import os
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from .activity_store import ACTIVITY_COLUMNS
+
+ARCHIVE_BATCH_SIZE = 5000
+EXPORT_PAGE_SIZE = 2000
+EXPORT_COLUMNS = ("id",) + ACTIVITY_COLUMNS
+EXPORT_FORMATS = ("csv", "jsonl")
+
+
+class ActivityArchive:
+    """Month-partitioned ``<guild_id>/<YYYY-MM>.jsonl.gz`` files under ``directory``."""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+
+    def partition(self, guild_id: int, timestamp: float) -> Path:
+        month = datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m")
+        return self.directory / str(guild_id) / f"{month}.jsonl.gz"
+
+    def partitions(self, guild_id: int) -> List[Path]:
+        guild_directory = self.directory / str(guild_id)
+        return sorted(guild_directory.glob("*.jsonl.gz")) if guild_directory.exists() else []
+
+    def _append(self, guild_id: int, records: Iterable[Dict]):
+        grouped = defaultdict(list)
+        for record in records:
+            grouped[self.partition(guild_id, record["timestamp"])].append(record)
+        for path, partition_records in grouped.items():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            payload = "".join(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n" for record in partition_records)
+            # Each batch is a separate gzip member; readers see the concatenation
+            with open(path, "ab") as raw:
+                with gzip.GzipFile(fileobj=raw, mode="wb") as compressed:
+                    compressed.write(payload.encode("utf-8"))
+                raw.flush()
+                os.fsync(raw.fileno())
+
+    async def compact(self, store, guild_id: int, before: float) -> int:
+        """Move a guild's activities older than ``before`` from the store into the archive."""
+        moved = 0
+        while True:
+            rows = await store.activities_after(guild_id, None, None, until=before, limit=ARCHIVE_BATCH_SIZE)
+            if not rows:
+                return moved
+            records = [{column: row[column] for column in EXPORT_COLUMNS} for row in rows]
+            # Rows are only deleted once they are safely on disk
+            await asyncio.to_thread(self._append, guild_id, records)
+            await store.delete_activities([record["id"] for record in records])
+            moved += len(records)
+
+    def records(self, guild_id: int, user_id: Optional[int] = None) -> Iterator[Dict]:
+        """Stream archived records, oldest partition first."""
+        for path in self.partitions(guild_id):
+            with gzip.open(path, "rt", encoding="utf-8") as lines:
+                for line in lines:
+                    record = json.loads(line)
+                    if user_id is None or record["user_id"] == user_id:
+                        yield record
+
+    def delete_user(self, guild_id: int, user_id: int):
+        """Rewrite the guild's partitions without a user's records."""
+        for path in self.partitions(guild_id):
+            temp_path = path.with_suffix(".partial")
+            kept = 0
+            with gzip.open(path, "rt", encoding="utf-8") as lines, gzip.open(temp_path, "wt", encoding="utf-8") as output:
+                for line in lines:
+                    if json.loads(line)["user_id"] != user_id:
+                        output.write(line)
+                        kept += 1
+            if kept:
+                os.replace(temp_path, path)
+            else:
+                temp_path.unlink()
+                path.unlink()
+
+    def size(self, guild_id: int) -> Dict[str, int]:
+        files = self.partitions(guild_id)
+        return {"files": len(files), "bytes": sum(path.stat().st_size for path in files)}
+
+
+class ExportWriter:
+    """Writes records to a gzip-compressed CSV or JSONL file."""
+
+    def __init__(self, path: Path, fmt: str):
+        self.path = Path(path)
+        self.format = fmt
+        self.count = 0
+        self._file = gzip.open(self.path, "wt", encoding="utf-8", newline="")
+        self._csv = None
+        if fmt == "csv":
+            self._csv = csv.DictWriter(self._file, fieldnames=EXPORT_COLUMNS, extrasaction="ignore")
+            self._csv.writeheader()
+
+    def write(self, records: Iterable[Dict]):
+        for record in records:
+            if self._csv is not None:
+                self._csv.writerow(record)
+            else:
+                self._file.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+            self.count += 1
+
+    def close(self):
+        self._file.close()
+
+
+def _write_archived(archive: ActivityArchive, writer: ExportWriter, guild_id: int, user_id: int):
+    writer.write(archive.records(guild_id, user_id))
+
+
+async def export_activities(store, archive: ActivityArchive, guild_id: int, user_id: int, path: Path, fmt: str) -> int:
+    """Stream a user's archived and stored activities to ``path``. Returns the number of records written."""
+    writer = ExportWriter(path, fmt)
+    try:
+        await asyncio.to_thread(_write_archived, archive, writer, guild_id, user_id)
+        cursor = None
+        while True:
+            rows = await store.activities_after(guild_id, user_id, cursor, limit=EXPORT_PAGE_SIZE)
+            if not rows:
+                break
+            records = [{column: row[column] for column in EXPORT_COLUMNS} for row in rows]
+            await asyncio.to_thread(writer.write, records)
+            cursor = (rows[-1]["timestamp"], rows[-1]["id"])
+    finally:
+        await asyncio.to_thread(writer.close)
+    return writer.count
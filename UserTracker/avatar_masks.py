@@ -0,0 +1,67 @@
+"""
+On-disk cache of prepared wordcloud masks for UserTracker.
+
+A mask is the user's avatar composited onto white and reduced to the 0/255
+array WordCloud uses for placement. Files are named after the avatar hash
+and size, so a changed avatar is a new entry, and the least recently used
+files are removed once the cache is full. The file operations run in a
+worker thread, so listing and pruning the directory never blocks the event
+loop.
+"""
+
+import asyncio
+import os
+from pathlib import Path
+from typing import Optional
+
+AVATAR_MASK_SIZE = 512
+
+
+class AvatarMaskCache:
+    """LRU of mask files in ``directory``, ordered by modification time."""
+
+    def __init__(self, directory: Path, max_entries: int = 128):
+        self.directory = Path(directory)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, avatar_key: str, size: int) -> Path:
+        return self.directory / f"{avatar_key}_{size}.npz"
+
+    async def get(self, avatar_key: str, size: int) -> Optional[Path]:
+        """Return the cached mask file, marking it as recently used."""
+        return await asyncio.to_thread(self._get, avatar_key, size)
+
+    def _get(self, avatar_key: str, size: int) -> Optional[Path]:
+        path = self.path(avatar_key, size)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return path
+
+    async def prepare(self, avatar_key: str, size: int) -> Path:
+        """Where a new mask should be written; makes room for it first."""
+        return await asyncio.to_thread(self._prepare, avatar_key, size)
+
+    def _prepare(self, avatar_key: str, size: int) -> Path:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        entries = sorted(self.directory.glob("*.npz"), key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[:max(0, len(entries) - self.max_entries + 1)]:
+            entry.unlink(missing_ok=True)
+        return self.path(avatar_key, size)
+
+    async def stats(self):
+        return await asyncio.to_thread(self._stats)
+
+    def _stats(self):
+        files = list(self.directory.glob("*.npz")) if self.directory.exists() else []
+        return {
+            "cached": len(files),
+            "cached_bytes": sum(entry.stat().st_size for entry in files),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
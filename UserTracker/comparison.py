@@ -0,0 +1,88 @@
+"""
+Cross-user analytics for UserTracker.
+
+Per-user activity histograms are stacked into one (users x days x hours)
+array and per-user sentiment scores into one (users x bins) array, so every
+statistic below is a single NumPy reduction no matter how many users are
+compared.
+"""
+
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+SENTIMENT_BINS = 10  # Bins of width 0.2 over VADER's compound score range of -1 to 1
+SENTIMENT_CENTERS = np.linspace(-1, 1, SENTIMENT_BINS + 1)[:-1] + 1 / SENTIMENT_BINS
+
+
+def activity_summary(stack: np.ndarray) -> Dict[str, np.ndarray]:
+    """Per-user totals and peaks from a (users, DAYS, HOURS) stack of activity counts."""
+    stack = stack.astype(np.float64)
+    hourly = stack.sum(axis=1)
+    daily = stack.sum(axis=2)
+    totals = hourly.sum(axis=1)
+    guild_total = totals.sum()
+    return {
+        "totals": totals,
+        "share": totals / guild_total if guild_total else np.zeros_like(totals),
+        "hourly": hourly,
+        "daily": daily,
+        "peak_hour": hourly.argmax(axis=1),
+        "peak_day": daily.argmax(axis=1),
+        "active_hours": (hourly > 0).sum(axis=1),
+    }
+
+
+def schedule_similarity(hourly: np.ndarray) -> np.ndarray:
+    """Cosine similarity of every pair of users' hour-of-day profiles."""
+    norms = np.linalg.norm(hourly, axis=1, keepdims=True)
+    profiles = np.divide(hourly, norms, out=np.zeros_like(hourly, dtype=np.float64), where=norms > 0)
+    return profiles @ profiles.T
+
+
+def most_similar_pair(similarity: np.ndarray) -> Tuple[int, int, float]:
+    """The two different users with the most similar schedules."""
+    masked = np.triu(similarity, k=1)
+    if masked.size < 4:
+        return 0, 0, 0.0
+    first, second = np.unravel_index(masked.argmax(), masked.shape)
+    return int(first), int(second), float(masked[first, second])
+
+
+def sentiment_summary(counts: np.ndarray, sums: np.ndarray) -> Dict[str, np.ndarray]:
+    """Mean score and the shares scoring at/above and below zero, from (users, SENTIMENT_BINS) arrays
+    of message counts and score sums."""
+    counts = counts.astype(np.float64)
+    totals = counts.sum(axis=1)
+    safe = np.where(totals > 0, totals, 1)
+    half = SENTIMENT_BINS // 2
+    return {
+        "messages": totals,
+        "mean": sums.sum(axis=1) / safe,
+        "positive": counts[:, half:].sum(axis=1) / safe,
+        "negative": counts[:, :half].sum(axis=1) / safe,
+    }
+
+
+def sentiment_matrices(rows: Sequence[Tuple[int, int, int, float]], user_ids: Sequence[int]) -> Tuple[np.ndarray, np.ndarray]:
+    """(users, SENTIMENT_BINS) arrays of message counts and score sums from (user_id, bin, count, sum) rows."""
+    counts = np.zeros((len(user_ids), SENTIMENT_BINS))
+    sums = np.zeros((len(user_ids), SENTIMENT_BINS))
+    if rows:
+        position = {user_id: index for index, user_id in enumerate(user_ids)}
+        # User IDs stay Python ints; snowflakes are above 2**53 and don't survive float64
+        users = np.array([position[row[0]] for row in rows])
+        values = np.array([row[1:] for row in rows], dtype=np.float64)
+        bins = values[:, 0].astype(int)
+        np.add.at(counts, (users, bins), values[:, 1])
+        np.add.at(sums, (users, bins), values[:, 2])
+    return counts, sums
+
+
+def distribution_bar(counts: np.ndarray, width: int = 10) -> List[str]:
+    """Text bars for a sentiment distribution, most negative bin first."""
+    peak = counts.max() if counts.size and counts.max() else 1
+    return [
+        f"`{center:+.1f}` {'█' * int(round(count / peak * width))} {int(count)}"
+        for center, count in zip(SENTIMENT_CENTERS, counts)
+    ]
@@ -0,0 +1,139 @@
+"""
+Inactivity deadlines for UserTracker.
+
+Every tracked user has a deadline of last activity + threshold. Deadlines sit
+in a min-heap with one entry per user and a single task sleeps until the
+earliest one. Logging activity only updates the user's last-seen time; an
+entry that turns out to be stale when it reaches the top of the heap is
+pushed back to the real deadline. The last-seen times are persisted to the
+activity store, so alerts survive reloads.
+"""
+
+import asyncio
+import heapq
+import logging
+import time
+from typing import Awaitable, Callable, Dict, List, Set, Tuple
+
+log = logging.getLogger("UserTracker.inactivity")
+
+Key = Tuple[int, int]
+
+
+class InactivityScheduler:
+    """Fires ``on_inactive(guild_id, user_id, last_seen)`` once per inactive stretch."""
+
+    def __init__(self, store, threshold: float, on_inactive: Callable[[int, int, float], Awaitable[None]]):
+        self.store = store
+        self.threshold = threshold
+        self.on_inactive = on_inactive
+        self.last_seen: Dict[Key, float] = {}
+        self.alerted: Set[Key] = set()
+        self.heap: List[Tuple[float, int, int]] = []
+        self.scheduled: Set[Key] = set()
+        self.dirty: Set[Key] = set()
+        self.wakeup = asyncio.Event()
+        self.alerts_sent = 0
+
+    async def load(self, tracked: Callable[[int, int], bool]):
+        """Rebuild the heap from the store, seeding users without a saved entry from their last activity."""
+        saved = {(row["guild_id"], row["user_id"]): row for row in await self.store.inactivity()}
+        for row in await self.store.last_seen():
+            key = (row["guild_id"], row["user_id"])
+            if key not in saved and tracked(*key):
+                self.last_seen[key] = max(self.last_seen.get(key, 0), row["last_seen"])
+                self.dirty.add(key)
+        for key, row in saved.items():
+            # Activity logged while loading is newer than anything saved
+            if tracked(*key) and row["last_seen"] >= self.last_seen.get(key, 0):
+                self.last_seen[key] = row["last_seen"]
+                if row["alerted"]:
+                    self.alerted.add(key)
+
+        self.heap = [(seen + self.threshold, *key) for key, seen in self.last_seen.items() if key not in self.alerted]
+        heapq.heapify(self.heap)
+        self.scheduled = {(guild_id, user_id) for _, guild_id, user_id in self.heap}
+        self.wakeup.set()
+
+    def touch(self, guild_id: int, user_id: int, timestamp: float):
+        """Push a user's deadline back after activity. O(1) unless the user had no pending deadline."""
+        key = (guild_id, user_id)
+        if timestamp <= self.last_seen.get(key, 0):
+            return
+        self.last_seen[key] = timestamp
+        self.alerted.discard(key)
+        self.dirty.add(key)
+        if key not in self.scheduled:
+            self.scheduled.add(key)
+            deadline = timestamp + self.threshold
+            heapq.heappush(self.heap, (deadline, guild_id, user_id))
+            if self.heap[0][0] == deadline:
+                self.wakeup.set()
+
+    def forget(self, guild_id: int, user_id: int):
+        """Stop watching a user; their heap entry is dropped when it comes up."""
+        key = (guild_id, user_id)
+        self.last_seen.pop(key, None)
+        self.alerted.discard(key)
+        self.dirty.discard(key)
+
+    @property
+    def next_deadline(self):
+        return self.heap[0][0] if self.heap else None
+
+    async def run(self):
+        while True:
+            self.wakeup.clear()
+            delay = self.heap[0][0] - time.time() if self.heap else None
+            if delay is None or delay > 0:
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._fire_due()
+
+    async def _fire_due(self):
+        now = time.time()
+        fired = False
+        while self.heap and self.heap[0][0] <= now:
+            _, guild_id, user_id = heapq.heappop(self.heap)
+            key = (guild_id, user_id)
+            self.scheduled.discard(key)
+            last_seen = self.last_seen.get(key)
+            if last_seen is None or key in self.alerted:
+                continue
+            deadline = last_seen + self.threshold
+            if deadline > now:
+                # Active since this entry was pushed, requeue at the real deadline
+                heapq.heappush(self.heap, (deadline, guild_id, user_id))
+                self.scheduled.add(key)
+                continue
+            self.alerted.add(key)
+            self.dirty.add(key)
+            fired = True
+            try:
+                await self.on_inactive(guild_id, user_id, last_seen)
+                self.alerts_sent += 1
+            except Exception as e:
+                log.error(f"Error sending inactivity alert for user {user_id} in guild {guild_id}: {e}", exc_info=True)
+        if fired:
+            await self.persist()
+
+    async def persist(self):
+        if not self.dirty:
+            return
+        rows = [
+            {"guild_id": key[0], "user_id": key[1], "last_seen": self.last_seen[key], "alerted": key in self.alerted}
+            for key in self.dirty if key in self.last_seen
+        ]
+        self.dirty.clear()
+        await self.store.save_inactivity(rows)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "watched": len(self.last_seen),
+            "scheduled": len(self.heap),
+            "next_deadline": self.next_deadline,
+            "alerts_sent": self.alerts_sent,
+        }
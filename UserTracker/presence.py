@@ -0,0 +1,167 @@
+"""
+Presence-storm coalescing for UserTracker.
+
+Status and activity updates arrive once per shared guild and can flap many
+times a minute (Spotify tracks, rich-presence ticks, mobile/desktop
+switching). Changes are collected in a per-user window instead: duplicates
+seen through other guilds are dropped, and when the user goes quiet (or the
+window reaches its maximum length) a single entry is logged to every guild
+tracking them.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+import discord
+
+DEFAULT_QUIET_PERIOD = 60
+DEFAULT_MAX_WINDOW = 600
+MAX_LISTED = 8
+
+log = logging.getLogger("UserTracker.presence")
+
+
+def describe_activity(activity) -> Optional[str]:
+    if activity is None:
+        return None
+    if isinstance(activity, discord.Spotify):
+        return f"Listening to {activity.title} by {activity.artist}"
+    if isinstance(activity, discord.Streaming):
+        return f"Streaming {activity.name}"
+    if isinstance(activity, discord.Game):
+        return f"Playing {activity.name}"
+    return str(activity)
+
+
+class PresenceWindow:
+    """Changes seen for one user since the window opened."""
+
+    __slots__ = ("user_id", "opened", "last_change", "statuses", "activities", "activity", "guild_events", "changes", "task")
+
+    def __init__(self, user_id: int, status: str, activity: Optional[str]):
+        self.user_id = user_id
+        self.opened = time.monotonic()
+        self.last_change = self.opened
+        self.statuses = [status]
+        self.activities: List[str] = []
+        self.activity = activity
+        # Updates seen through each guild, in the same unit as the entries logged to it
+        self.guild_events: Dict[int, int] = {}
+        self.changes = 0
+        self.task: Optional[asyncio.Task] = None
+
+    def entries(self) -> List[Tuple[str, str]]:
+        """(activity type, details) to log for this window, without the server line."""
+        status_changed = len(self.statuses) > 1
+        if self.changes == 1:
+            if status_changed:
+                return [("Status Change", f"**New status:** {self.statuses[-1]}")]
+            if self.activities:
+                return [("Activity Change", f"**Activity:** {self.activities[-1]}")]
+            # The activity was only cleared
+            return []
+
+        lines = []
+        if status_changed:
+            statuses = self.statuses if len(self.statuses) <= MAX_LISTED else self.statuses[:1] + ["…"] + self.statuses[-(MAX_LISTED - 2):]
+            lines.append(f"**Status:** {' → '.join(statuses)}")
+        if self.activities:
+            shown = self.activities[-MAX_LISTED:]
+            more = len(self.activities) - len(shown)
+            lines.append(f"**Activities:** {', '.join(shown)}{f' (+{more} more)' if more else ''}")
+        minutes = max(1, round((self.last_change - self.opened) / 60))
+        lines.append(f"**Changes:** {self.changes} over {minutes} min")
+        return [("Presence Summary", "\n".join(lines))]
+
+
+class PresenceCoalescer:
+    """Merges a user's rapid presence changes into one entry per quiet period.
+
+    ``emit`` is awaited with the user ID, the guild IDs the changes were seen
+    through and the entries to log, and returns the guild IDs it logged them to.
+    Every count in ``stats`` is per guild and user, so an update that led to
+    no entry of its own shows up as suppressed exactly once.
+    """
+
+    def __init__(self, emit: Callable[[int, Set[int], List[Tuple[str, str]]], Awaitable[Set[int]]],
+                 quiet_period: float = DEFAULT_QUIET_PERIOD, max_window: float = DEFAULT_MAX_WINDOW):
+        self.emit = emit
+        self.quiet_period = quiet_period
+        self.max_window = max_window
+        self.windows: Dict[int, PresenceWindow] = {}
+        self.events = 0
+        self.duplicates = 0
+        self.logged = 0
+        self.suppressed = 0
+
+    def observe(self, guild_id: int, user_id: int, before_status: str, before_activity: Optional[str],
+                status: str, activity: Optional[str]):
+        """Record one presence update as seen through one guild."""
+        self.events += 1
+        window = self.windows.get(user_id)
+        if window is None:
+            if before_status == status and before_activity == activity:
+                self.duplicates += 1
+                self.suppressed += 1
+                return
+            window = self.windows[user_id] = PresenceWindow(user_id, before_status, before_activity)
+            window.task = asyncio.create_task(self._close_later(window))
+        window.guild_events[guild_id] = window.guild_events.get(guild_id, 0) + 1
+
+        if status == window.statuses[-1] and activity == window.activity:
+            # Already seen through another guild, or a change we do not log (e.g. client platform)
+            self.duplicates += 1
+            return
+        if status != window.statuses[-1]:
+            window.statuses.append(status)
+            window.changes += 1
+        if activity != window.activity:
+            window.activity = activity
+            if activity:
+                window.activities.append(activity)
+            window.changes += 1
+        window.last_change = time.monotonic()
+
+    async def _close_later(self, window: PresenceWindow):
+        while True:
+            deadline = min(window.last_change + self.quiet_period, window.opened + self.max_window)
+            delay = deadline - time.monotonic()
+            if delay <= 0:
+                break
+            await asyncio.sleep(delay)
+        await self._close(window)
+
+    async def _close(self, window: PresenceWindow):
+        if self.windows.get(window.user_id) is window:
+            del self.windows[window.user_id]
+        entries = window.entries() if window.changes else []
+        logged_to = set()
+        if entries:
+            try:
+                logged_to = await self.emit(window.user_id, set(window.guild_events), entries)
+            except Exception as e:
+                log.error(f"Error logging presence changes for user {window.user_id}: {e}", exc_info=True)
+        for guild_id, events in window.guild_events.items():
+            logged = len(entries) if guild_id in logged_to else 0
+            self.logged += logged
+            self.suppressed += max(0, events - logged)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "events": self.events,
+            "duplicates": self.duplicates,
+            "logged": self.logged,
+            "suppressed": self.suppressed,
+            "open_windows": len(self.windows),
+        }
+
+    async def close(self):
+        """Log every open window now."""
+        windows = list(self.windows.values())
+        for window in windows:
+            if window.task:
+                window.task.cancel()
+        for window in windows:
+            await self._close(window)
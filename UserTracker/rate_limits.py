@@ -0,0 +1,146 @@
+"""
+Per-destination rate limiting for UserTracker.
+
+Every thread or channel gets its own token bucket matching Discord's
+per-channel message route limit, so one busy log thread only slows itself
+down. A shared global bucket keeps the bot under Discord's global limit, and
+when sends have to wait for it they are granted round-robin across guilds
+so a single noisy guild cannot starve the others.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Deque, Dict, Tuple
+
+# Discord allows 5 messages per 5 seconds per channel and 50 requests per second globally
+ROUTE_LIMIT = (5, 5.0)
+GLOBAL_LIMIT = (45, 1.0)
+IDLE_BUCKET_TTL = 300
+
+
+class TokenBucket:
+    """``capacity`` tokens refilled continuously over ``period`` seconds."""
+
+    __slots__ = ("capacity", "rate", "tokens", "updated")
+
+    def __init__(self, capacity: int, period: float):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self) -> float:
+        """Seconds until a token is available (0 if one is available now)."""
+        self._refill(time.monotonic())
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self):
+        self.tokens -= 1
+
+    def idle(self, now: float) -> bool:
+        return now - self.updated > IDLE_BUCKET_TTL
+
+
+class DestinationRateLimiter:
+    """Token buckets keyed by destination ID plus a fair, shared global bucket."""
+
+    def __init__(self, route_limit: Tuple[int, float] = ROUTE_LIMIT, global_limit: Tuple[int, float] = GLOBAL_LIMIT):
+        self.route_limit = route_limit
+        self.global_bucket = TokenBucket(*global_limit)
+        self.buckets: Dict[int, TokenBucket] = {}
+        self.locks: Dict[int, asyncio.Lock] = {}
+        # Guild ID -> futures waiting for a global token, in rotation order
+        self.waiting: "OrderedDict[int, Deque[asyncio.Future]]" = OrderedDict()
+        self._scheduler = None
+        self.acquired = 0
+        self.delayed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _bucket(self, destination_id: int) -> TokenBucket:
+        bucket = self.buckets.get(destination_id)
+        if bucket is None:
+            if len(self.buckets) > 1000:
+                self._prune()
+            bucket = self.buckets[destination_id] = TokenBucket(*self.route_limit)
+            self.locks[destination_id] = asyncio.Lock()
+        return bucket
+
+    def _prune(self):
+        now = time.monotonic()
+        for destination_id in [key for key, bucket in self.buckets.items() if bucket.idle(now)]:
+            if not self.locks[destination_id].locked():
+                del self.buckets[destination_id]
+                del self.locks[destination_id]
+
+    @asynccontextmanager
+    async def limit(self, destination_id: int, guild_id: int):
+        """Wait until a message may be sent to ``destination_id``."""
+        started = time.monotonic()
+        bucket = self._bucket(destination_id)
+        async with self.locks[destination_id]:
+            delay = bucket.delay()
+            while delay > 0:
+                await asyncio.sleep(delay)
+                delay = bucket.delay()
+            bucket.take()
+        await self._global_slot(guild_id)
+
+        waited = time.monotonic() - started
+        self.acquired += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        if waited > 0.01:
+            self.delayed += 1
+        yield
+
+    async def _global_slot(self, guild_id: int):
+        if not self.waiting and self.global_bucket.delay() == 0:
+            self.global_bucket.take()
+            return
+        future = asyncio.get_running_loop().create_future()
+        self.waiting.setdefault(guild_id, deque()).append(future)
+        if self._scheduler is None or self._scheduler.done():
+            self._scheduler = asyncio.create_task(self._grant_global_slots())
+        await future
+
+    async def _grant_global_slots(self):
+        while self.waiting:
+            delay = self.global_bucket.delay()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+            # Serve the guild at the front, then move it to the back of the rotation
+            guild_id, queue = next(iter(self.waiting.items()))
+            future = queue.popleft()
+            if queue:
+                self.waiting.move_to_end(guild_id)
+            else:
+                del self.waiting[guild_id]
+            if not future.done():
+                self.global_bucket.take()
+                future.set_result(None)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "destinations": len(self.buckets),
+            "waiting": sum(len(queue) for queue in self.waiting.values()),
+            "acquired": self.acquired,
+            "delayed": self.delayed,
+            "avg_wait": self.total_wait / self.acquired if self.acquired else 0.0,
+            "max_wait": self.max_wait,
+        }
+
+    def close(self):
+        if self._scheduler is not None:
+            self._scheduler.cancel()
+        for queue in self.waiting.values():
+            for future in queue:
+                future.cancel()
+        self.waiting.clear()
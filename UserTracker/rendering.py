@@ -0,0 +1,301 @@
+"""
+Chart rendering for UserTracker.
+
+Charts are drawn in a process pool with the object-oriented matplotlib API
+(no pyplot global state), so a slow wordcloud or GIF never stalls the bot's
+event loop. Rendered bytes are cached by a hash of the input data.
+
+matplotlib, Pillow, wordcloud and plotly are imported inside the render
+functions, so only the worker processes ever load them. Workers are spawned
+rather than forked, since forking a process that already runs aiohttp and
+SQLite threads can leave a worker holding a lock nobody will release.
+"""
+
+import asyncio
+import hashlib
+import io
+import logging
+import multiprocessing
+import os
+import pickle
+import site
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+log = logging.getLogger("UserTracker.rendering")
+
+HOUR_LABELS = [f"{h:02d}:00" for h in range(24)]
+
+# Red imports cogs through its own finder, so spawned workers need the cog's parent directory on sys.path
+COG_PARENT = str(Path(__file__).resolve().parent.parent)
+
+
+def _figure(**kwargs):
+    from matplotlib.figure import Figure
+    return Figure(**kwargs)
+
+
+def _figure_to_png(fig, **kwargs) -> bytes:
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', **kwargs)
+    return buffer.getvalue()
+
+
+def render_circular_heatmap(activity_data: Sequence[Sequence[int]]) -> bytes:
+    """Polar bar chart of activity per hour of day, summed over the given days."""
+    from matplotlib import cm
+    from matplotlib.colors import Normalize
+
+    radii = np.asarray(activity_data, dtype=float).sum(axis=0)
+    theta = np.linspace(0, 2 * np.pi, 24, endpoint=False)
+    width = 2 * np.pi / 24
+
+    fig = _figure(figsize=(10, 10))
+    ax = fig.add_subplot(projection='polar')
+    bars = ax.bar(theta, radii, width=width, bottom=0.0)
+
+    # Color the bars
+    norm = Normalize(np.min(radii), np.max(radii))
+    for r, bar in zip(radii, bars):
+        bar.set_facecolor(cm.viridis(norm(r)))
+
+    ax.set_xticks(theta)
+    ax.set_xticklabels(HOUR_LABELS)
+    ax.set_ylim(0, max(np.max(radii), 1) * 1.1)
+    ax.set_title("The Circular Chronicles of Time", va='bottom')
+    fig.tight_layout()
+    return _figure_to_png(fig)
+
+
+def render_animated_heatmap(activity_data: Sequence[Sequence[int]]) -> bytes:
+    """One heatmap frame per day, assembled into a looping GIF."""
+    from PIL import Image
+
+    data = np.asarray(activity_data, dtype=float)
+    vmax = max(np.max(data), 1)
+    frames = []
+    for day, row in enumerate(data):
+        fig = _figure(figsize=(12, 6))
+        ax = fig.add_subplot()
+        image = ax.imshow(row.reshape(1, -1), aspect='auto', cmap='viridis', vmin=0, vmax=vmax)
+        fig.colorbar(image, ax=ax)
+        ax.set_xticks(np.arange(24))
+        ax.set_xticklabels(HOUR_LABELS, rotation=45, ha='right')
+        ax.set_yticks([])
+        ax.set_title(f"Activity Heatmap - Day {day + 1}", fontsize=16)
+        ax.set_xlabel("Hour of the Day", fontsize=12)
+        fig.tight_layout()
+        frames.append(Image.open(io.BytesIO(_figure_to_png(fig))).convert("P", palette=Image.ADAPTIVE))
+
+    buffer = io.BytesIO()
+    frames[0].save(buffer, format='GIF', save_all=True, append_images=frames[1:], duration=1000, loop=0)
+    return buffer.getvalue()
+
+
+def render_comparison_heatmap(names: List[str], hourly: Sequence[Sequence[float]]) -> bytes:
+    """Users x hour-of-day heatmap, each row scaled to that user's own activity."""
+    data = np.asarray(hourly, dtype=float)
+    totals = data.sum(axis=1, keepdims=True)
+    shares = np.divide(data, totals, out=np.zeros_like(data), where=totals > 0)
+
+    fig = _figure(figsize=(12, max(3, 0.45 * len(names) + 1.5)))
+    ax = fig.add_subplot()
+    image = ax.imshow(shares, aspect='auto', cmap='viridis')
+    fig.colorbar(image, ax=ax, label="Share of the user's activity")
+    ax.set_xticks(np.arange(24))
+    ax.set_xticklabels(HOUR_LABELS, rotation=45, ha='right')
+    ax.set_yticks(np.arange(len(names)))
+    ax.set_yticklabels(names)
+    ax.set_title("Activity by Hour of Day")
+    fig.tight_layout()
+    return _figure_to_png(fig)
+
+
+def prepare_avatar_mask(avatar_data: bytes, size: int, path: str) -> str:
+    """Composite an avatar onto white and save it as a WordCloud mask (255 = keep clear)."""
+    from PIL import Image
+
+    avatar = Image.open(io.BytesIO(avatar_data)).convert("RGBA")
+    if avatar.size != (size, size):
+        avatar = avatar.resize((size, size), Image.LANCZOS)
+    background = Image.new("RGB", avatar.size, (255, 255, 255))
+    background.paste(avatar, (0, 0), avatar)
+    mask = np.where(np.all(np.asarray(background) == 255, axis=-1), 255, 0).astype(np.uint8)
+
+    # Write next to the target and rename, so readers never see a partial file
+    temp_path = f"{path}.{os.getpid()}.partial"
+    with open(temp_path, "wb") as file:
+        np.savez_compressed(file, mask=mask)
+    os.replace(temp_path, path)
+    return path
+
+
+def render_wordcloud(frequencies: List[Tuple[str, float]], mask_path: Optional[str]) -> bytes:
+    """Word cloud of precomputed (word, weight) pairs, shaped by a prepared avatar mask."""
+    from wordcloud import WordCloud
+
+    mask = None
+    if mask_path:
+        with np.load(mask_path) as data:
+            mask = data["mask"]
+
+    wordcloud = WordCloud(width=800, height=800, background_color='white', mask=mask).generate_from_frequencies(dict(frequencies))
+
+    fig = _figure(figsize=(10, 10))
+    ax = fig.add_subplot()
+    ax.imshow(wordcloud.to_array())
+    ax.axis("off")
+    fig.tight_layout(pad=0)
+    return _figure_to_png(fig)
+
+
+def render_sentiment_graph(labels: List[str], sentiments: List[float]) -> bytes:
+    import plotly.graph_objects as go
+
+    fig = go.Figure(data=go.Scatter(
+        x=list(range(len(sentiments))),
+        y=sentiments,
+        mode='lines+markers',
+        text=labels,
+        hoverinfo='text+y'
+    ))
+    fig.update_layout(
+        title="Sentiment Over Time",
+        xaxis_title="Message Number",
+        yaxis_title="Sentiment Score"
+    )
+    return fig.to_image(format="png")
+
+
+def rolling_mean(timestamps: np.ndarray, values: np.ndarray, window: float) -> np.ndarray:
+    """Mean of the values in the trailing ``window`` seconds at each point (timestamps must be sorted)."""
+    sums = np.concatenate(([0.0], np.cumsum(values)))
+    end = np.arange(1, len(values) + 1)
+    start = np.searchsorted(timestamps, timestamps - window, side="left")
+    return (sums[end] - sums[start]) / (end - start)
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Indices of the points kept by largest-triangle-three-buckets downsampling."""
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    every = (n - 2) / (threshold - 2)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start = int(bucket * every) + 1
+        end = int((bucket + 1) * every) + 1
+        # The next bucket's average is the third corner of the triangle
+        next_end = min(int((bucket + 2) * every) + 1, n)
+        average_x = x[end:next_end].mean() if next_end > end else x[-1]
+        average_y = y[end:next_end].mean() if next_end > end else y[-1]
+        areas = np.abs(
+            (x[previous] - average_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (average_y - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        selected[bucket + 1] = previous
+    return selected
+
+
+def render_sentiment_timeline(timestamps, sentiments, window: float, window_label: str, max_points: int = 2000) -> bytes:
+    """Scatter of (downsampled) message scores with a rolling mean over time."""
+    x = np.asarray(timestamps, dtype=np.float64)
+    y = np.asarray(sentiments, dtype=np.float64)
+    mean = rolling_mean(x, y, window)
+    points = lttb(x, y, max_points)
+    trend = lttb(x, mean, max_points)
+
+    fig = _figure(figsize=(12, 6))
+    ax = fig.add_subplot()
+    ax.scatter(x[points].astype("datetime64[s]"), y[points], s=6, alpha=0.35, color="tab:blue", label="Messages")
+    ax.plot(x[trend].astype("datetime64[s]"), mean[trend], color="tab:orange", linewidth=2, label=f"Rolling mean ({window_label})")
+    ax.axhline(0, color="grey", linewidth=0.8)
+    ax.set_ylim(-1.05, 1.05)
+    ax.set_ylabel("Sentiment Score")
+    ax.set_xlabel("Time (UTC)")
+    ax.set_title("Sentiment Timeline")
+    ax.legend(loc="lower left")
+    fig.autofmt_xdate()
+    fig.tight_layout()
+    return _figure_to_png(fig)
+
+
+class ChartRenderer:
+    """Runs render functions in a capped process pool and caches their output."""
+
+    def __init__(self, max_workers: int = 2, cache_size: int = 64):
+        self.max_workers = max_workers
+        self.cache_size = cache_size
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._semaphore = asyncio.Semaphore(max_workers)
+        self._cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=site.addsitedir,
+                initargs=(COG_PARENT,),
+            )
+        return self._executor
+
+    @staticmethod
+    def cache_key(func: Callable, args: tuple) -> str:
+        return hashlib.sha256(pickle.dumps((func.__name__, args), protocol=4)).hexdigest()
+
+    async def run(self, func: Callable, *args):
+        """Run a function in the pool without caching its result."""
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            executor = self.executor
+            try:
+                return await loop.run_in_executor(executor, func, *args)
+            except BrokenProcessPool:
+                # A worker died (e.g. out of memory); start a fresh pool and retry once.
+                # Concurrent renders fail together, so only the first one replaces the pool.
+                if self._executor is executor:
+                    log.warning("Chart render pool broke, restarting it")
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    self._executor = None
+                return await loop.run_in_executor(self.executor, func, *args)
+
+    async def render(self, func: Callable[..., bytes], *args) -> bytes:
+        key = self.cache_key(func, args)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        result = await self.run(func, *args)
+
+        self._cache[key] = result
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return result
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "cached": len(self._cache),
+            "cached_bytes": sum(len(value) for value in self._cache.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,94 @@
+"""
+Shared sentiment scoring for UserTracker.
+
+One VADER analyzer is loaded per cog, on first use, instead of one per call;
+scores are cached by content hash, and batches are scored in a worker thread
+so the event loop stays free.
+"""
+
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Sequence
+
+TOXICITY_THRESHOLD = -0.5
+
+
+class SentimentEngine:
+    """VADER wrapper with a bounded LRU of scores keyed by content hash."""
+
+    def __init__(self, cache_size: int = 8192):
+        self.cache_size = cache_size
+        self._analyzer = None
+        self._analyzer_lock = threading.Lock()
+        self._cache: "OrderedDict[bytes, Dict]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def analyzer(self):
+        if self._analyzer is None:
+            with self._analyzer_lock:
+                if self._analyzer is None:
+                    # Imported on first use; the lexicon load is the slow part of starting VADER
+                    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+                    self._analyzer = SentimentIntensityAnalyzer()
+        return self._analyzer
+
+    @staticmethod
+    def content_key(text: str) -> bytes:
+        return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+    def cached(self, text: str):
+        key = self.content_key(text)
+        with self._cache_lock:
+            result = self._cache.get(key)
+            if result is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+            return result
+
+    def _store(self, key: bytes, result: Dict):
+        with self._cache_lock:
+            self._cache[key] = result
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def score(self, text: str) -> Dict:
+        """Score one text synchronously, using the cache when possible."""
+        result = self.cached(text)
+        if result is not None:
+            return result
+        scores = self.analyzer.polarity_scores(text)
+        result = {
+            'sentiment': scores['compound'],
+            'positive': scores['pos'],
+            'neutral': scores['neu'],
+            'negative': scores['neg'],
+            'toxicity': scores['compound'] < TOXICITY_THRESHOLD
+        }
+        with self._cache_lock:
+            self.misses += 1
+        self._store(self.content_key(text), result)
+        return result
+
+    def score_many(self, texts: Sequence[str]) -> List[Dict]:
+        return [self.score(text) for text in texts]
+
+    async def analyze(self, text: str) -> Dict:
+        result = self.cached(text)
+        if result is not None:
+            return result
+        return await asyncio.to_thread(self.score, text)
+
+    async def analyze_many(self, texts: Sequence[str]) -> List[Dict]:
+        """Score many texts in a worker thread; cached texts cost nothing."""
+        if not texts:
+            return []
+        return await asyncio.to_thread(self.score_many, list(texts))
+
+    def stats(self) -> Dict[str, int]:
+        return {"cached": len(self._cache), "hits": self.hits, "misses": self.misses}
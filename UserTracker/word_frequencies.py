@@ -0,0 +1,184 @@
+"""
+Streaming word frequencies for UserTracker wordclouds.
+
+Each tracked user's messages are tokenized once, as they are logged, into a
+per-user Counter with stopwords removed. Wordclouds are then drawn from the
+counts with ``WordCloud.generate_from_frequencies`` instead of re-tokenizing
+the user's whole history on every request.
+"""
+
+import asyncio
+import json
+import re
+import time
+import zlib
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Common English stopwords plus chat filler; kept local so tokenizing does not need wordcloud loaded
+STOPWORDS = frozenset("""
+a about above after again against all am an and any are aren't as at be because been before being
+below between both but by can can't cannot could couldn't did didn't do does doesn't doing don't down
+during each few for from further get got had hadn't has hasn't have haven't having he he'd he'll he's
+her here here's hers herself him himself his how how's i i'd i'll i'm i've if in into is isn't it it's
+its itself just let's like me more most mustn't my myself no nor not of off on once only or other ought
+our ours ourselves out over own same shan't she she'd she'll she's should shouldn't so some such than
+that that's the their theirs them themselves then there there's these they they'd they'll they're
+they've this those through to too under until up very was wasn't we we'd we'll we're we've were
+weren't what what's when when's where where's which while who who's whom why why's will with won't
+would wouldn't you you'd you'll you're you've your yours yourself yourselves also im dont thats yeah
+yes ok okay lol oh u ur its gonna wanna gotta really
+""".split())
+
+TOKEN_PATTERN = re.compile(r"[a-z][a-z']+")
+NOISE_PATTERN = re.compile(r"https?://\S+|<a?:\w+:\d+>|<[@#][!&]?\d+>")
+
+MAX_TERMS = 5000  # Distinct words kept per user once pruned
+PRUNE_AT = MAX_TERMS * 2
+
+
+def tokenize(text: str) -> List[str]:
+    text = NOISE_PATTERN.sub(" ", text.lower())
+    tokens = (token.strip("'") for token in TOKEN_PATTERN.findall(text))
+    return [token for token in tokens if len(token) > 1 and token not in STOPWORDS]
+
+
+class WordFrequencies:
+    """One user's (optionally decayed) word counts."""
+
+    __slots__ = ("counts", "decayed_at")
+
+    def __init__(self, counts: Optional[Counter] = None, decayed_at: Optional[float] = None):
+        self.counts = counts if counts is not None else Counter()
+        self.decayed_at = decayed_at if decayed_at is not None else time.time()
+
+    def add(self, text: str, weight: float = 1.0):
+        for token in tokenize(text):
+            self.counts[token] += weight
+        self._prune()
+
+    def merge(self, counts: Counter):
+        self.counts.update(counts)
+        self._prune()
+
+    def _prune(self):
+        if len(self.counts) > PRUNE_AT:
+            self.counts = Counter(dict(self.counts.most_common(MAX_TERMS)))
+
+    def decay(self, half_life_days: Optional[float], now: Optional[float] = None):
+        """Scale all counts down by the time elapsed since the last decay, at most once a day."""
+        now = now or time.time()
+        if not half_life_days or now - self.decayed_at < 86400:
+            return
+        factor = 0.5 ** ((now - self.decayed_at) / (half_life_days * 86400))
+        self.counts = Counter({word: count * factor for word, count in self.counts.items() if count * factor >= 0.01})
+        self.decayed_at = now
+
+    def top(self, limit: int = 200) -> List[Tuple[str, float]]:
+        return [(word, round(count, 3)) for word, count in self.counts.most_common(limit)]
+
+    def to_blob(self) -> bytes:
+        return zlib.compress(json.dumps(self.counts, separators=(",", ":")).encode("utf-8"))
+
+    @classmethod
+    def from_blob(cls, blob: bytes, decayed_at: float) -> "WordFrequencies":
+        return cls(Counter(json.loads(zlib.decompress(blob).decode("utf-8"))), decayed_at)
+
+
+class WordFrequencyIndex:
+    """Loaded word counts keyed by (guild ID, user ID), persisted to the activity store."""
+
+    def __init__(self, store, half_life_for: Callable[[int], Optional[float]]):
+        self.store = store
+        self.half_life_for = half_life_for
+        self.tables: Dict[Tuple[int, int], WordFrequencies] = {}
+        self.dirty = set()
+        self.stale = set()
+
+    async def load(self, guild_id: int, user_id: int) -> WordFrequencies:
+        table = self.tables.get((guild_id, user_id))
+        if table is None:
+            table, _ = await self._load(guild_id, user_id)
+        return table
+
+    async def _load(self, guild_id: int, user_id: int) -> Tuple[WordFrequencies, Optional[float]]:
+        """Read a user's counts, returning them with the save time they were caught up from (None if rebuilt)."""
+        key = (guild_id, user_id)
+        saved = await self.store.load_word_frequencies(guild_id, user_id)
+        if saved and key not in self.stale:
+            table = WordFrequencies.from_blob(saved["data"], saved["decayed_at"])
+            since = saved["saved_at"]
+        else:
+            table = WordFrequencies()
+            since = None
+        rows = await self.store.messages(guild_id, user_id, since=since)
+        # A full rebuild can cover a lot of history, so tokenize off the event loop
+        await asyncio.to_thread(self._add_rows, table, rows, self.half_life_for(guild_id))
+        self.tables[key] = table
+        self.stale.discard(key)
+        self.dirty.add(key)
+        return table, since
+
+    @staticmethod
+    def _add_rows(table: WordFrequencies, rows, half_life: Optional[float]):
+        for row in rows:
+            if row['content']:
+                weight = 0.5 ** ((table.decayed_at - row['timestamp']) / (half_life * 86400)) if half_life else 1.0
+                table.add(row['content'], min(weight, 1.0))
+
+    async def record(self, guild_id: int, user_id: int, text: str):
+        """Count a message that has just been written to the store."""
+        table = self.tables.get((guild_id, user_id))
+        if table is None:
+            # Loading reads the store, which already includes this message
+            await self.load(guild_id, user_id)
+            return
+        table.add(text)
+        self.dirty.add((guild_id, user_id))
+
+    async def record_many(self, guild_id: int, user_id: int, rows):
+        """Count older messages that have just been written to the store, e.g. ones found by a missed-activity scan."""
+        key = (guild_id, user_id)
+        table = self.tables.get(key)
+        if table is None:
+            table, since = await self._load(guild_id, user_id)
+            if since is None:
+                return  # Rebuilt from the store, which already includes them
+            # Catching up from the saved counts only read messages sent after they were saved
+            rows = [row for row in rows if row['timestamp'] < since]
+        # Tokenize in a worker thread, but merge here, since live messages are added to the same table
+        counts = WordFrequencies(decayed_at=table.decayed_at)
+        await asyncio.to_thread(self._add_rows, counts, rows, self.half_life_for(guild_id))
+        table.merge(counts.counts)
+        self.dirty.add(key)
+
+    async def top(self, guild_id: int, user_id: int, limit: int = 200) -> List[Tuple[str, float]]:
+        table = await self.load(guild_id, user_id)
+        table.decay(self.half_life_for(guild_id))
+        return table.top(limit)
+
+    def forget(self, guild_id: int, user_id: int):
+        """Rebuild a user's counts from the store on next use."""
+        self.tables.pop((guild_id, user_id), None)
+        self.dirty.discard((guild_id, user_id))
+        self.stale.add((guild_id, user_id))
+
+    async def persist(self):
+        if not self.dirty:
+            return
+        now = time.time()
+        rows = []
+        for key in self.dirty:
+            table = self.tables.get(key)
+            if table is None:
+                continue
+            table.decay(self.half_life_for(key[0]), now)
+            rows.append({
+                "guild_id": key[0],
+                "user_id": key[1],
+                "data": table.to_blob(),
+                "decayed_at": table.decayed_at,
+                "saved_at": now,
+            })
+        self.dirty.clear()
+        await self.store.save_word_frequencies(rows)
@@ -0,0 +1,495 @@
+"""
+Event-ingest benchmark and load simulator for the UserTracker cog.
+
+Feeds synthetic message, voice and presence events through the cog's real
+listeners, with in-memory guilds, channels and threads that record what the
+cog sends. Config is replaced by an in-memory stand-in that counts reads and
+writes. Everything below the listeners runs for real: sentiment scoring, the
+SQLite store, aggregates, presence coalescing, the batched writer and the
+rate limiter.
+
+Run from the repository root, in an environment with the cog's requirements
+(Red-DiscordBot, vaderSentiment, numpy, pytz, ...) installed:
+
+    python benchmarks/usertracker_ingest.py --events 5000 --rate 500
+    python benchmarks/usertracker_ingest.py --discord-limits --send-latency 80
+
+Reports events/sec, p50/p99 end-to-end latency (event dispatched -> embed sent
+to the log thread) per event type, and Config I/O counts.
+"""
+
+import argparse
+import asyncio
+import copy
+import importlib
+import random
+import re
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import discord  # noqa: E402
+
+from UserTracker.rate_limits import DestinationRateLimiter  # noqa: E402
+
+# The package binds the name UserTracker to the cog class, so fetch the module itself to patch it
+usertracker_module = importlib.import_module("UserTracker.UserTracker")
+
+MARKER = re.compile(r"bench(\d+)x")
+WORDS = ("cats", "dogs", "pizza", "raid", "tonight", "great", "terrible", "love", "hate", "game",
+         "stream", "music", "lol", "patch", "server", "build", "happy", "sad", "meeting", "weekend")
+GAMES = ("Minecraft", "Factorio", "Elden Ring", "Rocket League", "Stardew Valley")
+
+
+# --- Config stand-in -------------------------------------------------------
+
+class ConfigCounter:
+    def __init__(self):
+        self.reads = Counter()
+        self.writes = Counter()
+
+
+class _ValueContext:
+    """Awaitable and async context manager, like the object Red's ``Value.__call__`` returns."""
+
+    def __init__(self, value):
+        self.value = value
+        self.raw = None
+        self.original = None
+
+    def __await__(self):
+        self.value.counter.reads[self.value.key] += 1
+        return self._get().__await__()
+
+    async def _get(self):
+        return copy.deepcopy(self.value.data.get(self.value.name, copy.deepcopy(self.value.default)))
+
+    async def __aenter__(self):
+        self.value.counter.reads[self.value.key] += 1
+        self.raw = await self._get()
+        self.original = copy.deepcopy(self.raw)
+        return self.raw
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if self.raw != self.original:
+            await self.value.set(self.raw)
+
+
+class CountingValue:
+    def __init__(self, counter, data, name, default, scope):
+        self.counter = counter
+        self.data = data
+        self.name = name
+        self.default = default
+        self.key = f"{scope}.{name}"
+
+    def __call__(self):
+        return _ValueContext(self)
+
+    async def set(self, value):
+        self.counter.writes[self.key] += 1
+        self.data[self.name] = copy.deepcopy(value)
+
+    async def get_raw(self, *path, default=None):
+        self.counter.reads[self.key] += 1
+        current = self.data.get(self.name, self.default)
+        for part in path:
+            if not isinstance(current, dict) or part not in current:
+                return default
+            current = current[part]
+        return copy.deepcopy(current)
+
+    async def set_raw(self, *path, value):
+        self.counter.writes[self.key] += 1
+        current = self.data.setdefault(self.name, copy.deepcopy(self.default))
+        for part in path[:-1]:
+            current = current.setdefault(part, {})
+        current[path[-1]] = copy.deepcopy(value)
+
+    async def clear_raw(self, *path):
+        self.counter.writes[self.key] += 1
+        current = self.data.get(self.name, {})
+        for part in path[:-1]:
+            current = current.get(part, {})
+        current.pop(path[-1], None)
+
+
+class CountingGroup:
+    def __init__(self, counter, data, defaults, scope):
+        self._counter = counter
+        self._data = data
+        self._defaults = defaults
+        self._scope = scope
+
+    def __getattr__(self, name):
+        if name.startswith("_") or name not in self._defaults:
+            raise AttributeError(name)
+        return CountingValue(self._counter, self._data, name, self._defaults[name], self._scope)
+
+
+class CountingConfig:
+    """The subset of Red's Config used by UserTracker, backed by dicts and counting every access."""
+
+    def __init__(self):
+        self.counter = ConfigCounter()
+        self.guild_defaults = {}
+        self.global_defaults = {}
+        self.guild_data = defaultdict(dict)
+        self.global_data = {}
+
+    @classmethod
+    def get_conf(cls, cog, identifier, **kwargs):
+        return cls()
+
+    def register_guild(self, **defaults):
+        self.guild_defaults.update(defaults)
+
+    def register_global(self, **defaults):
+        self.global_defaults.update(defaults)
+
+    def guild(self, guild):
+        return CountingGroup(self.counter, self.guild_data[guild.id], self.guild_defaults, "guild")
+
+    def __getattr__(self, name):
+        if name in self.__dict__.get("global_defaults", {}):
+            return CountingValue(self.counter, self.global_data, name, self.global_defaults[name], "global")
+        raise AttributeError(name)
+
+    async def all_guilds(self):
+        self.counter.reads["all_guilds"] += 1
+        return {
+            guild_id: {**copy.deepcopy(self.guild_defaults), **copy.deepcopy(data)}
+            for guild_id, data in self.guild_data.items()
+        }
+
+
+# --- Discord stand-ins -----------------------------------------------------
+
+class Recorder:
+    """Collects what the cog sends and when, to turn markers back into latencies."""
+
+    def __init__(self, send_latency):
+        self.send_latency = send_latency
+        self.dispatched = {}
+        self.latencies = defaultdict(list)
+        self.messages = 0
+        self.embeds = 0
+        self.edits = 0
+        self.last_send = None
+
+    async def sent(self, embeds):
+        if self.send_latency:
+            await asyncio.sleep(self.send_latency)
+        now = time.perf_counter()
+        self.messages += 1
+        self.embeds += len(embeds)
+        self.last_send = now
+        for embed in embeds:
+            for field in embed.fields:
+                for marker in MARKER.findall(field.value or ""):
+                    kind, dispatched = self.dispatched.pop(int(marker), (None, None))
+                    if dispatched is not None:
+                        self.latencies[kind].append(now - dispatched)
+
+
+class FakeSentMessage:
+    _ids = iter(range(10**12, 10**13))
+
+    def __init__(self):
+        self.id = next(self._ids)
+
+
+class FakePartialMessage:
+    def __init__(self, recorder):
+        self.recorder = recorder
+
+    async def edit(self, **kwargs):
+        if self.recorder.send_latency:
+            await asyncio.sleep(self.recorder.send_latency)
+        self.recorder.edits += 1
+
+
+class FakeThread:
+    def __init__(self, thread_id, guild, recorder):
+        self.id = thread_id
+        self.name = f"thread-{thread_id}"
+        self.guild = guild
+        self.recorder = recorder
+        self.jump_url = f"https://discord.com/channels/{guild.id}/{thread_id}"
+
+    async def send(self, content=None, embed=None, embeds=None, **kwargs):
+        await self.recorder.sent(embeds or ([embed] if embed else []))
+        return FakeSentMessage()
+
+
+class FakeTextChannel:
+    def __init__(self, channel_id, name, guild, recorder):
+        self.id = channel_id
+        self.name = name
+        self.guild = guild
+        self.recorder = recorder
+        self.mention = f"<#{channel_id}>"
+        self.threads = []
+
+    async def send(self, content=None, embed=None, **kwargs):
+        return FakeSentMessage()
+
+    def get_partial_message(self, message_id):
+        return FakePartialMessage(self.recorder)
+
+
+class FakeGuild:
+    def __init__(self, guild_id, recorder):
+        self.id = guild_id
+        self.name = f"Bench Guild {guild_id}"
+        self.channels = {}
+        self.threads = {}
+        self.members = {}
+        self.log_channel = self._add_channel(FakeTextChannel(guild_id * 1000 + 1, "user-logs", self, recorder))
+        self.chat_channels = [
+            self._add_channel(FakeTextChannel(guild_id * 1000 + 10 + index, f"chat-{index}", self, recorder))
+            for index in range(5)
+        ]
+
+    def _add_channel(self, channel):
+        self.channels[channel.id] = channel
+        return channel
+
+    def get_channel(self, channel_id):
+        return self.channels.get(channel_id)
+
+    def get_thread(self, thread_id):
+        return self.threads.get(thread_id)
+
+    def get_member(self, user_id):
+        return self.members.get(user_id)
+
+
+class FakeMember:
+    def __init__(self, user_id, guild):
+        self.id = user_id
+        self.name = f"bench-user-{user_id}"
+        self.display_name = self.name
+        self.bot = False
+        self.guild = guild
+        self.mention = f"<@{user_id}>"
+        self.display_avatar = SimpleNamespace(url=f"https://cdn.discordapp.com/embed/avatars/{user_id % 5}.png")
+        self.status = discord.Status.online
+        self.activity = None
+        self.voice = None
+
+    def snapshot(self):
+        before = FakeMember.__new__(FakeMember)
+        before.__dict__.update(self.__dict__)
+        return before
+
+
+class FakeBot:
+    def __init__(self, guilds):
+        self.loop = asyncio.get_running_loop()
+        self.user = SimpleNamespace(id=1, name="bench-bot", bot=True)
+        self.guilds = list(guilds)
+        self._guilds = {guild.id: guild for guild in guilds}
+        self._users = {member.id: member for guild in guilds for member in guild.members.values()}
+        self._ready = asyncio.Event()  # Never set, so the cog's periodic loops stay idle
+
+    def get_guild(self, guild_id):
+        return self._guilds.get(guild_id)
+
+    def get_user(self, user_id):
+        return self._users.get(user_id)
+
+    async def is_owner(self, user):
+        return False
+
+    async def wait_until_ready(self):
+        await self._ready.wait()
+
+    def is_closed(self):
+        return False
+
+
+# --- Event streams ---------------------------------------------------------
+
+class EventFactory:
+    def __init__(self, guilds, recorder, seed):
+        self.guilds = guilds
+        self.recorder = recorder
+        self.random = random.Random(seed)
+        self.sequence = 0
+        self.message_ids = iter(range(10**15, 10**16))
+
+    def _marker(self, kind):
+        self.sequence += 1
+        self.recorder.dispatched[self.sequence] = (kind, time.perf_counter())
+        return f"bench{self.sequence}x"
+
+    def _member(self):
+        guild = self.random.choice(self.guilds)
+        return guild, self.random.choice(list(guild.members.values()))
+
+    def message(self, cog):
+        guild, member = self._member()
+        words = " ".join(self.random.choices(WORDS, k=self.random.randint(3, 25)))
+        message = SimpleNamespace(
+            id=next(self.message_ids),
+            content=f"{words} {self._marker('message')}",
+            author=member,
+            guild=guild,
+            channel=self.random.choice(guild.chat_channels),
+            attachments=[],
+        )
+        return cog.on_message(message)
+
+    def voice(self, cog):
+        guild, member = self._member()
+        channel = SimpleNamespace(name=f"voice {self._marker('voice')}", id=guild.id * 1000 + 99)
+        if member.voice:
+            before, after = SimpleNamespace(channel=member.voice), SimpleNamespace(channel=None)
+            member.voice = None
+        else:
+            before, after = SimpleNamespace(channel=None), SimpleNamespace(channel=channel)
+            member.voice = channel
+        return cog.on_voice_state_update(member, before, after)
+
+    def presence(self, cog):
+        guild, member = self._member()
+        before = member.snapshot()
+        if self.random.random() < 0.5:
+            member.status = self.random.choice((discord.Status.online, discord.Status.idle, discord.Status.dnd))
+        else:
+            member.activity = discord.Game(name=f"{self.random.choice(GAMES)} {self._marker('presence')}")
+        return cog.on_presence_update(before, member)
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        kind, _, weight = part.partition("=")
+        mix[kind.strip()] = float(weight)
+    return mix
+
+
+def percentile(values, fraction):
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+# --- Runner ----------------------------------------------------------------
+
+async def run(args):
+    recorder = Recorder(args.send_latency / 1000)
+    guilds = [FakeGuild(guild_id, recorder) for guild_id in range(1, args.guilds + 1)]
+    for guild in guilds:
+        for index in range(args.users):
+            user_id = guild.id * 100000 + index
+            guild.members[user_id] = FakeMember(user_id, guild)
+            thread = FakeThread(guild.id * 100000 + 50000 + index, guild, recorder)
+            guild.threads[thread.id] = thread
+            guild.log_channel.threads.append(thread)
+
+    bot = FakeBot(guilds)
+    data_path = Path(tempfile.mkdtemp(prefix="usertracker-bench-"))
+    usertracker_module.Config = CountingConfig
+    usertracker_module.cog_data_path = lambda cog: data_path
+
+    cog = usertracker_module.UserTracker(bot)
+    for guild in guilds:
+        data = cog.config.guild_data[guild.id]
+        data["tracked_users"] = list(guild.members)
+        data["log_channel"] = guild.log_channel.id
+        data["user_threads"] = {str(member_id): guild.threads[guild.id * 100000 + 50000 + index].id
+                                for index, member_id in enumerate(guild.members)}
+        data["main_message_id"] = 1
+    cog.config.global_data["presence_quiet_period"] = args.presence_quiet
+    await cog.cog_load()
+    if not args.discord_limits:
+        cog.rate_limiter = cog.writer.rate_limiter = DestinationRateLimiter(route_limit=(10**9, 1.0), global_limit=(10**9, 1.0))
+    cog.config.counter.reads.clear()
+    cog.config.counter.writes.clear()
+
+    factory = EventFactory(guilds, recorder, args.seed)
+    mix = parse_mix(args.mix)
+    kinds, weights = list(mix), list(mix.values())
+    interval = 1 / args.rate if args.rate else 0
+    handlers = []
+
+    started = time.perf_counter()
+    for index in range(args.events):
+        kind = factory.random.choices(kinds, weights)[0]
+        # discord.py runs every listener call as its own task
+        handlers.append(asyncio.create_task(getattr(factory, kind)(cog)))
+        if interval:
+            await asyncio.sleep(max(0, started + (index + 1) * interval - time.perf_counter()))
+        elif index % 100 == 99:
+            await asyncio.sleep(0)
+    dispatched = time.perf_counter()
+    await asyncio.gather(*handlers)
+    handled = time.perf_counter()
+
+    # Let open presence windows close naturally, then drain the writer
+    await asyncio.sleep(args.presence_quiet + 0.1)
+    await cog.presence.close()
+    await cog.writer.close()
+    finished = recorder.last_send or time.perf_counter()
+    await cog.cog_unload()
+
+    counter = cog.config.counter
+    lines = [
+        f"UserTracker ingest benchmark: {args.events} events across {args.guilds} guilds x {args.users} users "
+        f"(mix {args.mix}, rate {'unbounded' if not args.rate else f'{args.rate}/s'}, "
+        f"send latency {args.send_latency:g} ms, {'Discord rate limits' if args.discord_limits else 'no rate limits'})",
+        f"  dispatch:          {dispatched - started:8.3f} s",
+        f"  listeners done:    {handled - started:8.3f} s  -> {args.events / (handled - started):10.1f} events/s handled",
+        f"  last embed sent:   {finished - started:8.3f} s  -> {args.events / (finished - started):10.1f} events/s end to end",
+        f"  thread messages:   {recorder.messages} ({recorder.embeds} embeds, "
+        f"{recorder.embeds / recorder.messages if recorder.messages else 0:.1f} per message), main message edits: {recorder.edits}",
+    ]
+    for kind in kinds:
+        latencies = recorder.latencies.get(kind, [])
+        if latencies:
+            lines.append(
+                f"  {kind:<9} latency:  p50 {percentile(latencies, 0.5) * 1000:8.1f} ms | "
+                f"p99 {percentile(latencies, 0.99) * 1000:8.1f} ms | mean {statistics.mean(latencies) * 1000:8.1f} ms "
+                f"({len(latencies)} logged)"
+            )
+    presence = cog.presence.stats()
+    lines.append(f"  presence:          {presence['events']} updates -> {presence['logged']} entries ({presence['suppressed']} suppressed)")
+    lines.append(
+        f"  Config I/O:        {sum(counter.reads.values())} reads, {sum(counter.writes.values())} writes "
+        f"({sum(counter.reads.values()) / args.events:.2f} / {sum(counter.writes.values()) / args.events:.2f} per event)"
+    )
+    for key, count in (counter.reads + counter.writes).most_common(6):
+        lines.append(f"    {key:<32} {counter.reads[key]:>7} reads {counter.writes[key]:>7} writes")
+
+    report = "\n".join(lines)
+    print(report)
+    if args.output:
+        Path(args.output).write_text(report + "\n", encoding="utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, default=5000, help="number of gateway events to feed")
+    parser.add_argument("--guilds", type=int, default=3)
+    parser.add_argument("--users", type=int, default=20, help="tracked users per guild")
+    parser.add_argument("--mix", default="message=0.8,voice=0.1,presence=0.1", help="event weights by kind")
+    parser.add_argument("--rate", type=float, default=0, help="events per second to dispatch (0 = as fast as possible)")
+    parser.add_argument("--send-latency", type=float, default=0, help="simulated Discord API round trip in ms")
+    parser.add_argument("--discord-limits", action="store_true", help="keep Discord's per-channel and global rate limits")
+    parser.add_argument("--presence-quiet", type=float, default=0.2, help="presence coalescing quiet period in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="also write the report to this file")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import unittest
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+try:
+    import discord
+
+    from RobustEvents.embed_refresher import EmbedRefresher, embed_fingerprint
+except ImportError as e:  # The cog's requirements (Red, pytz, ...) aren't installed
+    raise unittest.SkipTest(f"RobustEvents requirements not installed: {e}")
+
+KEY = (1, "event")
+
+
+def info_embed(starts="in 2 hours", attendees=3, timestamp=None):
+    embed = discord.Embed(title="📅 Raid night", timestamp=timestamp or datetime.now(timezone.utc))
+    embed.add_field(name="Starts", value=starts)
+    embed.add_field(name="Attendees", value=str(attendees))
+    return embed
+
+
+class FakeChannel:
+    """Records edits made through get_partial_message, or raises ``error`` for them."""
+
+    def __init__(self, error=None):
+        self.error = error
+        self.edits = []
+
+    def get_partial_message(self, message_id):
+        async def edit(embed):
+            if self.error:
+                raise self.error
+            self.edits.append((message_id, embed))
+        return SimpleNamespace(edit=edit)
+
+
+class TestFingerprint(unittest.TestCase):
+
+    def test_render_time_ignored(self):
+        self.assertEqual(embed_fingerprint(info_embed(timestamp=datetime(2026, 1, 1, tzinfo=timezone.utc))),
+                         embed_fingerprint(info_embed(timestamp=datetime(2026, 1, 2, tzinfo=timezone.utc))))
+
+    def test_content_changes_detected(self):
+        self.assertNotEqual(embed_fingerprint(info_embed()), embed_fingerprint(info_embed(starts="in 1 hour")))
+        self.assertNotEqual(embed_fingerprint(info_embed()), embed_fingerprint(info_embed(attendees=4)))
+
+
+class TestEmbedRefresher(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.refresher = EmbedRefresher(interval=300)
+
+    def test_changed(self):
+        self.assertTrue(self.refresher.changed(KEY, info_embed()))
+        self.refresher.record(KEY, info_embed())
+        self.assertFalse(self.refresher.changed(KEY, info_embed()))
+        self.assertTrue(self.refresher.changed(KEY, info_embed(attendees=4)))
+        self.refresher.forget(KEY)
+        self.assertTrue(self.refresher.changed(KEY, info_embed()))
+
+    async def test_edits_only_changes(self):
+        channel = FakeChannel()
+        self.assertTrue(await self.refresher.edit(KEY, channel, 10, info_embed()))
+        self.assertTrue(await self.refresher.edit(KEY, channel, 10, info_embed()))
+        self.assertTrue(await self.refresher.edit(KEY, channel, 10, info_embed(starts="in 1 hour")))
+        self.assertEqual(len(channel.edits), 2)
+        self.assertEqual(self.refresher.stats(), {"tracked": 1, "edits": 2, "skipped": 1, "missing": 0})
+
+    async def test_missing_message_forgotten(self):
+        self.refresher.record(KEY, info_embed())
+        channel = FakeChannel(discord.NotFound(SimpleNamespace(status=404, reason="Not Found"), "Unknown Message"))
+        self.assertFalse(await self.refresher.edit(KEY, channel, 10, info_embed(attendees=4)))
+        self.assertEqual(self.refresher.stats()["tracked"], 0)
+        self.assertEqual(self.refresher.missing, 1)
+
+    def test_spacing(self):
+        self.assertEqual(self.refresher.spacing(0), 0)
+        self.assertEqual(self.refresher.spacing(2), 10.0)  # Capped at max_spacing
+        self.assertAlmostEqual(self.refresher.spacing(100), 2.4)
+
+
+if __name__ == '__main__':
+    unittest.main()
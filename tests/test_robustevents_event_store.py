@@ -0,0 +1,96 @@
+import copy
+import unittest
+from types import SimpleNamespace
+
+try:
+    from RobustEvents.event_store import EventStore
+except ImportError as e:  # The cog's requirements (Red, pytz, ...) aren't installed
+    raise unittest.SkipTest(f"RobustEvents requirements not installed: {e}")
+
+GUILD = SimpleNamespace(id=1)
+
+
+class FakeEvents:
+    """The ``events`` value of one guild, with the Config calls EventStore makes."""
+
+    def __init__(self, data):
+        self.data = data
+
+    async def __call__(self):
+        # Config hands out copies, never its own storage
+        return copy.deepcopy(self.data)
+
+    async def get_raw(self, event_id, default=None):
+        return copy.deepcopy(self.data.get(event_id, default))
+
+    async def set_raw(self, event_id, value):
+        self.data[event_id] = copy.deepcopy(value)
+
+    async def clear_raw(self, event_id):
+        del self.data[event_id]
+
+
+class FakeConfig:
+    """Guild-scoped ``events`` storage standing in for Red's Config."""
+
+    def __init__(self):
+        self.guilds = {}
+
+    def guild(self, guild):
+        return SimpleNamespace(events=FakeEvents(self.guilds.setdefault(guild.id, {})))
+
+
+def event(name="Raid night", time="2026-10-20 20:00"):
+    return {"name": name, "time": time, "description": "", "notifications": [15]}
+
+
+class TestEventStore(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.config = FakeConfig()
+        self.store = EventStore(self.config)
+
+    async def test_put_then_load(self):
+        await self.store.put(GUILD, "raid", event())
+        self.assertEqual(self.config.guilds[GUILD.id], {"raid": event()})
+
+        # A fresh store (e.g. after a reload) reads back exactly what was cached
+        reloaded = EventStore(self.config)
+        self.assertEqual(await reloaded.load(GUILD), self.store.events[GUILD.id])
+        self.assertEqual(reloaded.get(GUILD.id, "raid"), event())
+
+    async def test_delete_removes_cache_entry_and_raw_key(self):
+        await self.store.put(GUILD, "raid", event())
+        await self.store.put(GUILD, "movie", event("Movie night"))
+        self.assertTrue(await self.store.delete(GUILD, "raid"))
+        self.assertIsNone(self.store.get(GUILD.id, "raid"))
+        self.assertEqual(self.store.version_of(GUILD.id, "raid"), 0)
+        self.assertEqual(list(self.config.guilds[GUILD.id]), ["movie"])
+        self.assertFalse(await self.store.delete(GUILD, "raid"))
+
+    async def test_update_writes_merged_event(self):
+        await self.store.put(GUILD, "raid", event())
+        version = self.store.version_of(GUILD.id, "raid")
+        updated = await self.store.update(GUILD, "raid", {"time": "2026-10-21 20:00"})
+        self.assertEqual(updated, event(time="2026-10-21 20:00"))
+        self.assertEqual(self.config.guilds[GUILD.id]["raid"], updated)
+        self.assertGreater(self.store.version_of(GUILD.id, "raid"), version)
+        self.assertIsNone(await self.store.update(GUILD, "missing", {"time": "2026-10-21 20:00"}))
+
+    async def test_refresh_picks_up_outside_changes(self):
+        await self.store.put(GUILD, "raid", event())
+        self.config.guilds[GUILD.id]["raid"] = event(name="Raid night (moved)")
+        self.assertEqual((await self.store.refresh(GUILD, "raid"))["name"], "Raid night (moved)")
+
+        del self.config.guilds[GUILD.id]["raid"]
+        self.assertIsNone(await self.store.refresh(GUILD, "raid"))
+        self.assertIsNone(self.store.get(GUILD.id, "raid"))
+
+    async def test_stats(self):
+        await self.store.put(GUILD, "raid", event())
+        await self.store.load(GUILD)
+        self.assertEqual(self.store.stats(), {"guilds": 1, "events": 1, "version": 2, "reads": 1, "writes": 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+from datetime import datetime
+
+try:
+    import pytz
+
+    from RobustEvents.event_times import event_end, event_start, event_zone, from_epoch, migrate_event, migrate_reminder, to_epoch
+except ImportError as e:  # The cog's requirements (Red, pytz, ...) aren't installed
+    raise unittest.SkipTest(f"RobustEvents requirements not installed: {e}")
+
+BERLIN = pytz.timezone("Europe/Berlin")
+
+
+class TestMigrateEvent(unittest.TestCase):
+
+    def version_1(self, **changes):
+        event = {
+            'name': "Raid night",
+            'time1': BERLIN.localize(datetime(2026, 3, 28, 20)).isoformat(),
+            'time2': BERLIN.localize(datetime(2026, 3, 28, 23)).isoformat(),
+            'repeat': 'weekly',
+            'notifications': [10, 60],
+        }
+        event.update(changes)
+        return event
+
+    def test_iso_times_become_epochs(self):
+        event = migrate_event(self.version_1(), "Europe/Berlin")
+        self.assertNotIn('time1', event)
+        self.assertNotIn('time2', event)
+        self.assertEqual(event['start'], to_epoch(datetime(2026, 3, 28, 19, tzinfo=pytz.UTC)))
+        self.assertEqual(event['end'], event['start'] + 3 * 3600)
+        self.assertIsNone(event['series_start'])
+        self.assertIsNone(event['series_end'])
+        self.assertEqual(event['timezone'], "Europe/Berlin")
+        self.assertEqual(event['notifications'], [10, 60])
+
+    def test_offset_is_kept_across_dst(self):
+        # The stored offset decides the instant, whatever the zone's offset is when migrating
+        event = migrate_event(self.version_1(time1="2026-07-01T20:00:00+02:00", time2=None), "Europe/Berlin")
+        self.assertEqual(event_start(event, BERLIN).strftime("%H:%M %Z"), "20:00 CEST")
+        self.assertIsNone(event['end'])
+        self.assertIsNone(event_end(event))
+
+    def test_series_bounds(self):
+        event = migrate_event(self.version_1(series_start="2026-01-01T20:00:00+01:00",
+                                             series_end="2026-12-31T20:00:00+01:00"), "Europe/Berlin")
+        self.assertEqual(from_epoch(event['series_start'], BERLIN), BERLIN.localize(datetime(2026, 1, 1, 20)))
+        self.assertEqual(from_epoch(event['series_end'], BERLIN), BERLIN.localize(datetime(2026, 12, 31, 20)))
+
+    def test_existing_zone_kept(self):
+        event = migrate_event(self.version_1(timezone="America/New_York"), "Europe/Berlin")
+        self.assertEqual(event_zone(event).zone, "America/New_York")
+
+    def test_version_2_untouched(self):
+        event = {'name': "Raid night", 'start': 1774724400, 'end': None, 'timezone': "Europe/Berlin"}
+        self.assertEqual(migrate_event(dict(event), "UTC"), event)
+
+    def test_idempotent(self):
+        once = migrate_event(self.version_1(), "Europe/Berlin")
+        self.assertEqual(migrate_event(dict(once), "Europe/Berlin"), once)
+
+
+class TestMigrateReminder(unittest.TestCase):
+
+    def test_iso_string(self):
+        self.assertEqual(migrate_reminder("2026-03-28T18:50:00+00:00"),
+                         to_epoch(datetime(2026, 3, 28, 18, 50, tzinfo=pytz.UTC)))
+
+    def test_already_epoch(self):
+        self.assertEqual(migrate_reminder(1774723800), 1774723800)
+        self.assertEqual(migrate_reminder(1774723800.0), 1774723800)
+
+
+class TestEpochs(unittest.TestCase):
+
+    def test_round_trip(self):
+        moment = BERLIN.localize(datetime(2026, 10, 25, 2, 30), is_dst=False)
+        self.assertEqual(from_epoch(to_epoch(moment), BERLIN), moment)
+
+    def test_missing_zone_is_utc(self):
+        self.assertEqual(event_zone({}).zone, "UTC")
+        self.assertIsNone(from_epoch(None))
+
+
+if __name__ == '__main__':
+    unittest.main()
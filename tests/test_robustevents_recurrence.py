@@ -0,0 +1,82 @@
+import unittest
+from datetime import datetime, timedelta
+
+try:
+    import pytz
+
+    from RobustEvents.recurrence import Recurrence, compile_rule
+except ImportError as e:  # The cog's requirements (Red, pytz, ...) aren't installed
+    raise unittest.SkipTest(f"RobustEvents requirements not installed: {e}")
+
+NEW_YORK = pytz.timezone("America/New_York")
+
+
+def local(tz, *args):
+    return tz.localize(datetime(*args)).astimezone(pytz.UTC)
+
+
+def wall_clock(occurrences, tz):
+    return [start.astimezone(tz).strftime("%Y-%m-%d %H:%M %Z") for start, _ in occurrences]
+
+
+class TestCompileRule(unittest.TestCase):
+
+    def test_month_end_clamps(self):
+        rule = compile_rule('monthly', datetime(2026, 1, 31, 12))
+        self.assertEqual([occurrence.day for occurrence in rule[:4]], [31, 28, 31, 30])
+
+    def test_yearly_leap_day(self):
+        rule = compile_rule('yearly', datetime(2024, 2, 29, 9))
+        self.assertEqual([occurrence.date().isoformat() for occurrence in rule[:5]],
+                         ["2024-02-29", "2025-02-28", "2026-02-28", "2027-02-28", "2028-02-29"])
+
+    def test_early_month_days_unchanged(self):
+        rule = compile_rule('monthly', datetime(2026, 1, 15, 12))
+        self.assertEqual({occurrence.day for occurrence in rule[:12]}, {15})
+
+
+class TestRecurrence(unittest.TestCase):
+
+    def test_weekly_keeps_wall_clock_across_spring_forward(self):
+        # DST starts in New York on 2026-03-08
+        recurrence = Recurrence('weekly', local(NEW_YORK, 2026, 3, 1, 19), None, NEW_YORK)
+        occurrences = recurrence.upcoming(local(NEW_YORK, 2026, 2, 28, 0), 3)
+        self.assertEqual(wall_clock(occurrences, NEW_YORK),
+                         ["2026-03-01 19:00 EST", "2026-03-08 19:00 EDT", "2026-03-15 19:00 EDT"])
+        self.assertEqual(occurrences[1][0] - occurrences[0][0], timedelta(days=7, hours=-1))
+
+    def test_weekly_keeps_wall_clock_across_fall_back(self):
+        # DST ends in New York on 2026-11-01
+        recurrence = Recurrence('weekly', local(NEW_YORK, 2026, 10, 25, 19), None, NEW_YORK)
+        occurrences = recurrence.between(local(NEW_YORK, 2026, 10, 20, 0), local(NEW_YORK, 2026, 11, 10, 0))
+        self.assertEqual(wall_clock(occurrences, NEW_YORK),
+                         ["2026-10-25 19:00 EDT", "2026-11-01 19:00 EST", "2026-11-08 19:00 EST"])
+
+    def test_end_keeps_wall_clock_duration(self):
+        recurrence = Recurrence('daily', local(NEW_YORK, 2026, 3, 7, 19), local(NEW_YORK, 2026, 3, 7, 21), NEW_YORK)
+        start, end = recurrence.after(local(NEW_YORK, 2026, 3, 7, 20))
+        self.assertEqual(start.astimezone(NEW_YORK).strftime("%d %H:%M %Z"), "08 19:00 EDT")
+        self.assertEqual(end.astimezone(NEW_YORK).strftime("%d %H:%M %Z"), "08 21:00 EDT")
+
+    def test_time_in_dst_gap_moves_forward(self):
+        # 02:30 doesn't exist on 2026-03-08 in New York
+        recurrence = Recurrence('daily', local(NEW_YORK, 2026, 3, 7, 2, 30), None, NEW_YORK)
+        start, _ = recurrence.after(local(NEW_YORK, 2026, 3, 7, 12))
+        self.assertEqual(start, datetime(2026, 3, 8, 7, 30, tzinfo=pytz.UTC))
+
+    def test_after_is_strict_and_walks_past_the_cache(self):
+        start = local(NEW_YORK, 2026, 1, 1, 9)
+        recurrence = Recurrence('daily', start, None, NEW_YORK)
+        self.assertEqual(recurrence.after(start)[0], local(NEW_YORK, 2026, 1, 2, 9))
+        occurrences = recurrence.upcoming(start, 40)
+        self.assertEqual(len(occurrences), 40)
+        self.assertEqual(occurrences[-1][0], local(NEW_YORK, 2026, 2, 10, 9))
+
+    def test_between_is_half_open(self):
+        recurrence = Recurrence('daily', local(NEW_YORK, 2026, 1, 1, 9), None, NEW_YORK)
+        occurrences = recurrence.between(local(NEW_YORK, 2026, 1, 3, 9), local(NEW_YORK, 2026, 1, 5, 9))
+        self.assertEqual(wall_clock(occurrences, NEW_YORK), ["2026-01-03 09:00 EST", "2026-01-04 09:00 EST"])
+
+
+if __name__ == '__main__':
+    unittest.main()
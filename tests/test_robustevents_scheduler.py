@@ -0,0 +1,92 @@
+import asyncio
+import time
+import unittest
+
+try:
+    from RobustEvents.scheduler import TimerScheduler
+except ImportError as e:  # The cog's requirements (Red, pytz, ...) aren't installed
+    raise unittest.SkipTest(f"RobustEvents requirements not installed: {e}")
+
+
+class TestTimerScheduler(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.fired = []
+        self.scheduler = TimerScheduler(self.fire)
+
+    async def asyncTearDown(self):
+        self.scheduler.close()
+
+    async def fire(self, kind, key, payload):
+        self.fired.append((kind, key, payload))
+
+    async def settle(self, delay=0.05):
+        await asyncio.sleep(delay)
+
+    async def test_fires_in_time_order(self):
+        now = time.time()
+        self.scheduler.schedule("late", now - 1, "event", 3)
+        self.scheduler.schedule("early", now - 3, "notification", 1)
+        self.scheduler.schedule("middle", now - 2, "reminder", 2)
+        await self.settle()
+        self.assertEqual([payload for _, _, payload in self.fired], [1, 2, 3])
+        self.assertEqual(self.scheduler.stats()["fired"], 3)
+        self.assertIsNone(self.scheduler.next_fire_time())
+
+    async def test_equal_times_fire_in_schedule_order(self):
+        fire_time = time.time() - 1
+        for key in ("a", "b", "c"):
+            self.scheduler.schedule(key, fire_time, "event")
+        await self.settle()
+        self.assertEqual([key for _, key, _ in self.fired], ["a", "b", "c"])
+
+    async def test_cancel(self):
+        now = time.time()
+        self.scheduler.schedule("kept", now + 0.05, "event")
+        self.scheduler.schedule("dropped", now + 0.02, "event")
+        self.assertTrue(self.scheduler.cancel("dropped"))
+        self.assertFalse(self.scheduler.cancel("dropped"))
+        self.assertIsNone(self.scheduler.pending("dropped"))
+        self.assertAlmostEqual(self.scheduler.next_fire_time(), now + 0.05)
+        await self.settle(0.15)
+        self.assertEqual([key for _, key, _ in self.fired], ["kept"])
+
+    async def test_cancel_prefix(self):
+        future = time.time() + 3600
+        for key in ("1:a", "1:a:reminder:5", "1:b", "2:a"):
+            self.scheduler.schedule(key, future, "event")
+        self.assertEqual(self.scheduler.cancel_prefix("1:a"), 2)
+        self.assertEqual(sorted(self.scheduler.entries), ["1:b", "2:a"])
+
+    async def test_reschedule_replaces(self):
+        now = time.time()
+        self.scheduler.schedule("event", now + 3600, "event", "old")
+        self.scheduler.schedule("event", now - 1, "event", "new")
+        self.assertEqual(self.scheduler.stats()["queued"], 1)
+        await self.settle()
+        self.assertEqual(self.fired, [("event", "event", "new")])
+
+    async def test_earlier_entry_wakes_sleeper(self):
+        self.scheduler.schedule("later", time.time() + 3600, "event")
+        await self.settle(0.01)
+        self.scheduler.schedule("sooner", time.time() + 0.02, "event")
+        await self.settle(0.1)
+        self.assertEqual([key for _, key, _ in self.fired], ["sooner"])
+
+    async def test_callback_errors_do_not_stop_the_sleeper(self):
+        async def fail(kind, key, payload):
+            if key == "broken":
+                raise RuntimeError("boom")
+            self.fired.append(key)
+
+        self.scheduler.callback = fail
+        now = time.time()
+        with self.assertLogs(self.scheduler.logger, "ERROR"):
+            self.scheduler.schedule("broken", now - 2, "event")
+            self.scheduler.schedule("fine", now - 1, "event")
+            await self.settle()
+        self.assertEqual(self.fired, ["fine"])
+
+
+if __name__ == '__main__':
+    unittest.main()
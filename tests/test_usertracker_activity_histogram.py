@@ -0,0 +1,96 @@
+import tempfile
+import time
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import numpy as np
+
+    from UserTracker.activity_histogram import DAYS, HOURS, ActivityHistogram, HistogramIndex
+    from UserTracker.activity_store import ActivityStore
+except ImportError as e:  # The cog's requirements (Red, numpy, ...) aren't installed
+    raise unittest.SkipTest(f"UserTracker requirements not installed: {e}")
+
+GUILD_ID = 1
+USER_ID = 2
+
+
+class TestActivityHistogram(unittest.TestCase):
+
+    def test_roll_ages_rows(self):
+        histogram = ActivityHistogram(day_ordinal=datetime(2026, 3, 10).toordinal())
+        self.assertTrue(histogram.add(datetime(2026, 3, 10, 14)))
+        self.assertTrue(histogram.add(datetime(2026, 3, 9, 8)))
+        histogram.roll_to(datetime(2026, 3, 12).toordinal())
+        self.assertEqual(histogram.counts[2, 14], 1)
+        self.assertEqual(histogram.counts[3, 8], 1)
+        self.assertEqual(histogram.counts.sum(), 2)
+
+    def test_outside_window(self):
+        histogram = ActivityHistogram(day_ordinal=datetime(2026, 3, 10).toordinal())
+        self.assertFalse(histogram.add(datetime(2026, 3, 10 - DAYS, 12)))
+        self.assertFalse(histogram.counts.any())
+
+    def test_roll_past_window_clears(self):
+        histogram = ActivityHistogram(day_ordinal=datetime(2026, 3, 10).toordinal())
+        histogram.add(datetime(2026, 3, 10, 1))
+        histogram.roll_to(datetime(2026, 3, 10 + DAYS).toordinal())
+        self.assertFalse(histogram.counts.any())
+
+    def test_blob_round_trip(self):
+        histogram = ActivityHistogram(day_ordinal=5)
+        histogram.counts[1, 2] = 7
+        restored = ActivityHistogram.from_blob(histogram.to_blob(), 5)
+        np.testing.assert_array_equal(restored.counts, histogram.counts)
+        self.assertEqual(restored.counts.shape, (DAYS, HOURS))
+
+
+class TestHistogramIndex(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = ActivityStore(Path(self.directory.name) / "activity.db")
+        self.index = HistogramIndex(self.store, lambda guild_id: "UTC")
+
+    async def asyncTearDown(self):
+        self.store.close()
+        self.directory.cleanup()
+
+    async def record(self, activity_type, timestamp, details=""):
+        await self.store.record_many([{"guild_id": GUILD_ID, "user_id": USER_ID, "activity_type": activity_type,
+                                       "timestamp": timestamp, "details": details}])
+
+    async def test_backfill_older_than_saved_histogram(self):
+        now = time.time()
+        await self.record("Status Change", now - 60)
+        await self.index.get(GUILD_ID, USER_ID)
+        await self.index.persist()
+
+        index = HistogramIndex(self.store, lambda guild_id: "UTC")
+        backfill = [now - 2 * 86400, now + 60]
+        for timestamp in backfill:
+            await self.record("Message Sent", timestamp)
+        await index.record_many(GUILD_ID, USER_ID, backfill)
+        self.assertEqual((await index.get(GUILD_ID, USER_ID)).sum(), 3)
+
+    async def test_backfill_into_loaded_histogram(self):
+        now = time.time()
+        await self.index.get(GUILD_ID, USER_ID)
+        await self.record("Message Sent", now - 3600)
+        await self.index.record_many(GUILD_ID, USER_ID, [now - 3600])
+        self.assertEqual((await self.index.get(GUILD_ID, USER_ID)).sum(), 1)
+
+    async def test_latest_details_per_type(self):
+        await self.record("Status Change", 100, "**New status:** idle")
+        await self.record("Status Change", 200, "**New status:** online")
+        await self.record("Voice Activity", 150, "**Action:** Joined voice channel General")
+        latest = await self.store.latest_details(GUILD_ID, USER_ID, ["Status Change", "Voice Activity", "Activity Change"])
+        self.assertEqual(latest, {
+            "Status Change": "**New status:** online",
+            "Voice Activity": "**Action:** Joined voice channel General",
+        })
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+try:
+    from UserTracker.activity_store import ActivityStore
+except ImportError as e:  # The cog's requirements (Red, numpy, ...) aren't installed
+    raise unittest.SkipTest(f"UserTracker requirements not installed: {e}")
+
+GUILD_ID = 1
+USER_ID = 2
+OTHER_USER_ID = 3
+
+
+def activity(user_id, timestamp, activity_type="Status Change", guild_id=GUILD_ID, **fields):
+    return {"guild_id": guild_id, "user_id": user_id, "activity_type": activity_type,
+            "timestamp": timestamp, "details": "", **fields}
+
+
+class ActivityStoreTestCase(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = ActivityStore(Path(self.directory.name) / "activity.db")
+
+    async def asyncTearDown(self):
+        self.store.close()
+        self.directory.cleanup()
+
+
+class TestRecordMany(ActivityStoreTestCase):
+
+    async def test_duplicate_messages_ignored(self):
+        message = activity(USER_ID, 100, "Message Sent", message_id=10, content="hi")
+        self.assertEqual(await self.store.record_many([message, activity(USER_ID, 101)]), 2)
+        self.assertEqual(await self.store.record_many([message, activity(USER_ID, 102)]), 1)
+        self.assertEqual(await self.store.existing_message_ids(GUILD_ID, USER_ID, [10, 11]), {10})
+
+
+class TestActivitiesAfter(ActivityStoreTestCase):
+
+    async def page_through(self, user_id, limit, until=None):
+        pages, cursor = [], None
+        while True:
+            rows = await self.store.activities_after(GUILD_ID, user_id, cursor, until=until, limit=limit)
+            if not rows:
+                return pages
+            pages.append([row["timestamp"] for row in rows])
+            cursor = (rows[-1]["timestamp"], rows[-1]["id"])
+
+    async def test_pages_cover_everything_once(self):
+        # Several rows share a timestamp, so the cursor has to break ties on the row ID
+        timestamps = [100, 100, 100, 101, 102, 102, 103]
+        await self.store.record_many(activity(USER_ID, timestamp) for timestamp in timestamps)
+        pages = await self.page_through(USER_ID, limit=2)
+        self.assertEqual(pages, [[100, 100], [100, 101], [102, 102], [103]])
+
+    async def test_filters(self):
+        await self.store.record_many([
+            activity(USER_ID, 100), activity(OTHER_USER_ID, 101), activity(USER_ID, 102),
+            activity(USER_ID, 103, guild_id=GUILD_ID + 1), activity(USER_ID, 200),
+        ])
+        self.assertEqual(await self.page_through(USER_ID, limit=10, until=200), [[100, 102]])
+        self.assertEqual(await self.page_through(None, limit=10), [[100, 101, 102, 200]])
+
+    async def test_rows_added_behind_the_cursor_are_skipped(self):
+        await self.store.record_many([activity(USER_ID, 100), activity(USER_ID, 200)])
+        first = await self.store.activities_after(GUILD_ID, USER_ID, None, limit=1)
+        await self.store.record_many([activity(USER_ID, 50), activity(USER_ID, 150)])
+        rest = await self.store.activities_after(GUILD_ID, USER_ID, (first[0]["timestamp"], first[0]["id"]))
+        self.assertEqual([row["timestamp"] for row in rest], [150, 200])
+
+
+class TestSearch(ActivityStoreTestCase):
+
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        contents = ["Pancakes for breakfast again", "Who wants pancakes?", "The café opens at nine",
+                    "NEAR(pancakes) OR \"breakfast", "100% sure_thing"]
+        await self.store.record_many(
+            activity(USER_ID, 100 + index, "Message Sent", message_id=index + 1, content=content, channel_id=index % 2)
+            for index, content in enumerate(contents)
+        )
+        await self.store.record_many([activity(OTHER_USER_ID, 200, "Message Sent", message_id=99, content="pancakes")])
+
+    async def search(self, query, **filters):
+        return sorted(row["content"] for row in await self.store.search(GUILD_ID, USER_ID, query, **filters))
+
+    def test_terms(self):
+        self.assertEqual(ActivityStore.search_terms('"for breakfast" pan* OR "'),
+                         [("for breakfast", False), ("pan", True), ("OR", False)])
+
+    async def check_queries(self):
+        self.assertEqual(await self.search("pancakes"),
+                         ["NEAR(pancakes) OR \"breakfast", "Pancakes for breakfast again", "Who wants pancakes?"])
+        self.assertEqual(await self.search("pancakes breakfast", channel_id=0), ["Pancakes for breakfast again"])
+        self.assertEqual(await self.search('"for breakfast"'), ["Pancakes for breakfast again"])
+        self.assertEqual(await self.search("pancakes", since=101, until=103), ["Who wants pancakes?"])
+        self.assertEqual(await self.search("100%"), ["100% sure_thing"])
+        # FTS5 syntax in a query is matched as text, never parsed
+        self.assertEqual(await self.search('NEAR( "'), ["NEAR(pancakes) OR \"breakfast"])
+        self.assertEqual(await self.search("wants OR nine"), [])
+
+    async def test_full_text(self):
+        if not self.store.full_text_search:
+            self.skipTest("SQLite was built without FTS5")
+        await self.check_queries()
+        self.assertEqual(await self.search("pan*"),
+                         ["NEAR(pancakes) OR \"breakfast", "Pancakes for breakfast again", "Who wants pancakes?"])
+        self.assertEqual(await self.search("cafe"), ["The café opens at nine"])
+
+    async def test_like_fallback(self):
+        self.store.full_text_search = False
+        await self.check_queries()
+
+    async def test_deleted_messages_leave_the_index(self):
+        rows = await self.store.search(GUILD_ID, USER_ID, "wants")
+        await self.store.delete_activities([row["id"] for row in rows])
+        self.assertEqual(await self.search("wants"), [])
+        self.assertEqual(len(await self.search("pancakes")), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import asyncio
+import time
+import unittest
+from types import SimpleNamespace
+
+try:
+    import discord
+
+    from UserTracker.activity_writer import ActivityWriter, batch_embeds
+    from UserTracker.rate_limits import DestinationRateLimiter
+except ImportError as e:  # The cog's requirements (Red, numpy, ...) aren't installed
+    raise unittest.SkipTest(f"UserTracker requirements not installed: {e}")
+
+GUILD_ID = 1
+USER_ID = 2
+
+
+def embed(chars=10):
+    return discord.Embed(description="x" * chars)
+
+
+class FakeThread:
+    """Records the embeds of every message sent to it, or raises ``error`` instead."""
+
+    def __init__(self, thread_id=100, error=None):
+        self.id = thread_id
+        self.error = error
+        self.messages = []
+
+    async def send(self, embeds):
+        if self.error:
+            raise self.error
+        self.messages.append(embeds)
+
+
+class TestBatchEmbeds(unittest.TestCase):
+
+    def test_embed_count_limit(self):
+        self.assertEqual([len(batch) for batch in batch_embeds([embed() for _ in range(23)])], [10, 10, 3])
+
+    def test_character_limit(self):
+        # Three 2500 character embeds don't fit in one 6000 character message
+        self.assertEqual([len(batch) for batch in batch_embeds([embed(2500) for _ in range(3)])], [2, 1])
+
+
+class TestActivityWriter(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.limiter = DestinationRateLimiter(route_limit=(100, 1.0), global_limit=(100, 1.0))
+        self.flushed = []
+        self.writer = ActivityWriter(self.limiter, flush_delay=0.05, on_flush=self.on_flush)
+
+    async def asyncTearDown(self):
+        await self.writer.close()
+        self.limiter.close()
+
+    async def on_flush(self, thread, batch):
+        self.flushed.append(len(batch))
+
+    async def test_batches_within_flush_delay(self):
+        thread = FakeThread()
+        for _ in range(3):
+            await self.writer.enqueue(thread, [embed()], GUILD_ID, USER_ID)
+        await asyncio.sleep(0.01)
+        self.assertEqual(thread.messages, [])
+        await asyncio.sleep(0.1)
+        self.assertEqual([len(message) for message in thread.messages], [3])
+        self.assertEqual(self.flushed, [3])
+
+    async def test_full_batch_sent_without_waiting(self):
+        thread = FakeThread()
+        self.writer.flush_delay = 10
+        await self.writer.enqueue(thread, [embed() for _ in range(25)], GUILD_ID, USER_ID)
+        await asyncio.sleep(0.01)
+        # The five left over wait for the flush delay
+        self.assertEqual([len(message) for message in thread.messages], [10, 10])
+        self.assertEqual(self.writer.depth, 5)
+
+    async def test_character_limit_splits_messages(self):
+        thread = FakeThread()
+        await self.writer.enqueue(thread, [embed(2500) for _ in range(5)], GUILD_ID, USER_ID)
+        await asyncio.sleep(0.1)
+        self.assertEqual([len(message) for message in thread.messages], [2, 2, 1])
+        self.assertTrue(all(sum(len(item) for item in message) <= 6000 for message in thread.messages))
+
+    async def test_close_flushes_pending(self):
+        threads = [FakeThread(100), FakeThread(101)]
+        self.writer.flush_delay = 10
+        for thread in threads:
+            await self.writer.enqueue(thread, [embed(), embed()], GUILD_ID, USER_ID)
+        started = time.monotonic()
+        await self.writer.close()
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertEqual([[len(message) for message in thread.messages] for thread in threads], [[2], [2]])
+        self.assertEqual(self.writer.stats()["embeds_sent"], 4)
+        self.assertEqual(self.writer.depth, 0)
+
+    async def test_missing_thread_drops_queue(self):
+        thread = FakeThread(error=discord.NotFound(SimpleNamespace(status=404, reason="Not Found"), "Unknown Channel"))
+        await self.writer.enqueue(thread, [embed() for _ in range(12)], GUILD_ID, USER_ID)
+        await asyncio.sleep(0.01)
+        self.assertEqual(self.writer.stats()["failed_embeds"], 12)
+        self.assertEqual(self.writer.depth, 0)
+
+    async def test_discard(self):
+        thread = FakeThread()
+        await self.writer.enqueue(thread, [embed(), embed()], GUILD_ID, USER_ID)
+        self.assertEqual(self.writer.discard(thread.id), 2)
+        await asyncio.sleep(0.1)
+        self.assertEqual(thread.messages, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
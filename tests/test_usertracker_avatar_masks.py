@@ -0,0 +1,43 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+try:
+    from UserTracker.avatar_masks import AvatarMaskCache
+except ImportError as e:  # The cog's requirements (Red, numpy, ...) aren't installed
+    raise unittest.SkipTest(f"UserTracker requirements not installed: {e}")
+
+
+class TestAvatarMaskCache(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = AvatarMaskCache(Path(self.directory.name) / "masks", max_entries=2)
+
+    async def asyncTearDown(self):
+        self.directory.cleanup()
+
+    async def add(self, avatar_key, mtime):
+        path = await self.cache.prepare(avatar_key, 512)
+        path.write_bytes(b"mask")
+        os.utime(path, (mtime, mtime))
+
+    async def test_miss_then_hit(self):
+        self.assertIsNone(await self.cache.get("a", 512))
+        await self.add("a", 1000)
+        self.assertEqual(await self.cache.get("a", 512), self.cache.path("a", 512))
+        self.assertEqual(await self.cache.get("a", 256), None)
+        stats = await self.cache.stats()
+        self.assertEqual((stats["cached"], stats["cached_bytes"], stats["hits"], stats["misses"]), (1, 4, 1, 2))
+
+    async def test_least_recently_used_removed(self):
+        await self.add("a", 1000)
+        await self.add("b", 2000)
+        await self.cache.get("a", 512)  # Now newer than b
+        await self.add("c", 3000)
+        self.assertEqual(sorted(entry.name for entry in self.cache.directory.iterdir()), ["a_512.npz", "c_512.npz"])
+
+
+if __name__ == '__main__':
+    unittest.main()
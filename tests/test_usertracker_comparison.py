@@ -0,0 +1,64 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+try:
+    import numpy as np
+
+    from UserTracker.activity_store import ActivityStore
+    from UserTracker.comparison import SENTIMENT_BINS, sentiment_matrices, sentiment_summary
+except ImportError as e:  # The cog's requirements (Red, numpy, ...) aren't installed
+    raise unittest.SkipTest(f"UserTracker requirements not installed: {e}")
+
+# Real snowflakes are above 2**53; this one is not representable as a float64
+SNOWFLAKE = 356234524517597185
+OTHER_SNOWFLAKE = 356234524517597186
+
+
+class TestSentimentMatrices(unittest.TestCase):
+
+    def test_snowflake_user_ids(self):
+        self.assertNotEqual(int(float(SNOWFLAKE)), SNOWFLAKE)
+        rows = [(SNOWFLAKE, 9, 3, 2.7), (OTHER_SNOWFLAKE, 0, 2, -1.8), (SNOWFLAKE, 0, 1, -0.9)]
+        counts, sums = sentiment_matrices(rows, [OTHER_SNOWFLAKE, SNOWFLAKE])
+        self.assertEqual(counts.shape, (2, SENTIMENT_BINS))
+        self.assertEqual(counts[1, 9], 3)
+        self.assertEqual(counts[1, 0], 1)
+        self.assertEqual(counts[0, 0], 2)
+        self.assertAlmostEqual(sums[1].sum(), 1.8)
+        self.assertAlmostEqual(sums[0].sum(), -1.8)
+
+    def test_no_rows(self):
+        counts, sums = sentiment_matrices([], [SNOWFLAKE])
+        self.assertFalse(counts.any())
+        self.assertFalse(sums.any())
+
+
+class TestComparisonData(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = ActivityStore(Path(self.directory.name) / "activity.db")
+
+    async def asyncTearDown(self):
+        self.store.close()
+        self.directory.cleanup()
+
+    async def test_scored_messages_for_snowflake_users(self):
+        guild_id = 356234524517597000
+        scores = {SNOWFLAKE: [0.9, 0.5, -0.5], OTHER_SNOWFLAKE: [-0.8]}
+        await self.store.record_many(
+            {"guild_id": guild_id, "user_id": user_id, "activity_type": "Message Sent", "timestamp": 1000 + index,
+             "message_id": user_id + index, "content": "hi", "details": "", "sentiment": score}
+            for user_id, user_scores in scores.items() for index, score in enumerate(user_scores)
+        )
+        rows = await self.store.sentiment_counts(guild_id, [SNOWFLAKE, OTHER_SNOWFLAKE], 0, SENTIMENT_BINS)
+        counts, sums = sentiment_matrices(rows, [SNOWFLAKE, OTHER_SNOWFLAKE])
+        summary = sentiment_summary(counts, sums)
+        np.testing.assert_array_equal(summary["messages"], [3, 1])
+        np.testing.assert_allclose(summary["mean"], [0.3, -0.8])
+        np.testing.assert_allclose(summary["positive"], [2 / 3, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import asyncio
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+try:
+    from UserTracker.activity_store import ActivityStore
+    from UserTracker.inactivity import InactivityScheduler
+except ImportError as e:  # The cog's requirements (Red, numpy, ...) aren't installed
+    raise unittest.SkipTest(f"UserTracker requirements not installed: {e}")
+
+GUILD_ID = 1
+THRESHOLD = 3600
+
+
+class TestInactivityScheduler(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = ActivityStore(Path(self.directory.name) / "activity.db")
+        self.alerts = []
+        self.scheduler = self.make_scheduler()
+
+    async def asyncTearDown(self):
+        self.store.close()
+        self.directory.cleanup()
+
+    def make_scheduler(self):
+        async def on_inactive(guild_id, user_id, last_seen):
+            self.alerts.append((user_id, last_seen))
+        return InactivityScheduler(self.store, THRESHOLD, on_inactive)
+
+    async def test_alerts_once_per_inactive_stretch(self):
+        now = time.time()
+        self.scheduler.touch(GUILD_ID, 2, now - THRESHOLD - 10)
+        self.scheduler.touch(GUILD_ID, 3, now - 10)
+        await self.scheduler._fire_due()
+        await self.scheduler._fire_due()
+        self.assertEqual(self.alerts, [(2, now - THRESHOLD - 10)])
+
+        # Activity starts a new stretch, which alerts again once it runs out
+        self.scheduler.touch(GUILD_ID, 2, now - THRESHOLD - 5)
+        await self.scheduler._fire_due()
+        self.assertEqual(len(self.alerts), 2)
+
+    async def test_stale_entry_requeued_at_real_deadline(self):
+        now = time.time()
+        self.scheduler.touch(GUILD_ID, 2, now - THRESHOLD - 10)
+        self.scheduler.touch(GUILD_ID, 2, now - 10)
+        self.assertEqual(len(self.scheduler.heap), 1)
+        await self.scheduler._fire_due()
+        self.assertEqual(self.alerts, [])
+        self.assertAlmostEqual(self.scheduler.next_deadline, now - 10 + THRESHOLD)
+
+    async def test_older_touch_ignored(self):
+        now = time.time()
+        self.scheduler.touch(GUILD_ID, 2, now)
+        self.scheduler.touch(GUILD_ID, 2, now - THRESHOLD * 2)
+        self.assertEqual(self.scheduler.last_seen[(GUILD_ID, 2)], now)
+
+    async def test_forgotten_users_not_alerted(self):
+        self.scheduler.touch(GUILD_ID, 2, time.time() - THRESHOLD - 10)
+        self.scheduler.forget(GUILD_ID, 2)
+        await self.scheduler._fire_due()
+        self.assertEqual(self.alerts, [])
+
+    async def test_alerted_state_survives_reload(self):
+        now = time.time()
+        await self.store.record_many([{"guild_id": GUILD_ID, "user_id": user_id, "activity_type": "Status Change",
+                                       "timestamp": now - THRESHOLD - 10, "details": ""} for user_id in (2, 3, 4)])
+        tracked = lambda guild_id, user_id: user_id != 4
+        await self.scheduler.load(tracked)
+        self.assertEqual(sorted(self.scheduler.last_seen), [(GUILD_ID, 2), (GUILD_ID, 3)])
+        self.scheduler.touch(GUILD_ID, 3, now)
+        await self.scheduler._fire_due()
+        self.assertEqual([user_id for user_id, _ in self.alerts], [2])
+
+        reloaded = self.make_scheduler()
+        await reloaded.load(tracked)
+        await reloaded._fire_due()
+        self.assertEqual(len(self.alerts), 1)
+        self.assertIn((GUILD_ID, 2), reloaded.alerted)
+        self.assertEqual(reloaded.last_seen[(GUILD_ID, 3)], now)
+
+    async def test_run_wakes_for_an_earlier_deadline(self):
+        self.scheduler.touch(GUILD_ID, 2, time.time())
+        task = asyncio.create_task(self.scheduler.run())
+        await asyncio.sleep(0.01)
+        self.scheduler.touch(GUILD_ID, 3, time.time() - THRESHOLD + 0.02)
+        await asyncio.sleep(0.1)
+        task.cancel()
+        self.assertEqual([user_id for user_id, _ in self.alerts], [3])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import asyncio
+import unittest
+
+try:
+    from UserTracker.presence import PresenceCoalescer
+except ImportError as e:  # The cog's requirements (Red, numpy, ...) aren't installed
+    raise unittest.SkipTest(f"UserTracker requirements not installed: {e}")
+
+USER_ID = 10
+QUIET = 0.05
+
+
+class TestPresenceCoalescer(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.emitted = []
+        self.untracked = set()
+        self.coalescer = PresenceCoalescer(self.emit, quiet_period=QUIET, max_window=QUIET * 4)
+
+    async def asyncTearDown(self):
+        await self.coalescer.close()
+
+    async def emit(self, user_id, guild_ids, entries):
+        self.emitted.append((user_id, guild_ids, entries))
+        return guild_ids - self.untracked
+
+    def flap(self, guild_ids, statuses):
+        for before, after in zip(statuses, statuses[1:]):
+            for guild_id in guild_ids:
+                self.coalescer.observe(guild_id, USER_ID, before, None, after, None)
+
+    def assertCountsAddUp(self):
+        stats = self.coalescer.stats()
+        pending = sum(sum(window.guild_events.values()) for window in self.coalescer.windows.values())
+        self.assertEqual(stats["events"], stats["logged"] + stats["suppressed"] + pending)
+
+    async def test_single_change_logged_as_is(self):
+        self.flap([1], ["online", "idle"])
+        await asyncio.sleep(QUIET * 2)
+        self.assertEqual(self.emitted, [(USER_ID, {1}, [("Status Change", "**New status:** idle")])])
+        self.assertEqual(self.coalescer.stats()["suppressed"], 0)
+
+    async def test_flapping_merged_into_one_entry_per_guild(self):
+        self.flap([1, 2], ["online", "idle", "online", "dnd"])
+        self.assertEqual(self.emitted, [])
+        await asyncio.sleep(QUIET * 2)
+        [(user_id, guild_ids, entries)] = self.emitted
+        self.assertEqual(guild_ids, {1, 2})
+        self.assertEqual(entries[0][0], "Presence Summary")
+        self.assertIn("online → idle → online → dnd", entries[0][1])
+        # Six updates (three per guild) became two entries
+        self.assertEqual(self.coalescer.stats(), {"events": 6, "duplicates": 3, "logged": 2, "suppressed": 4, "open_windows": 0})
+        self.assertCountsAddUp()
+
+    async def test_unlogged_guild_counted_as_suppressed(self):
+        self.untracked.add(2)
+        self.flap([1, 2], ["online", "idle"])
+        await asyncio.sleep(QUIET * 2)
+        stats = self.coalescer.stats()
+        self.assertEqual((stats["logged"], stats["suppressed"]), (1, 1))
+        self.assertCountsAddUp()
+
+    async def test_quiet_period_extends_window(self):
+        self.coalescer.quiet_period, self.coalescer.max_window = 0.3, 10
+        self.flap([1], ["online", "idle"])
+        await asyncio.sleep(0.2)
+        self.flap([1], ["idle", "online"])
+        await asyncio.sleep(0.2)
+        self.assertEqual(self.emitted, [])
+        self.assertCountsAddUp()
+        await asyncio.sleep(0.3)
+        self.assertEqual(len(self.emitted), 1)
+
+    async def test_max_window_closes_busy_user(self):
+        statuses = ["online", "idle"]
+        for _ in range(12):
+            self.flap([1], statuses)
+            statuses.reverse()
+            await asyncio.sleep(QUIET / 2)
+        # Changes never paused for the quiet period, but the window still closed at its maximum length
+        self.assertGreaterEqual(len(self.emitted), 1)
+        self.assertCountsAddUp()
+
+    async def test_unchanged_update_without_window_ignored(self):
+        self.coalescer.observe(1, USER_ID, "online", None, "online", None)
+        self.assertEqual(self.coalescer.windows, {})
+        self.assertEqual(self.coalescer.stats()["suppressed"], 1)
+        self.assertCountsAddUp()
+
+    async def test_close_flushes_open_windows(self):
+        self.flap([1], ["online", "idle"])
+        await self.coalescer.close()
+        self.assertEqual(len(self.emitted), 1)
+        self.assertEqual(self.coalescer.stats()["open_windows"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
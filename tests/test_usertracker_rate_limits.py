@@ -0,0 +1,59 @@
+import asyncio
+import time
+import unittest
+
+try:
+    from UserTracker.rate_limits import DestinationRateLimiter, TokenBucket
+except ImportError as e:  # The cog's requirements (Red, numpy, ...) aren't installed
+    raise unittest.SkipTest(f"UserTracker requirements not installed: {e}")
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_delay_after_burst(self):
+        bucket = TokenBucket(2, 1.0)
+        for _ in range(2):
+            self.assertEqual(bucket.delay(), 0)
+            bucket.take()
+        self.assertAlmostEqual(bucket.delay(), 0.5, places=2)
+
+    def test_refill_is_capped(self):
+        bucket = TokenBucket(3, 1.0)
+        bucket.updated -= 60
+        bucket.delay()
+        self.assertEqual(bucket.tokens, 3)
+
+
+class TestDestinationRateLimiter(unittest.IsolatedAsyncioTestCase):
+
+    async def send(self, limiter, destination_id, guild_id, sent):
+        async with limiter.limit(destination_id, guild_id):
+            sent.append((guild_id, destination_id, time.monotonic()))
+
+    async def test_destinations_limited_independently(self):
+        limiter = DestinationRateLimiter(route_limit=(2, 0.2), global_limit=(100, 1.0))
+        sent = []
+        started = time.monotonic()
+        await asyncio.gather(*(self.send(limiter, destination_id, 1, sent) for destination_id in (1, 1, 1, 2, 2)))
+        by_destination = {destination_id: [at - started for _, d, at in sent if d == destination_id] for destination_id in (1, 2)}
+        # The third send to destination 1 waits for a refill; destination 2 is not held up by it
+        self.assertGreaterEqual(max(by_destination[1]), 0.09)
+        self.assertLess(max(by_destination[2]), 0.05)
+        self.assertEqual(limiter.stats()["acquired"], 5)
+        self.assertEqual(limiter.stats()["delayed"], 1)
+        limiter.close()
+
+    async def test_global_slots_rotate_between_guilds(self):
+        limiter = DestinationRateLimiter(route_limit=(100, 1.0), global_limit=(1, 0.02))
+        sent = []
+        # The first send takes the only token; everything after it queues for the global bucket
+        sends = [self.send(limiter, 100 + index, 1, sent) for index in range(4)]
+        sends += [self.send(limiter, 200 + index, 2, sent) for index in range(2)]
+        await asyncio.gather(*sends)
+        self.assertEqual([guild_id for guild_id, _, _ in sent], [1, 1, 2, 1, 2, 1])
+        self.assertEqual(limiter.stats()["waiting"], 0)
+        limiter.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+
+try:
+    import numpy as np
+
+    from UserTracker.rendering import ChartRenderer, lttb, rolling_mean
+except ImportError as e:  # The cog's requirements (Red, numpy, ...) aren't installed
+    raise unittest.SkipTest(f"UserTracker requirements not installed: {e}")
+
+
+class TestLttb(unittest.TestCase):
+
+    def test_keeps_endpoints_and_threshold_points(self):
+        rng = np.random.default_rng(0)
+        x = np.sort(rng.uniform(0, 1000, 500))
+        y = rng.normal(size=500)
+        for threshold in (3, 10, 137, 499):
+            selected = lttb(x, y, threshold)
+            self.assertEqual(len(selected), threshold)
+            self.assertEqual((selected[0], selected[-1]), (0, 499))
+            self.assertTrue(np.all(np.diff(selected) > 0))
+
+    def test_small_series_kept_whole(self):
+        x = np.arange(5.0)
+        np.testing.assert_array_equal(lttb(x, x, 5), np.arange(5))
+        np.testing.assert_array_equal(lttb(x, x, 50), np.arange(5))
+
+    def test_keeps_spike(self):
+        x = np.arange(100.0)
+        y = np.zeros(100)
+        y[42] = 10
+        self.assertIn(42, lttb(x, y, 10))
+
+
+class TestRollingMean(unittest.TestCase):
+
+    def test_matches_naive_window(self):
+        rng = np.random.default_rng(1)
+        timestamps = np.sort(rng.uniform(0, 10_000, 300))
+        values = rng.uniform(-1, 1, 300)
+        window = 600
+        naive = [values[:index + 1][timestamps[:index + 1] >= t - window].mean() for index, t in enumerate(timestamps)]
+        np.testing.assert_allclose(rolling_mean(timestamps, values, window), naive)
+
+
+class TestChartRenderer(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.renderer = ChartRenderer(max_workers=1, cache_size=2)
+
+    async def asyncTearDown(self):
+        self.renderer.close()
+
+    async def test_cache_hits_and_misses(self):
+        self.assertEqual(await self.renderer.render(bytes, 4), bytes(4))
+        self.assertEqual(await self.renderer.render(bytes, 4), bytes(4))
+        await self.renderer.render(bytes, 8)
+        self.assertEqual(self.renderer.stats(), {"cached": 2, "cached_bytes": 12, "hits": 1, "misses": 2})
+
+    async def test_least_recently_used_evicted(self):
+        for size in (1, 2, 1, 3):
+            await self.renderer.render(bytes, size)
+        # 2 was the least recently used when 3 was added
+        await self.renderer.render(bytes, 2)
+        await self.renderer.render(bytes, 3)
+        self.assertEqual((self.renderer.hits, self.renderer.misses), (2, 4))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+try:
+    from UserTracker.activity_store import ActivityStore
+    from UserTracker.word_frequencies import WordFrequencyIndex, tokenize
+except ImportError as e:  # The cog's requirements (Red, numpy, ...) aren't installed
+    raise unittest.SkipTest(f"UserTracker requirements not installed: {e}")
+
+GUILD_ID = 1
+USER_ID = 2
+
+
+def message(message_id, content, timestamp):
+    return {"guild_id": GUILD_ID, "user_id": USER_ID, "activity_type": "Message Sent", "timestamp": timestamp,
+            "message_id": message_id, "content": content, "details": "", "sentiment": None}
+
+
+class TestTokenize(unittest.TestCase):
+
+    def test_drops_stopwords_links_and_mentions(self):
+        self.assertEqual(tokenize("The Cats <@123> like https://example.com/x tuna, don't they?"), ["cats", "tuna"])
+
+
+class TestWordFrequencyIndex(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = ActivityStore(Path(self.directory.name) / "activity.db")
+        self.index = WordFrequencyIndex(self.store, lambda guild_id: None)
+
+    async def asyncTearDown(self):
+        self.store.close()
+        self.directory.cleanup()
+
+    async def counts(self, index=None):
+        return dict(await (index or self.index).top(GUILD_ID, USER_ID))
+
+    async def test_backfill_into_loaded_table(self):
+        await self.store.record_many([message(1, "tuna tuna", 1000)])
+        self.assertEqual(await self.counts(), {"tuna": 2})
+        backfill = [message(2, "tuna salmon", 900)]
+        await self.store.record_many(backfill)
+        await self.index.record_many(GUILD_ID, USER_ID, backfill)
+        self.assertEqual(await self.counts(), {"tuna": 3, "salmon": 1})
+
+    async def test_backfill_older_than_saved_counts(self):
+        now = time.time()
+        await self.store.record_many([message(1, "tuna", now - 60)])
+        await self.index.load(GUILD_ID, USER_ID)
+        await self.index.persist()
+
+        # A fresh index catches up from the saved counts, which only reads messages sent after the save
+        index = WordFrequencyIndex(self.store, lambda guild_id: None)
+        backfill = [message(2, "salmon", now - 3600), message(3, "salmon", now + 60)]
+        await self.store.record_many(backfill)
+        await index.record_many(GUILD_ID, USER_ID, backfill)
+        self.assertEqual(await self.counts(index), {"tuna": 1, "salmon": 2})
+
+    async def test_backfill_after_forget_rebuilds_once(self):
+        backfill = [message(1, "salmon", 1000)]
+        await self.store.record_many(backfill)
+        self.index.forget(GUILD_ID, USER_ID)
+        await self.index.record_many(GUILD_ID, USER_ID, backfill)
+        self.assertEqual(await self.counts(), {"salmon": 1})
+
+
+if __name__ == '__main__':
+    unittest.main()